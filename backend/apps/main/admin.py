@@ -6,10 +6,8 @@ including proper list displays, filters, search capabilities, and custom feature
 """
 from typing import Optional, Any
 from django.contrib import admin
-from django.db.models import QuerySet, Count
 from django.http import HttpRequest
 from django.utils.html import format_html
-from django.utils.safestring import mark_safe
 
 from .models import (
     Region,
@@ -21,6 +19,7 @@ from .models import (
     AdsManagerVideo,
     AdsManagerImage,
     VideoAnalytics,
+    QRScanHourly,
 )
 
 
@@ -289,10 +288,11 @@ class AdsManagerAdmin(admin.ModelAdmin):
         'has_qr_code',
         'created_at'
     ]
-    list_filter = ['status', 'currency', 'region', 'district', 'venue_types', 'created_at', 'start_date']
+    list_filter = ['status', 'is_active', 'currency', 'region', 'district', 'venue_types', 'created_at', 'start_date']
     search_fields = ['campaign_name', 'region__name', 'district__name']
     readonly_fields = [
         'qr_code_preview',
+        'qr_status',
         'involve_count',
         'meta_schedule_slots',
         'meta_schedule_coverage',
@@ -318,7 +318,7 @@ class AdsManagerAdmin(admin.ModelAdmin):
             'fields': ('region', 'district', 'interests', 'venue_types', 'age_range')
         }),
         ('QR Code & Link', {
-            'fields': ('link', 'qr_code', 'qr_code_preview', 'involve_count'),
+            'fields': ('link', 'qr_code', 'qr_code_preview', 'qr_status', 'involve_count'),
             'description': 'QR code is automatically generated when a link is provided'
         }),
         ('Schedule', {
@@ -409,12 +409,16 @@ class AdsManagerVideoAdmin(admin.ModelAdmin):
         'ads_manager',
         'duration',
         'file_size_display',
+        'processing_status',
         'view_count',
         'created_at'
     ]
-    list_filter = ['ads_manager__status', 'created_at', 'updated_at']
+    list_filter = ['ads_manager__status', 'processing_status', 'created_at', 'updated_at']
     search_fields = ['title', 'description', 'ads_manager__campaign_name']
-    readonly_fields = ['file_size', 'video_preview', 'created_at', 'updated_at', 'created_by', 'updated_by']
+    readonly_fields = [
+        'file_size', 'width', 'height', 'content_hash', 'processing_status', 'video_preview',
+        'created_at', 'updated_at', 'created_by', 'updated_by'
+    ]
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
     list_per_page = 25
@@ -427,7 +431,7 @@ class AdsManagerVideoAdmin(admin.ModelAdmin):
             'fields': ('ads_manager', 'video', 'video_preview', 'title', 'description')
         }),
         ('File Details', {
-            'fields': ('duration', 'file_size'),
+            'fields': ('processing_status', 'duration', 'file_size', 'width', 'height', 'content_hash'),
             'classes': ('collapse',)
         }),
         ('Metadata', {
@@ -491,11 +495,12 @@ class AdsManagerImageAdmin(admin.ModelAdmin):
         'dimensions',
         'file_size_display',
         'image_thumbnail',
+        'processing_status',
         'created_at'
     ]
-    list_filter = ['ads_manager__status', 'created_at', 'updated_at']
+    list_filter = ['ads_manager__status', 'processing_status', 'created_at', 'updated_at']
     search_fields = ['title', 'description', 'ads_manager__campaign_name']
-    readonly_fields = ['width', 'height', 'file_size', 'image_preview', 'created_at', 'updated_at', 'created_by', 'updated_by']
+    readonly_fields = ['width', 'height', 'file_size', 'processing_status', 'image_preview', 'created_at', 'updated_at', 'created_by', 'updated_by']
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
     list_per_page = 25
@@ -508,7 +513,7 @@ class AdsManagerImageAdmin(admin.ModelAdmin):
             'fields': ('ads_manager', 'image', 'image_preview', 'title', 'description')
         }),
         ('File Details', {
-            'fields': ('width', 'height', 'file_size'),
+            'fields': ('processing_status', 'width', 'height', 'file_size'),
             'classes': ('collapse',)
         }),
         ('Metadata', {
@@ -585,13 +590,14 @@ class VideoAnalyticsAdmin(admin.ModelAdmin):
         'ip_address',
         'country',
         'city',
+        'ua_class',
         'is_complete',
         'watch_duration',
         'created_at'
     ]
-    list_filter = ['is_complete', 'country', 'city', 'created_at']
-    search_fields = ['ip_address', 'country', 'city', 'user_agent', 'video__title', 'video__ads_manager__campaign_name']
-    readonly_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
+    list_filter = ['is_complete', 'ua_class', 'country', 'created_at']
+    search_fields = ['ip_address', 'country', 'city', 'video__title', 'video__ads_manager__campaign_name']
+    readonly_fields = ['created_at']
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
     list_per_page = 50
@@ -601,16 +607,16 @@ class VideoAnalyticsAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Video & Viewer', {
-            'fields': ('video', 'ip_address', 'user_agent')
+            'fields': ('video', 'ip_address', 'ua_class')
         }),
         ('Location', {
             'fields': ('country', 'city')
         }),
         ('Engagement', {
-            'fields': ('watch_duration', 'is_complete', 'referer')
+            'fields': ('watch_duration', 'is_complete')
         }),
         ('Metadata', {
-            'fields': ('created_at', 'updated_at', 'created_by', 'updated_by'),
+            'fields': ('created_at',),
             'classes': ('collapse',)
         }),
     )
@@ -619,6 +625,32 @@ class VideoAnalyticsAdmin(admin.ModelAdmin):
         """Disable manual creation of analytics (should be created by system)."""
         return False
 
+    def has_change_permission(self, request: HttpRequest, obj: Optional[VideoAnalytics] = None) -> bool:
+        """Raw views are only written by the tracking endpoints."""
+        return False
+
+
+@admin.register(QRScanHourly)
+class QRScanHourlyAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the hourly QR scan rollup (read-only, maintained by the scan buffer).
+    """
+    list_display = ['ads_manager', 'screen', 'hour', 'scans']
+    list_filter = ['hour']
+    search_fields = ['ads_manager__campaign_name', 'screen__title']
+    ordering = ['-hour']
+    date_hierarchy = 'hour'
+    list_per_page = 50
+    raw_id_fields = ['ads_manager', 'screen']
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        """Disable manual creation of rollups (should be created by system)."""
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Optional[QRScanHourly] = None) -> bool:
+        """Rollup rows are only written by the scan buffer."""
+        return False
+
 
 # Customize admin site header and title
 admin.site.site_header = "Street Screens Administration"
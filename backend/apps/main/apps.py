@@ -7,6 +7,7 @@ class MainConfig(AppConfig):
 
     def ready(self) -> None:
         """
-        Import signals when app is ready.
+        Import signals and system checks when app is ready.
         """
+        import apps.main.checks  # noqa: F401
         import apps.main.signals  # noqa: F401
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warn when the default cache is private to each process: cache invalidation
+    on write would then only reach the worker that made the change.
+    """
+    if settings.CACHES["default"]["BACKEND"] not in PER_PROCESS_CACHES:
+        return []
+    return [
+        Warning(
+            "The default cache is per-process, so invalidations are not seen by other workers.",
+            hint="Set REDIS_URL (or CACHE_BACKEND/CACHE_LOCATION) to a shared cache.",
+            id="main.W001",
+        )
+    ]
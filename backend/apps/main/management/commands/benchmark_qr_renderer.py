@@ -0,0 +1,39 @@
+"""
+Compare the NumPy QR renderer with the original per-module PIL drawing.
+
+Usage:
+    python manage.py benchmark_qr_renderer
+    python manage.py benchmark_qr_renderer --iterations 200 --url https://example.com/api/v1/main/qr/42/
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.services.qr_renderer import render_qr, render_qr_reference
+
+
+class Command(BaseCommand):
+    help = "Benchmark render_qr() against the reference renderer and check both produce identical images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="Renders per implementation")
+        parser.add_argument("--url", default=None, help="Data to encode; defaults to a QR redirect URL")
+
+    def handle(self, *args, **opts):
+        url = opts["url"] or f"{settings.BACKEND_URL}/api/v1/main/qr/1000000/"
+        if render_qr(url).tobytes() != render_qr_reference(url).tobytes():
+            raise CommandError("render_qr() output differs from the reference renderer")
+
+        timings = {}
+        for renderer in (render_qr_reference, render_qr):
+            started = time.perf_counter()
+            for _ in range(opts["iterations"]):
+                renderer(url)
+            timings[renderer.__name__] = (time.perf_counter() - started) / opts["iterations"] * 1000
+
+        for name, milliseconds in timings.items():
+            self.stdout.write(f"{name}: {milliseconds:.2f} ms per image")
+        speedup = timings["render_qr_reference"] / timings["render_qr"]
+        self.stdout.write(self.style.SUCCESS(f"Identical output, {speedup:.1f}x faster."))
@@ -0,0 +1,25 @@
+"""
+Delete raw VideoAnalytics rows older than VIDEO_ANALYTICS_RETENTION_DAYS after
+rolling their days up. Run it from cron once a day, after rollup_video_analytics.
+
+Usage:
+    python manage.py compact_video_analytics
+    python manage.py compact_video_analytics --chunk-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.services.video_analytics import compact_video_analytics, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Roll up and delete raw video analytics past the retention window, in short chunked transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=5000, help="Rows deleted per transaction"
+        )
+
+    def handle(self, *args, **opts):
+        deleted = compact_video_analytics(opts["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} raw rows before {retention_cutoff()}."))
@@ -0,0 +1,44 @@
+"""
+Run the media ingestion pipeline synchronously for rows that are still waiting,
+e.g. uploads made before the pipeline existed or jobs lost on a restart.
+
+Usage:
+    python manage.py ingest_media
+    python manage.py ingest_media --retry-failed
+    python manage.py ingest_media --reclaim-stuck
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from main.models import AdsManagerImage, AdsManagerVideo, MediaModel
+from main.services.media_ingest import ingest_image, ingest_video, stuck_processing
+
+
+class Command(BaseCommand):
+    help = "Hash and probe pending ads videos and images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry rows that failed before")
+        parser.add_argument(
+            "--reclaim-stuck",
+            action="store_true",
+            help="Also retry rows left processing longer than MEDIA_INGEST_TIMEOUT by a worker that died",
+        )
+
+    def handle(self, *args, **opts):
+        statuses = [MediaModel.PENDING]
+        if opts["retry_failed"]:
+            statuses.append(MediaModel.FAILED)
+        query = Q(processing_status__in=statuses)
+        if opts["reclaim_stuck"]:
+            query |= stuck_processing()
+
+        for model, ingest in ((AdsManagerVideo, ingest_video), (AdsManagerImage, ingest_image)):
+            ids = list(model.objects.filter(query).values_list("id", flat=True))
+            for pk in ids:
+                ingest(pk)
+            ready = model.objects.filter(id__in=ids, processing_status=MediaModel.READY).count()
+            self.stdout.write(
+                self.style.SUCCESS(f"{model._meta.verbose_name_plural}: {ready}/{len(ids)} ingested.")
+            )
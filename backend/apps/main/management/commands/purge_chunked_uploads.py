@@ -0,0 +1,18 @@
+"""
+Remove resumable uploads that were abandoned before completion.
+
+Usage:
+    python manage.py purge_chunked_uploads
+"""
+
+from django.core.management.base import BaseCommand
+
+from main.services.chunked_upload import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete expired, unfinished chunked uploads and their part files."
+
+    def handle(self, *args, **opts):
+        count = purge_expired_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Purged {count} expired chunked uploads."))
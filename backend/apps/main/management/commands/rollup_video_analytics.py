@@ -0,0 +1,46 @@
+"""
+Roll raw VideoAnalytics rows up into VideoAnalyticsDaily, one closed day at a time.
+Run it from cron shortly after midnight; by default it catches up on every day
+since the latest rollup. --days refuses to start after a day that was never
+rolled up, since the totals would then miss it.
+
+Usage:
+    python manage.py rollup_video_analytics
+    python manage.py rollup_video_analytics --days 7
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from main.services.video_analytics import next_rollup_day, pending_rollup_days, rollup_video_analytics
+
+
+class Command(BaseCommand):
+    help = "Recompute daily video analytics rollups (views, completes, HLL unique IPs, countries)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=0, help="Recompute the last N closed days instead of catching up"
+        )
+
+    def handle(self, *args, **opts):
+        if opts["days"]:
+            today = timezone.localdate()
+            days = [today - timedelta(days) for days in range(opts["days"], 0, -1)]
+            next_day = next_rollup_day()
+            if next_day is not None and days[0] > next_day:
+                raise CommandError(
+                    f"{next_day} is not rolled up yet; run without --days to catch up from there first."
+                )
+        else:
+            days = pending_rollup_days()
+
+        for day in days:
+            try:
+                rows = rollup_video_analytics(day)
+            except ValueError as e:
+                raise CommandError(str(e)) from e
+            self.stdout.write(f"{day}: {rows} videos")
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {len(days)} days."))
@@ -0,0 +1,35 @@
+"""
+Start and complete campaigns according to their start_date / end_date.
+Run it from cron every minute, or keep it running with --interval.
+
+Usage:
+    python manage.py run_campaign_lifecycle
+    python manage.py run_campaign_lifecycle --interval 60
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.services.lifecycle import run_campaign_lifecycle
+
+
+class Command(BaseCommand):
+    help = "Complete expired campaigns and refresh the is_active flag with set-based updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=int, default=0, help="Repeat every N seconds instead of running once"
+        )
+
+    def handle(self, *args, **opts):
+        while True:
+            result = run_campaign_lifecycle()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Completed {result['completed']} campaigns, updated {result['refreshed']} is_active flags."
+                )
+            )
+            if not opts["interval"]:
+                return
+            time.sleep(opts["interval"])
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0006_audienceimpression"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name="audienceimpression",
+            new_name="main_audien_screen__221b05_idx",
+            old_name="main_audien_screen__idx",
+        ),
+        migrations.RenameIndex(
+            model_name="audienceimpression",
+            new_name="main_audien_ads_man_8cd9df_idx",
+            old_name="main_audien_ads_man_idx",
+        ),
+        migrations.AddIndex(
+            model_name="adsmanager",
+            index=models.Index(
+                fields=["status", "start_date", "end_date"],
+                name="main_ads_ma_status_3d7939_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+from main.services.schedule import compile_schedule_bitmap
+
+
+def compile_schedule_bitmaps(apps, schema_editor):
+    AdsManager = apps.get_model("main", "AdsManager")
+    batch = []
+    for ads_manager in AdsManager.objects.only("id", "schedule", "start_date").iterator(chunk_size=500):
+        ads_manager.schedule_bitmap = compile_schedule_bitmap(ads_manager.schedule, reference=ads_manager.start_date)
+        batch.append(ads_manager)
+        if len(batch) >= 500:
+            AdsManager.objects.bulk_update(batch, ["schedule_bitmap"])
+            batch = []
+    if batch:
+        AdsManager.objects.bulk_update(batch, ["schedule_bitmap"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0007_adsmanager_live_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanager",
+            name="schedule_bitmap",
+            field=models.BinaryField(
+                blank=True,
+                help_text="Schedule compiled into 168 weekly UTC slots",
+                max_length=21,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(compile_schedule_bitmaps, migrations.RunPython.noop),
+    ]
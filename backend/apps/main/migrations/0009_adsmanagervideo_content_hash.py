@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0008_adsmanager_schedule_bitmap"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanagervideo",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="SHA-256 of the video file",
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0009_adsmanagervideo_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanagerimage",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="adsmanagervideo",
+            name="height",
+            field=models.IntegerField(
+                blank=True, help_text="Video height in pixels", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="adsmanagervideo",
+            name="processing_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="adsmanagervideo",
+            name="width",
+            field=models.IntegerField(
+                blank=True, help_text="Video width in pixels", null=True
+            ),
+        ),
+    ]
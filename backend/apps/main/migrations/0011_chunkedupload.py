@@ -0,0 +1,111 @@
+# Generated by Django 5.2.9 on 2026-10-18 23:58
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0010_media_processing_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChunkedUpload",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("title", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "total_size",
+                    models.BigIntegerField(help_text="Expected file size in bytes"),
+                ),
+                (
+                    "offset",
+                    models.BigIntegerField(
+                        default=0, help_text="Bytes received so far"
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.CharField(
+                        blank=True,
+                        help_text="Expected SHA-256 of the file",
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("uploading", "Uploading"),
+                            ("completed", "Completed"),
+                        ],
+                        default="uploading",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "ads_manager",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunked_uploads",
+                        to="main.adsmanager",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_%(model_name)ss",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="updated_%(model_name)ss",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "video",
+                    models.OneToOneField(
+                        blank=True,
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="chunked_upload",
+                        to="main.adsmanagervideo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Chunked Upload",
+                "verbose_name_plural": "Chunked Uploads",
+                "db_table": "main_chunked_upload",
+                "ordering": ("-created_at",),
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0011_chunkedupload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="adsmanager",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="main_ads_ma_created_83dfcf_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adsmanagervideo",
+            index=models.Index(
+                fields=["ads_manager", "-created_at", "-id"],
+                name="main_ads_ma_ads_man_7a5f62_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adsmanagervideo",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="main_ads_ma_created_118c13_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="screenmanager",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="main_screen_created_ea15cb_idx",
+            ),
+        ),
+    ]
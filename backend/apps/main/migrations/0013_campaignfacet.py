@@ -0,0 +1,129 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+FACET_LOOKUPS = {
+    "region": "region",
+    "district": "district",
+    "interest": "interests",
+    "venue_type": "venue_types",
+}
+
+
+def build_campaign_facets(apps, schema_editor):
+    AdsManager = apps.get_model("main", "AdsManager")
+    CampaignFacet = apps.get_model("main", "CampaignFacet")
+    facets = []
+    for kind, lookup in FACET_LOOKUPS.items():
+        rows = (
+            AdsManager.objects.filter(created_by__isnull=False, **{f"{lookup}__isnull": False})
+            .values("created_by", lookup)
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            facets.append(
+                CampaignFacet(user_id=row["created_by"], kind=kind, count=row["count"], **{f"{kind}_id": row[lookup]})
+            )
+    CampaignFacet.objects.bulk_create(facets, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0012_list_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("region", "Region"),
+                            ("district", "District"),
+                            ("interest", "Interest"),
+                            ("venue_type", "Venue Type"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "district",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_facets",
+                        to="main.district",
+                    ),
+                ),
+                (
+                    "interest",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_facets",
+                        to="main.interest",
+                    ),
+                ),
+                (
+                    "region",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_facets",
+                        to="main.region",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_facets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "venue_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_facets",
+                        to="main.venuetype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Campaign Facet",
+                "verbose_name_plural": "Campaign Facets",
+                "db_table": "main_campaign_facet",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "kind"], name="main_campai_user_id_321b4a_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_campaign_facets, migrations.RunPython.noop),
+    ]
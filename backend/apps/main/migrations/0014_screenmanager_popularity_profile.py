@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:07
+
+from django.db import migrations, models
+
+from main.services.popularity import compile_popularity_profile
+
+
+def compile_popularity_profiles(apps, schema_editor):
+    ScreenManager = apps.get_model("main", "ScreenManager")
+    batch = []
+    screens = ScreenManager.objects.filter(popular_times__isnull=False).only("id", "popular_times")
+    for screen in screens.iterator(chunk_size=500):
+        screen.popularity_profile = compile_popularity_profile(screen.popular_times)
+        batch.append(screen)
+        if len(batch) >= 500:
+            ScreenManager.objects.bulk_update(batch, ["popularity_profile"])
+            batch = []
+    if batch:
+        ScreenManager.objects.bulk_update(batch, ["popularity_profile"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0013_campaignfacet"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="screenmanager",
+            name="popularity_profile",
+            field=models.BinaryField(
+                blank=True,
+                help_text="popular_times compiled into 168 weekly busyness percentages",
+                max_length=168,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(compile_popularity_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:14
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_is_active(apps, schema_editor):
+    AdsManager = apps.get_model("main", "AdsManager")
+    now = timezone.now()
+    AdsManager.objects.filter(status="active", start_date__lte=now, end_date__gte=now).update(is_active=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0014_screenmanager_popularity_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanager",
+            name="is_active",
+            field=models.BooleanField(
+                db_index=True,
+                default=False,
+                editable=False,
+                help_text="Active and inside the start/end window; kept current by run_campaign_lifecycle",
+            ),
+        ),
+        migrations.RunPython(set_is_active, migrations.RunPython.noop),
+    ]
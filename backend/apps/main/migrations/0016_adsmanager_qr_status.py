@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:17
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def mark_existing_qr_codes(apps, schema_editor):
+    AdsManager = apps.get_model("main", "AdsManager")
+    for ads_manager in AdsManager.objects.exclude(qr_code="").exclude(qr_code__isnull=True).only("id", "link"):
+        AdsManager.objects.filter(pk=ads_manager.pk).update(
+            qr_status="ready", qr_link_hash=hashlib.sha1((ads_manager.link or "").encode()).hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0015_adsmanager_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanager",
+            name="qr_link_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="SHA-1 of the link the QR job was queued for",
+                max_length=40,
+            ),
+        ),
+        migrations.AddField(
+            model_name="adsmanager",
+            name="qr_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                editable=False,
+                help_text="State of the background QR rendering job; empty when the ad has no link",
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(mark_existing_qr_codes, migrations.RunPython.noop),
+    ]
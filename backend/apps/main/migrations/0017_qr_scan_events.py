@@ -0,0 +1,126 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0016_adsmanager_qr_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QRScanEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                (
+                    "ua_class",
+                    models.CharField(
+                        choices=[
+                            ("ios", "iOS"),
+                            ("android", "Android"),
+                            ("desktop", "Desktop"),
+                            ("bot", "Bot"),
+                            ("other", "Other"),
+                        ],
+                        default="other",
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "ads_manager",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="qr_scans",
+                        to="main.adsmanager",
+                    ),
+                ),
+                (
+                    "screen",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="qr_scans",
+                        to="main.screenmanager",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "QR Scan Event",
+                "verbose_name_plural": "QR Scan Events",
+                "db_table": "main_qr_scan_event",
+                "ordering": ("-timestamp",),
+                "indexes": [
+                    models.Index(
+                        fields=["ads_manager", "timestamp"],
+                        name="main_qr_sca_ads_man_aa656a_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="QRScanHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("scans", models.PositiveIntegerField(default=0)),
+                (
+                    "ads_manager",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="qr_scans_hourly",
+                        to="main.adsmanager",
+                    ),
+                ),
+                (
+                    "screen",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="qr_scans_hourly",
+                        to="main.screenmanager",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "QR Scans per Hour",
+                "verbose_name_plural": "QR Scans per Hour",
+                "db_table": "main_qr_scan_hourly",
+                "ordering": ("-hour",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ads_manager", "screen", "hour"),
+                        name="qr_scan_hourly_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0017_qr_scan_events"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VideoAnalyticsDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                ("complete_views", models.PositiveIntegerField(default=0)),
+                ("unique_ips_hll", models.BinaryField()),
+                (
+                    "views_by_country",
+                    models.JSONField(
+                        default=dict,
+                        help_text='Country name -> views; null country under ""',
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "video",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="analytics_daily",
+                        to="main.adsmanagervideo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Video Analytics (daily)",
+                "verbose_name_plural": "Video Analytics (daily)",
+                "db_table": "main_video_analytics_daily",
+                "ordering": ("-day",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("video", "day"), name="video_analytics_daily_unique"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:28
+
+from collections import Counter
+
+import django.db.models.deletion
+import numpy as np
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_totals(apps, schema_editor):
+    VideoAnalyticsDaily = apps.get_model("main", "VideoAnalyticsDaily")
+    VideoAnalyticsTotal = apps.get_model("main", "VideoAnalyticsTotal")
+    totals = {}
+    for daily in VideoAnalyticsDaily.objects.order_by("video_id").iterator():
+        total = totals.setdefault(
+            daily.video_id, {"views": 0, "complete_views": 0, "sketch": None, "countries": Counter()}
+        )
+        total["views"] += daily.views
+        total["complete_views"] += daily.complete_views
+        total["countries"].update(daily.views_by_country)
+        sketch = np.frombuffer(bytes(daily.unique_ips_hll), dtype=np.uint8)
+        total["sketch"] = sketch if total["sketch"] is None else np.maximum(total["sketch"], sketch)
+    VideoAnalyticsTotal.objects.bulk_create(
+        [
+            VideoAnalyticsTotal(
+                video_id=video_id,
+                views=total["views"],
+                complete_views=total["complete_views"],
+                unique_ips_hll=total["sketch"].tobytes(),
+                views_by_country=dict(total["countries"]),
+            )
+            for video_id, total in totals.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0018_video_analytics_daily"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VideoAnalyticsTotal",
+            fields=[
+                (
+                    "video",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="analytics_total",
+                        serialize=False,
+                        to="main.adsmanagervideo",
+                    ),
+                ),
+                ("views", models.PositiveIntegerField(default=0)),
+                ("complete_views", models.PositiveIntegerField(default=0)),
+                ("unique_ips_hll", models.BinaryField()),
+                ("views_by_country", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Video Analytics (lifetime)",
+                "verbose_name_plural": "Video Analytics (lifetime)",
+                "db_table": "main_video_analytics_total",
+            },
+        ),
+        migrations.AlterField(
+            model_name="videoanalytics",
+            name="video",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="analytics",
+                to="main.adsmanagervideo",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalytics",
+            index=models.Index(
+                fields=["video", "created_at"],
+                include=("is_complete",),
+                name="video_analytics_video_time",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalytics",
+            index=models.Index(
+                fields=["video", "is_complete"], name="video_analytics_video_done"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalyticsdaily",
+            index=models.Index(fields=["day"], name="main_video__day_11bd68_idx"),
+        ),
+        migrations.RunPython(build_totals, migrations.RunPython.noop),
+    ]
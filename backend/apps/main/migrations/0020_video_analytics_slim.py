@@ -0,0 +1,81 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:31
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+from apps.main.services.user_agent import UA_OTHER, classify_user_agent
+
+
+def classify_user_agents(apps, schema_editor):
+    VideoAnalytics = apps.get_model("main", "VideoAnalytics")
+    VideoAnalytics.objects.filter(created_at__isnull=True).update(created_at=Now())
+    user_agents = VideoAnalytics.objects.exclude(user_agent__isnull=True).exclude(user_agent="")
+    for user_agent in user_agents.values_list("user_agent", flat=True).distinct().order_by().iterator():
+        ua_class = classify_user_agent(user_agent)
+        if ua_class != UA_OTHER:
+            VideoAnalytics.objects.filter(user_agent=user_agent).update(ua_class=ua_class)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0019_video_analytics_totals"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="videoanalytics",
+            options={
+                "verbose_name": "Video Analytics",
+                "verbose_name_plural": "Video Analytics",
+            },
+        ),
+        migrations.AddField(
+            model_name="videoanalytics",
+            name="ua_class",
+            field=models.CharField(
+                choices=[
+                    ("ios", "iOS"),
+                    ("android", "Android"),
+                    ("desktop", "Desktop"),
+                    ("bot", "Bot"),
+                    ("other", "Other"),
+                ],
+                default="other",
+                max_length=8,
+            ),
+        ),
+        migrations.RunPython(classify_user_agents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="videoanalytics",
+            name="created_by",
+        ),
+        migrations.RemoveField(
+            model_name="videoanalytics",
+            name="referer",
+        ),
+        migrations.RemoveField(
+            model_name="videoanalytics",
+            name="updated_at",
+        ),
+        migrations.RemoveField(
+            model_name="videoanalytics",
+            name="updated_by",
+        ),
+        migrations.RemoveField(
+            model_name="videoanalytics",
+            name="user_agent",
+        ),
+        migrations.AlterField(
+            model_name="videoanalytics",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name="videoanalytics",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="video_analytics_time_brin"
+            ),
+        ),
+    ]
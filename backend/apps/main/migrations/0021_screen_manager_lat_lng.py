@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.main.services.geo import parse_coordinates
+
+
+def fill_lat_lng(apps, schema_editor):
+    ScreenManager = apps.get_model("main", "ScreenManager")
+    screens = []
+    for screen in ScreenManager.objects.filter(coordinates__isnull=False).only("id", "coordinates").iterator():
+        screen.latitude, screen.longitude = parse_coordinates(screen.coordinates) or (None, None)
+        screens.append(screen)
+    ScreenManager.objects.bulk_update(screens, ["latitude", "longitude"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0020_video_analytics_slim"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="screenmanager",
+            name="latitude",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                help_text="coordinates.lat, for map queries",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="screenmanager",
+            name="longitude",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                help_text="coordinates.lng, for map queries",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="screenmanager",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="screen_manager_lat_lng"
+            ),
+        ),
+        migrations.RunPython(fill_lat_lng, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0021_screen_manager_lat_lng"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chunkedupload",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("uploading", "Uploading"),
+                    ("completing", "Completing"),
+                    ("completed", "Completed"),
+                ],
+                default="uploading",
+                max_length=20,
+            ),
+        ),
+    ]
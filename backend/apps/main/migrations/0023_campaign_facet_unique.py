@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+FACET_FIELDS = ("user", "kind", "region", "district", "interest", "venue_type")
+
+
+def drop_duplicate_facets(apps, schema_editor):
+    """
+    Keep the newest row of each (user, kind, value) left by concurrent refreshes.
+    """
+    CampaignFacet = apps.get_model("main", "CampaignFacet")
+    duplicates = (
+        CampaignFacet.objects.values(*FACET_FIELDS)
+        .annotate(rows=Count("id"), keep=Max("id"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in duplicates:
+        keep = group.pop("keep")
+        group.pop("rows")
+        CampaignFacet.objects.filter(**group).exclude(id=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0022_chunkedupload_completing"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_facets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="campaignfacet",
+            constraint=models.UniqueConstraint(
+                fields=("user", "kind", "region", "district", "interest", "venue_type"),
+                name="campaign_facet_unique_value",
+                nulls_distinct=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+INSERT INTO main_audience_hourly (screen_id, hour, faces)
+SELECT screen_id, date_trunc('hour', "timestamp" AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', SUM(face_count)
+FROM main_audience_impression
+GROUP BY 1, 2
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0023_campaign_facet_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudienceHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("faces", models.PositiveIntegerField(default=0)),
+                (
+                    "screen",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="audience_hourly",
+                        to="main.screenmanager",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Audience per Hour",
+                "verbose_name_plural": "Audience per Hour",
+                "db_table": "main_audience_hourly",
+                "ordering": ("-hour",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("screen", "hour"), name="audience_hourly_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
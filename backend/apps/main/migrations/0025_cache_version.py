@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0024_audience_hourly"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField()),
+            ],
+            options={
+                "verbose_name": "Cache Version",
+                "verbose_name_plural": "Cache Versions",
+                "db_table": "main_cache_version",
+            },
+        ),
+    ]
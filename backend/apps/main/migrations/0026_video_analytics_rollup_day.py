@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:57
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def mark_rolled_up_days(apps, schema_editor):
+    """
+    Mark the days already covered by the rollups, walking from the first day with
+    views and stopping at the first day that has raw views but no daily rows.
+    Days after such a gap are rolled up again by the next rollup_video_analytics run.
+    """
+    VideoAnalytics = apps.get_model("main", "VideoAnalytics")
+    VideoAnalyticsDaily = apps.get_model("main", "VideoAnalyticsDaily")
+    VideoAnalyticsRollupDay = apps.get_model("main", "VideoAnalyticsRollupDay")
+
+    rolled_up = set(VideoAnalyticsDaily.objects.values_list("day", flat=True).distinct())
+    if not rolled_up:
+        return
+    raw = set(
+        VideoAnalytics.objects.annotate(day=TruncDate("created_at"))
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by()
+    )
+    marked = []
+    day = min(rolled_up | raw)
+    while day <= max(rolled_up) and (day in rolled_up or day not in raw):
+        marked.append(VideoAnalyticsRollupDay(day=day))
+        day += timedelta(1)
+    VideoAnalyticsRollupDay.objects.bulk_create(marked, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0025_cache_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VideoAnalyticsRollupDay",
+            fields=[
+                ("day", models.DateField(primary_key=True, serialize=False)),
+                ("rolled_up_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Video Analytics Rollup Day",
+                "verbose_name_plural": "Video Analytics Rollup Days",
+                "db_table": "main_video_analytics_rollup_day",
+                "ordering": ("-day",),
+            },
+        ),
+        migrations.RunPython(mark_rolled_up_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.9 on 2026-10-19 00:59
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def flag_compacted_days(apps, schema_editor):
+    """
+    Days past the retention window without raw rows left were compacted before
+    the flag existed; flag them so they are never rolled up again from nothing.
+    """
+    VideoAnalytics = apps.get_model("main", "VideoAnalytics")
+    VideoAnalyticsRollupDay = apps.get_model("main", "VideoAnalyticsRollupDay")
+
+    cutoff = timezone.localdate() - timedelta(settings.VIDEO_ANALYTICS_RETENTION_DAYS)
+    kept = (
+        VideoAnalytics.objects.filter(created_at__lt=timezone.make_aware(datetime.combine(cutoff, time.min)))
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+    )
+    VideoAnalyticsRollupDay.objects.filter(day__lt=cutoff).exclude(day__in=kept).update(compacted_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0026_video_analytics_rollup_day"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="videoanalyticsrollupday",
+            name="compacted_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When compact_video_analytics started deleting the day's raw rows",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(flag_compacted_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from main.services.schedule import compile_schedule_bitmap
+
+
+def compile_schedule_bitmaps(apps, schema_editor):
+    # 0008 compiled {day: [hours]} schedules from the campaign form to ALWAYS_ON
+    AdsManager = apps.get_model("main", "AdsManager")
+    batch = []
+    for ads_manager in AdsManager.objects.only("id", "schedule", "start_date").iterator(chunk_size=500):
+        ads_manager.schedule_bitmap = compile_schedule_bitmap(ads_manager.schedule, reference=ads_manager.start_date)
+        batch.append(ads_manager)
+        if len(batch) >= 500:
+            AdsManager.objects.bulk_update(batch, ["schedule_bitmap"])
+            batch = []
+    if batch:
+        AdsManager.objects.bulk_update(batch, ["schedule_bitmap"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0027_video_analytics_compacted_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(compile_schedule_bitmaps, migrations.RunPython.noop),
+    ]
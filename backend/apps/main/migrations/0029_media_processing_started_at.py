@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0028_recompile_schedule_bitmaps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adsmanagerimage",
+            name="processing_started_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When an ingestion worker last claimed the row",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="adsmanagervideo",
+            name="processing_started_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When an ingestion worker last claimed the row",
+                null=True,
+            ),
+        ),
+    ]
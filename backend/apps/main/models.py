@@ -1,8 +1,17 @@
+import uuid
+
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.utils.text import slugify
 
+from apps.main.querysets.ads_manager import AdsManagerQuerySet
 from apps.main.querysets.interest import InterestQuerySet
+from apps.main.querysets.screen_manager import ScreenManagerQuerySet
+from apps.main.services.geo import parse_coordinates
+from apps.main.services.popularity import compile_popularity_profile
+from apps.main.services.schedule import compile_schedule_bitmap
+from apps.main.services.user_agent import UA_CLASS_CHOICES, UA_OTHER
 
 VENUE_TYPES = [
     ("shopping_center", "Shopping Center"),
@@ -25,6 +34,33 @@ class BaseModel(models.Model):
         ordering = ("-created_at",)
 
 
+class MediaModel(BaseModel):
+    """
+    Base model for uploaded creatives whose metadata is filled in by the background ingestion pipeline.
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+    PROCESSING_STATUS = ((PENDING, "Pending"), (PROCESSING, "Processing"), (READY, "Ready"), (FAILED, "Failed"))
+
+    processing_status = models.CharField(max_length=20, choices=PROCESSING_STATUS, default=PENDING, editable=False)
+    processing_started_at = models.DateTimeField(
+        null=True, blank=True, editable=False, help_text="When an ingestion worker last claimed the row"
+    )
+
+    class Meta(BaseModel.Meta):
+        abstract = True
+
+    def mark_file_changed(self, field_file) -> None:
+        """
+        Queue the row for ingestion again when a new file has been attached.
+        """
+        if field_file and not field_file._committed:
+            self.processing_status = self.PENDING
+
+
 class Region(BaseModel):
     """
     Model for geographic regions.
@@ -125,6 +161,8 @@ class ScreenManager(BaseModel):
     position = models.CharField(max_length=255)
     location = models.CharField(max_length=255, blank=True, null=True, help_text="Human-readable location description")
     coordinates = models.JSONField(blank=True, null=True, help_text="Geographic coordinates with lat and lng")
+    latitude = models.FloatField(blank=True, null=True, editable=False, help_text="coordinates.lat, for map queries")
+    longitude = models.FloatField(blank=True, null=True, editable=False, help_text="coordinates.lng, for map queries")
     venue_types = models.ManyToManyField(
         "main.VenueType", blank=True, related_name="screen_managers", help_text="Venue types for this screen"
     )
@@ -146,11 +184,32 @@ class ScreenManager(BaseModel):
     popular_times = models.JSONField(
         blank=True, null=True, help_text="Popular times data for foot traffic analysis"
     )
+    popularity_profile = models.BinaryField(
+        max_length=168,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="popular_times compiled into 168 weekly busyness percentages",
+    )
+
+    objects = ScreenManagerQuerySet.as_manager()
 
     class Meta(BaseModel.Meta):
         db_table = "main_screen_manager"
         verbose_name = "Screen Manager"
         verbose_name_plural = "Screen Managers"
+        indexes = [
+            models.Index(fields=["created_by", "-created_at", "-id"]),
+            # Bounding-box and radius searches: a latitude range, longitude checked from the index
+            models.Index(fields=["latitude", "longitude"], name="screen_manager_lat_lng"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.popularity_profile = compile_popularity_profile(self.popular_times)
+        self.latitude, self.longitude = parse_coordinates(self.coordinates) or (None, None)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "popularity_profile", "latitude", "longitude"}
+        super().save(*args, **kwargs)
 
 
 class AdsManager(BaseModel):
@@ -176,12 +235,26 @@ class AdsManager(BaseModel):
         models.IntegerField(), size=2, blank=True, null=True, help_text="Age range [min_age, max_age]"
     )
     schedule = models.JSONField(default=dict, help_text="Schedule configuration with day-hour slots")
+    schedule_bitmap = models.BinaryField(
+        max_length=21, blank=True, null=True, editable=False, help_text="Schedule compiled into 168 weekly UTC slots"
+    )
     meta_schedule_slots = models.IntegerField(default=0)
     meta_schedule_coverage = models.CharField(max_length=10, blank=True, null=True)
     meta_duration_days = models.IntegerField(default=0)
     link = models.URLField(blank=True, null=True)
     involve_count = models.IntegerField(default=0)
     qr_code = models.ImageField(upload_to="qr_codes", blank=True, null=True)
+    qr_status = models.CharField(
+        max_length=20,
+        choices=MediaModel.PROCESSING_STATUS,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="State of the background QR rendering job; empty when the ad has no link",
+    )
+    qr_link_hash = models.CharField(
+        max_length=40, blank=True, default="", editable=False, help_text="SHA-1 of the link the QR job was queued for"
+    )
 
     ACTIVE = "active"
     PAUSED = "paused"
@@ -194,30 +267,89 @@ class AdsManager(BaseModel):
         (DRAFT, "Draft"),
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=DRAFT)
+    is_active = models.BooleanField(
+        default=False,
+        db_index=True,
+        editable=False,
+        help_text="Active and inside the start/end window; kept current by run_campaign_lifecycle",
+    )
+    objects = AdsManagerQuerySet.as_manager()
 
     class Meta(BaseModel.Meta):
         db_table = "main_ads_manager"
         verbose_name = "Ads Manager"
         verbose_name_plural = "Ads Managers"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["status", "start_date", "end_date"]),
+            models.Index(fields=["created_by", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.campaign_name} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        self.schedule_bitmap = compile_schedule_bitmap(self.schedule, reference=self.start_date)
+        self.is_active = self.is_live()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "schedule_bitmap", "is_active"}
+        super().save(*args, **kwargs)
+
     def get_schedule_coverage_percentage(self):
         if self.meta_schedule_slots == 0:
             return 0
         total_slots = 7 * 24  # 7 days * 24 hours
         return round((self.meta_schedule_slots / total_slots) * 100, 1)
 
-    def is_active(self):
+    def is_live(self, at=None):
         from django.utils import timezone
 
-        now = timezone.now()
-        return self.status == self.ACTIVE and self.start_date <= now <= self.end_date
+        at = at or timezone.now()
+        return self.status == self.ACTIVE and self.start_date <= at <= self.end_date
 
 
-class AdsManagerVideo(BaseModel):
+class CampaignFacet(models.Model):
+    """
+    Materialized count of a user's campaigns per targeting value (region, district,
+    interest or venue type), refreshed whenever campaigns or their targeting change.
+    """
+
+    REGION = "region"
+    DISTRICT = "district"
+    INTEREST = "interest"
+    VENUE_TYPE = "venue_type"
+    KINDS = ((REGION, "Region"), (DISTRICT, "District"), (INTEREST, "Interest"), (VENUE_TYPE, "Venue Type"))
+
+    user = models.ForeignKey("users.User", models.CASCADE, "campaign_facets")
+    kind = models.CharField(max_length=20, choices=KINDS)
+    region = models.ForeignKey("main.Region", models.CASCADE, "campaign_facets", null=True, blank=True)
+    district = models.ForeignKey("main.District", models.CASCADE, "campaign_facets", null=True, blank=True)
+    interest = models.ForeignKey("main.Interest", models.CASCADE, "campaign_facets", null=True, blank=True)
+    venue_type = models.ForeignKey("main.VenueType", models.CASCADE, "campaign_facets", null=True, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    class Meta:
+        db_table = "main_campaign_facet"
+        verbose_name = "Campaign Facet"
+        verbose_name_plural = "Campaign Facets"
+        indexes = [
+            models.Index(fields=["user", "kind"]),
+        ]
+        constraints = [
+            # One row per targeting value; only one of the target columns is set, so NULLs must compare equal
+            models.UniqueConstraint(
+                fields=["user", "kind", "region", "district", "interest", "venue_type"],
+                nulls_distinct=False,
+                name="campaign_facet_unique_value",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind}: {self.count}"
+
+
+class AdsManagerVideo(MediaModel):
     """
     Videos associated with advertising campaigns.
     """
@@ -228,18 +360,89 @@ class AdsManagerVideo(BaseModel):
     description = models.TextField(blank=True, null=True)
     duration = models.DurationField(blank=True, null=True)
     file_size = models.BigIntegerField(blank=True, null=True, help_text="File size in bytes")
+    width = models.IntegerField(blank=True, null=True, help_text="Video width in pixels")
+    height = models.IntegerField(blank=True, null=True, help_text="Video height in pixels")
+    content_hash = models.CharField(
+        max_length=64, blank=True, null=True, editable=False, help_text="SHA-256 of the video file"
+    )
 
     class Meta(BaseModel.Meta):
         db_table = "main_ads_manager_video"
         verbose_name = "Ads Manager Video"
         verbose_name_plural = "Ads Manager Videos"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["ads_manager", "-created_at", "-id"]),
+            models.Index(fields=["-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.ads_manager.campaign_name} - {self.title or 'Video'}"
 
+    def save(self, *args, **kwargs):
+        if self.video and not self.video._committed:
+            self.content_hash = None
+        self.mark_file_changed(self.video)
+        super().save(*args, **kwargs)
+
+
+class CacheVersion(models.Model):
+    """
+    Version counter embedded in cache keys and in the per-process inventory index.
+
+    Kept in the database rather than the cache, so every worker sees a bump at
+    the next read and a counter is never lost to cache eviction.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField()
+
+    class Meta:
+        db_table = "main_cache_version"
+        verbose_name = "Cache Version"
+        verbose_name_plural = "Cache Versions"
+
+    def __str__(self):
+        return f"{self.key}: {self.version}"
+
+
+class ChunkedUpload(BaseModel):
+    """
+    Resumable upload of a large campaign video, assembled chunk by chunk on disk.
+    """
+
+    UPLOADING = "uploading"
+    COMPLETING = "completing"
+    COMPLETED = "completed"
+    STATUS = ((UPLOADING, "Uploading"), (COMPLETING, "Completing"), (COMPLETED, "Completed"))
 
-class AdsManagerImage(BaseModel):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ads_manager = models.ForeignKey("main.AdsManager", models.CASCADE, "chunked_uploads")
+    filename = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, blank=True, null=True)
+    total_size = models.BigIntegerField(help_text="Expected file size in bytes")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received so far")
+    checksum = models.CharField(max_length=64, blank=True, null=True, help_text="Expected SHA-256 of the file")
+    status = models.CharField(max_length=20, choices=STATUS, default=UPLOADING)
+    video = models.OneToOneField(
+        "main.AdsManagerVideo",
+        models.SET_NULL,
+        related_name="chunked_upload",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    class Meta(BaseModel.Meta):
+        db_table = "main_chunked_upload"
+        verbose_name = "Chunked Upload"
+        verbose_name_plural = "Chunked Uploads"
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+
+class AdsManagerImage(MediaModel):
     """
     Images associated with advertising campaigns.
     """
@@ -261,22 +464,120 @@ class AdsManagerImage(BaseModel):
     def __str__(self):
         return f"{self.ads_manager.campaign_name} - {self.title or 'Image'}"
 
+    def save(self, *args, **kwargs):
+        self.mark_file_changed(self.image)
+        super().save(*args, **kwargs)
+
 
-class VideoAnalytics(BaseModel):
-    video = models.ForeignKey("main.AdsManagerVideo", models.CASCADE, "analytics")
+class VideoAnalytics(models.Model):
+    """
+    One raw video view, kept for VIDEO_ANALYTICS_RETENTION_DAYS.
+
+    Raw rows are rolled up into VideoAnalyticsDaily and then deleted by
+    compact_video_analytics, so the table is append-and-expire only: no audit
+    columns, and the User-Agent is reduced to its device class.
+    """
+
+    # Indexed by the (video, created_at) and (video, is_complete) indexes below
+    video = models.ForeignKey("main.AdsManagerVideo", models.CASCADE, "analytics", db_index=False)
     ip_address = models.GenericIPAddressField()
-    user_agent = models.TextField(blank=True, null=True)
-    referer = models.URLField(blank=True, null=True)
+    ua_class = models.CharField(max_length=8, choices=UA_CLASS_CHOICES, default=UA_OTHER)
     watch_duration = models.DurationField(blank=True, null=True)
     is_complete = models.BooleanField(default=False)
     country = models.CharField(max_length=100, blank=True, null=True)
     city = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
 
-    class Meta(BaseModel.Meta):
+    class Meta:
         db_table = "main_video_analytics"
         verbose_name = "Video Analytics"
         verbose_name_plural = "Video Analytics"
-        ordering = ("-created_at",)
+        indexes = [
+            # Covering the rollup delta and recent views: range scan per video, completes read from the index
+            models.Index(fields=["video", "created_at"], include=["is_complete"], name="video_analytics_video_time"),
+            models.Index(fields=["video", "is_complete"], name="video_analytics_video_done"),
+            # Rows arrive in time order, so a BRIN index serves the per-day rollup and retention scans
+            BrinIndex(fields=["created_at"], name="video_analytics_time_brin"),
+        ]
+
+
+class VideoAnalyticsDaily(models.Model):
+    """
+    One day of VideoAnalytics for a video, rolled up by rollup_video_analytics.
+
+    Distinct viewer IPs are kept as a HyperLogLog sketch (services/hll.py), so
+    days can be merged into an approximate unique count without the raw rows.
+    """
+
+    video = models.ForeignKey(
+        "main.AdsManagerVideo", on_delete=models.CASCADE, related_name="analytics_daily", db_index=False
+    )
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    complete_views = models.PositiveIntegerField(default=0)
+    unique_ips_hll = models.BinaryField(editable=False)
+    views_by_country = models.JSONField(default=dict, help_text="Country name -> views; null country under \"\"")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "main_video_analytics_daily"
+        verbose_name = "Video Analytics (daily)"
+        verbose_name_plural = "Video Analytics (daily)"
+        ordering = ("-day",)
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["video", "day"], name="video_analytics_daily_unique"),
+        ]
+
+
+class VideoAnalyticsRollupDay(models.Model):
+    """
+    A day whose raw VideoAnalytics rows are rolled up for every video.
+
+    Marked days run without gaps from the first raw view, so the latest one is
+    the watermark: VideoAnalyticsTotal covers every view up to it, and the raw
+    rows after it are added at read time.
+    """
+
+    day = models.DateField(primary_key=True)
+    rolled_up_at = models.DateTimeField(auto_now=True)
+    compacted_at = models.DateTimeField(
+        null=True, blank=True, help_text="When compact_video_analytics started deleting the day's raw rows"
+    )
+
+    class Meta:
+        db_table = "main_video_analytics_rollup_day"
+        verbose_name = "Video Analytics Rollup Day"
+        verbose_name_plural = "Video Analytics Rollup Days"
+        ordering = ("-day",)
+
+    def __str__(self):
+        return str(self.day)
+
+
+class VideoAnalyticsTotal(models.Model):
+    """
+    Lifetime sum of a video's VideoAnalyticsDaily rows, kept by rollup_video_analytics.
+
+    The sketch is the union of the daily sketches; unions are idempotent, so
+    rolling a day up again never inflates it.
+    """
+
+    video = models.OneToOneField(
+        "main.AdsManagerVideo", on_delete=models.CASCADE, primary_key=True, related_name="analytics_total"
+    )
+    views = models.PositiveIntegerField(default=0)
+    complete_views = models.PositiveIntegerField(default=0)
+    unique_ips_hll = models.BinaryField(editable=False)
+    views_by_country = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "main_video_analytics_total"
+        verbose_name = "Video Analytics (lifetime)"
+        verbose_name_plural = "Video Analytics (lifetime)"
 
 
 class AudienceImpression(models.Model):
@@ -349,3 +650,91 @@ class AudienceImpression(models.Model):
             models.Index(fields=["screen", "timestamp"]),
             models.Index(fields=["ads_manager", "timestamp"]),
         ]
+
+
+class AudienceHourly(models.Model):
+    """
+    Faces per screen and hour, incremented alongside each batch of AudienceImpression rows.
+    Forecasts read it instead of re-aggregating the raw impressions.
+    """
+
+    screen = models.ForeignKey("main.ScreenManager", on_delete=models.CASCADE, related_name="audience_hourly")
+    hour = models.DateTimeField()
+    faces = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "main_audience_hourly"
+        verbose_name = "Audience per Hour"
+        verbose_name_plural = "Audience per Hour"
+        ordering = ("-hour",)
+        constraints = [
+            models.UniqueConstraint(fields=["screen", "hour"], name="audience_hourly_unique"),
+        ]
+
+
+class QRScanEvent(models.Model):
+    """
+    One QR code scan, appended in batches by the redirect view's scan buffer.
+
+    Foreign keys carry no database constraint: the ids come straight from the
+    scanned URL and are written after the fact, so a deleted ad or an unknown
+    screen must not fail the whole batch.
+    """
+
+    ads_manager = models.ForeignKey(
+        "main.AdsManager", on_delete=models.CASCADE, related_name="qr_scans", db_constraint=False, db_index=False
+    )
+    screen = models.ForeignKey(
+        "main.ScreenManager",
+        on_delete=models.SET_NULL,
+        related_name="qr_scans",
+        null=True,
+        blank=True,
+        db_constraint=False,
+    )
+    timestamp = models.DateTimeField()
+    ua_class = models.CharField(max_length=8, choices=UA_CLASS_CHOICES, default=UA_OTHER)
+
+    class Meta:
+        db_table = "main_qr_scan_event"
+        verbose_name = "QR Scan Event"
+        verbose_name_plural = "QR Scan Events"
+        ordering = ("-timestamp",)
+        indexes = [
+            models.Index(fields=["ads_manager", "timestamp"]),
+        ]
+
+
+class QRScanHourly(models.Model):
+    """
+    QR scans per ad, screen and hour, incremented alongside each batch of QRScanEvent rows.
+    """
+
+    ads_manager = models.ForeignKey(
+        "main.AdsManager",
+        on_delete=models.CASCADE,
+        related_name="qr_scans_hourly",
+        db_constraint=False,
+        db_index=False,
+    )
+    screen = models.ForeignKey(
+        "main.ScreenManager",
+        on_delete=models.CASCADE,
+        related_name="qr_scans_hourly",
+        null=True,
+        blank=True,
+        db_constraint=False,
+    )
+    hour = models.DateTimeField()
+    scans = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "main_qr_scan_hourly"
+        verbose_name = "QR Scans per Hour"
+        verbose_name_plural = "QR Scans per Hour"
+        ordering = ("-hour",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ads_manager", "screen", "hour"], name="qr_scan_hourly_unique", nulls_distinct=False
+            ),
+        ]
@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Each page is fetched with a WHERE on the last seen created_at instead of an
+    OFFSET, and no COUNT(*) is issued, so deep pages cost the same as the first.
+    The ordering is fixed; ?ordering= is ignored in this mode.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "limit"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
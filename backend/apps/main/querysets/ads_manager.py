@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from django.db import models
+from django.db.models import BooleanField, Case, F, Func, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from apps.main.services.schedule import slot_for_datetime
+
+
+class AdsManagerQuerySet(models.QuerySet):
+    """
+    Custom queryset for AdsManager model with campaign lifecycle filters.
+    """
+    def live(self, at: datetime | None = None):
+        """
+        Filter campaigns that are active and inside their start/end window.
+
+        For the current moment the indexed is_active flag maintained by
+        run_campaign_lifecycle narrows the scan, and the window is still checked
+        so a late or stopped lifecycle job never keeps an ended campaign on air.
+        Other moments use the (status, start_date, end_date) index.
+        """
+        if at is None:
+            now = timezone.now()
+            return self.filter(is_active=True, status=self.model.ACTIVE, start_date__lte=now, end_date__gte=now)
+        return self.filter(status=self.model.ACTIVE, start_date__lte=at, end_date__gte=at)
+
+    def is_active_expression(self, status: str | None = None, at: datetime | None = None):
+        """
+        SQL expression for is_active in set-based updates. It uses each row's own
+        status, or the status being written when one is passed in.
+        """
+        at = at or timezone.now()
+        condition = Q(start_date__lte=at, end_date__gte=at)
+        if status is None:
+            condition &= Q(status=self.model.ACTIVE)
+        elif status != self.model.ACTIVE:
+            return Value(False)
+        return Case(When(condition, then=Value(True)), default=Value(False), output_field=BooleanField())
+
+    def refresh_is_active(self, at: datetime | None = None) -> int:
+        """
+        Recompute is_active for the rows whose flag no longer matches their status and dates.
+        """
+        at = at or timezone.now()
+        window = Q(status=self.model.ACTIVE, start_date__lte=at, end_date__gte=at)
+        started = self.filter(window, is_active=False).update(is_active=True)
+        stopped = self.filter(is_active=True).exclude(window).update(is_active=False)
+        return started + stopped
+
+    def scheduled_at(self, at: datetime | None = None):
+        """
+        Filter campaigns whose compiled schedule bitmap covers the slot of the given moment.
+        Campaigns without a compiled bitmap are not restricted.
+        """
+        slot = slot_for_datetime(at or timezone.now())
+        return self.annotate(
+            scheduled_bit=Func(F("schedule_bitmap"), Value(slot), function="get_bit", output_field=IntegerField())
+        ).filter(Q(schedule_bitmap__isnull=True) | Q(scheduled_bit=1))
@@ -0,0 +1,59 @@
+import math
+
+from django.db import models
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+from apps.main.services.geo import EARTH_RADIUS_KM, BBox, radius_bbox
+
+
+class ScreenManagerQuerySet(models.QuerySet):
+    """
+    Custom queryset for ScreenManager model with geographic filters on the
+    indexed latitude/longitude columns.
+    """
+    def located(self):
+        """
+        Filter screens with valid coordinates.
+        """
+        return self.filter(latitude__isnull=False, longitude__isnull=False)
+
+    def in_bbox(self, bbox: BBox):
+        """
+        Filter screens inside a latitude/longitude box; a box with west > east
+        crosses the antimeridian.
+        """
+        longitude = Q(longitude__gte=bbox.west, longitude__lte=bbox.east)
+        if bbox.west > bbox.east:
+            longitude = Q(longitude__gte=bbox.west) | Q(longitude__lte=bbox.east)
+        return self.filter(longitude, latitude__gte=bbox.south, latitude__lte=bbox.north)
+
+    def with_distance(self, latitude: float, longitude: float):
+        """
+        Annotate distance_km, the great-circle (haversine) distance to the given point.
+        """
+        half_chord = (
+            Power(Sin((Radians(F("latitude")) - Value(math.radians(latitude))) / 2), 2)
+            + Cos(Value(math.radians(latitude)))
+            * Cos(Radians(F("latitude")))
+            * Power(Sin((Radians(F("longitude")) - Value(math.radians(longitude))) / 2), 2)
+        )
+        return self.annotate(
+            distance_km=Value(2 * EARTH_RADIUS_KM)
+            * ASin(Least(Value(1.0), Sqrt(half_chord)), output_field=FloatField())
+        )
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float):
+        """
+        Filter screens within radius_km of the given point, nearest first.
+
+        The bounding box of the circle narrows the scan to an index range; the
+        exact distance is only computed for the screens inside it.
+        """
+        return (
+            self.in_bbox(radius_bbox(latitude, longitude, radius_km))
+            .with_distance(latitude, longitude)
+            .filter(distance_km__lte=radius_km)
+            .order_by("distance_km", "id")
+        )
+
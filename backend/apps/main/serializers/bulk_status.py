@@ -0,0 +1,20 @@
+from typing import Any
+
+from rest_framework import serializers
+
+BULK_STATUS_MAX_IDS = 1000
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """
+    Serializer for bulk status transitions.
+    Validates the list of ids and the target status against the model's choices.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_STATUS_MAX_IDS
+    )
+    status = serializers.ChoiceField(choices=[])
+
+    def __init__(self, *args: Any, status_choices=(), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.fields["status"].choices = status_choices
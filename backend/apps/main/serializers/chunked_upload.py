@@ -0,0 +1,69 @@
+from typing import Any, Dict
+
+from django.conf import settings
+from rest_framework import serializers
+
+from main.models import AdsManager, ChunkedUpload
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """
+    Serializer for ChunkedUpload model.
+    Starts a resumable video upload and reports how many bytes were received.
+    """
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id",
+            "ads_manager",
+            "filename",
+            "title",
+            "total_size",
+            "checksum",
+            "offset",
+            "chunk_size",
+            "status",
+            "video",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "offset", "chunk_size", "status", "video", "created_at", "updated_at"]
+
+    def get_chunk_size(self, obj) -> int:
+        """Recommended chunk size for the client."""
+        return settings.CHUNKED_UPLOAD_CHUNK_SIZE
+
+    def validate_ads_manager(self, value: AdsManager) -> AdsManager:
+        """
+        Ensure the ads manager belongs to the current user.
+        """
+        if value.created_by_id != self.context["request"].user.id:
+            raise serializers.ValidationError("You can only add videos to your own ads managers.")
+        return value
+
+    def validate_total_size(self, value: int) -> int:
+        """
+        Ensure the declared size is within the configured upload limit.
+        """
+        if value <= 0:
+            raise serializers.ValidationError("total_size must be positive")
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"File exceeds {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes")
+        return value
+
+    def validate_checksum(self, value: str | None) -> str | None:
+        """
+        Accept an optional hex SHA-256 of the whole file.
+        """
+        if value and (len(value) != 64 or any(c not in "0123456789abcdefABCDEF" for c in value)):
+            raise serializers.ValidationError("checksum must be a hex SHA-256 digest")
+        return value.lower() if value else value
+
+    def create(self, validated_data: Dict[str, Any]) -> ChunkedUpload:
+        """
+        Create upload session and set created_by to current user.
+        """
+        validated_data["created_by"] = self.context["request"].user
+        return super().create(validated_data)
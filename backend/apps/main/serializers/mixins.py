@@ -0,0 +1,19 @@
+from typing import Iterable, Optional
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that renders only a subset of its fields.
+
+    Pass ``fields=[...]`` to keep just those fields. ``Meta.compact_fields`` lists
+    the columns used by table views (``?view=compact``), and ``field_dependencies``
+    maps computed fields to the model fields they read, so views can limit the
+    columns they load with ``.only()``.
+    """
+    field_dependencies: dict[str, list[str]] = {}
+
+    def __init__(self, *args, fields: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
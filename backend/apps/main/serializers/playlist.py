@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+from main.models import AdsManagerVideo
+
+
+class PlaylistManifestItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a single creative in a screen playlist manifest.
+    Exposes only what a screen needs to decide whether its local copy is current.
+    """
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AdsManagerVideo
+        fields = [
+            "id",
+            "ads_manager",
+            "title",
+            "content_hash",
+            "file_size",
+            "duration",
+            "url",
+        ]
+        read_only_fields = fields
+
+    def get_url(self, obj):
+        """Get the URL for serving the video."""
+        return f"/api/v1/main/ads-videos/{obj.id}/serve/"
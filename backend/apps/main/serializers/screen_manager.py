@@ -3,11 +3,13 @@ from rest_framework import serializers
 
 from apps.main.serializers.regions import RegionSerializer, DistrictSerializer
 from apps.main.serializers.interest import InterestSerializer
+from apps.main.serializers.mixins import SparseFieldsetMixin
 from apps.main.serializers.venue_type import VenueTypeSerializer
 from main.models import ScreenManager, AdsManager, AdsManagerVideo, AdsManagerImage, Region, District, Interest, VenueType
+from main.services.qr_codes import qr_url
 
 
-class ScreenManagerSerializer(serializers.ModelSerializer):
+class ScreenManagerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for ScreenManager model.
     Handles screen manager data with region, district, and venue types.
@@ -49,6 +51,17 @@ class ScreenManagerSerializer(serializers.ModelSerializer):
             "updated_by",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "created_by", "updated_by"]
+        compact_fields = [
+            "id",
+            "title",
+            "position",
+            "location",
+            "status",
+            "type_category",
+            "screen_size",
+            "screen_resolution",
+            "created_at",
+        ]
 
     def create(self, validated_data: Dict[str, Any]) -> ScreenManager:
         """
@@ -141,14 +154,13 @@ class ScreenManagerSerializer(serializers.ModelSerializer):
         return instance
 
 
-class AdsManagerSerializer(serializers.ModelSerializer):
+class AdsManagerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for AdsManager model.
     Handles ads campaign data with region, district, interests, venue types, and content files.
     """
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     schedule_coverage_percentage = serializers.SerializerMethodField()
-    is_active = serializers.SerializerMethodField()
     region_id = serializers.IntegerField(write_only=True, required=False)
     district_id = serializers.IntegerField(write_only=True, required=False)
     interest_ids = serializers.ListField(
@@ -186,6 +198,12 @@ class AdsManagerSerializer(serializers.ModelSerializer):
     venue_types = VenueTypeSerializer(many=True, read_only=True)
     videos = serializers.SerializerMethodField()
     images = serializers.SerializerMethodField()
+    field_dependencies = {
+        "status_display": ["status"],
+        "schedule_coverage_percentage": ["meta_schedule_slots"],
+        "videos": [],
+        "images": [],
+    }
     
     class Meta:
         model = AdsManager
@@ -220,12 +238,28 @@ class AdsManagerSerializer(serializers.ModelSerializer):
             "link",
             "involve_count",
             "qr_code",
+            "qr_status",
             "created_at",
             "updated_at",
             "created_by",
             "updated_by",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "created_by", "updated_by", "involve_count", "qr_code"]
+        read_only_fields = [
+            "id", "created_at", "updated_at", "created_by", "updated_by", "involve_count", "qr_code", "qr_status"
+        ]
+        compact_fields = [
+            "id",
+            "campaign_name",
+            "budget",
+            "currency",
+            "start_date",
+            "end_date",
+            "status",
+            "status_display",
+            "is_active",
+            "involve_count",
+            "created_at",
+        ]
     
     def get_schedule_coverage_percentage(self, obj):
         """
@@ -233,12 +267,6 @@ class AdsManagerSerializer(serializers.ModelSerializer):
         """
         return obj.get_schedule_coverage_percentage()
     
-    def get_is_active(self, obj):
-        """
-        Check if ads manager is currently active.
-        """
-        return obj.is_active()
-    
     def get_videos(self, obj):
         """
         Get list of videos associated with the ads manager.
@@ -250,6 +278,10 @@ class AdsManagerSerializer(serializers.ModelSerializer):
                 'title': video.title,
                 'description': video.description,
                 'file_size': video.file_size,
+                'duration': video.duration,
+                'width': video.width,
+                'height': video.height,
+                'processing_status': video.processing_status,
                 'created_at': video.created_at,
             }
             for video in obj.videos.all()
@@ -268,6 +300,7 @@ class AdsManagerSerializer(serializers.ModelSerializer):
                 'file_size': image.file_size,
                 'width': image.width,
                 'height': image.height,
+                'processing_status': image.processing_status,
                 'created_at': image.created_at,
             }
             for image in obj.images.all()
@@ -469,6 +502,10 @@ class AdsManagerVideoSerializer(serializers.ModelSerializer):
             "description",
             "duration",
             "file_size",
+            "width",
+            "height",
+            "content_hash",
+            "processing_status",
             "qr_code",
             "qr_code_url",
             "ad_link",
@@ -478,7 +515,19 @@ class AdsManagerVideoSerializer(serializers.ModelSerializer):
             "created_by",
             "updated_by",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "created_by", "updated_by", "file_size"]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "created_by",
+            "updated_by",
+            "duration",
+            "file_size",
+            "width",
+            "height",
+            "content_hash",
+            "processing_status",
+        ]
     
     def get_video_url(self, obj):
         """Get the URL for serving the video."""
@@ -503,13 +552,13 @@ class AdsManagerVideoSerializer(serializers.ModelSerializer):
     def get_qr_code_url(self, obj):
         """
         Get the QR code redirect URL (the URL that the QR code points to).
+        When the context carries a screen_id, the URL attributes scans to that screen.
         
         Returns:
             str: QR code redirect URL, or None if not available
         """
-        if obj.ads_manager:
-            from django.conf import settings
-            return f"{settings.BACKEND_URL}/api/v1/main/qr/{obj.ads_manager.id}/"
+        if obj.ads_manager_id:
+            return qr_url(obj.ads_manager_id, self.context.get("screen_id"))
         return None
     
     def create(self, validated_data: Dict[str, Any]) -> AdsManagerVideo:
@@ -548,12 +597,15 @@ class AdsManagerImageSerializer(serializers.ModelSerializer):
             "file_size",
             "width",
             "height",
+            "processing_status",
             "created_at",
             "updated_at",
             "created_by",
             "updated_by",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "created_by", "updated_by", "file_size", "width", "height"]
+        read_only_fields = [
+            "id", "created_at", "updated_at", "created_by", "updated_by", "file_size", "width", "height", "processing_status"
+        ]
     
     def create(self, validated_data: Dict[str, Any]) -> AdsManagerImage:
         """
@@ -577,7 +629,20 @@ class SummarySerializer(serializers.ModelSerializer):
     Validates filter parameters for summary calculation.
     """
     interests = serializers.PrimaryKeyRelatedField(queryset=Interest.objects.all(), many=True)
+    schedule = serializers.JSONField(required=False, binary=True)
 
     class Meta:
         model = AdsManager
-        fields = ["district", "region", 'venue_types', 'interests']
+        fields = ["district", "region", 'venue_types', 'interests', 'budget', 'schedule', 'start_date', 'end_date']
+        extra_kwargs = {
+            "budget": {"required": False},
+            "start_date": {"required": False},
+            "end_date": {"required": False},
+        }
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        start_date = attrs.get("start_date")
+        end_date = attrs.get("end_date")
+        if start_date and end_date and end_date <= start_date:
+            raise serializers.ValidationError({"end_date": "End date must be after start date."})
+        return attrs
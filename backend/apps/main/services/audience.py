@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timezone as dt_timezone
+from typing import Iterable
+
+from django.db import connection, transaction
+
+from main.models import AudienceHourly, AudienceImpression
+
+
+def _increment_hourly(impressions: list[AudienceImpression]) -> None:
+    """
+    Add the faces of the impressions to AudienceHourly with one upsert.
+    """
+    hours = Counter()
+    for impression in impressions:
+        hour = impression.timestamp.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+        hours[impression.screen_id, hour] += impression.face_count
+    if not hours:
+        return
+
+    params = []
+    for (screen_id, hour), faces in hours.items():
+        params += [screen_id, hour, faces]
+    table = AudienceHourly._meta.db_table
+    rows = ", ".join(["(%s, %s, %s)"] * len(hours))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (screen_id, hour, faces) VALUES {rows} "
+            f"ON CONFLICT (screen_id, hour) DO UPDATE SET faces = {table}.faces + EXCLUDED.faces",
+            params,
+        )
+
+
+def record_audience_impressions(impressions: Iterable[AudienceImpression], batch_size: int = 500) -> int:
+    """
+    Store a batch of impressions and their AudienceHourly rollup in one transaction.
+    Returns the number of impressions stored.
+    """
+    impressions = list(impressions)
+    with transaction.atomic():
+        AudienceImpression.objects.bulk_create(impressions, batch_size=batch_size)
+        _increment_hourly(impressions)
+    return len(impressions)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count
+
+from main.models import AdsManager, CampaignFacet
+
+# Facet kind -> AdsManager lookup holding the targeting value
+FACET_LOOKUPS = {
+    CampaignFacet.REGION: "region",
+    CampaignFacet.DISTRICT: "district",
+    CampaignFacet.INTEREST: "interests",
+    CampaignFacet.VENUE_TYPE: "venue_types",
+}
+FACET_UNIQUE_FIELDS = ["user", "kind", "region", "district", "interest", "venue_type"]
+
+
+def refresh_campaign_facets(user_id: int, kinds: Optional[Iterable[str]] = None) -> None:
+    """
+    Recount the given facet kinds (all by default) of one user's campaigns.
+
+    Each kind costs one grouped query. Counts are upserted on the unique
+    (user, kind, value) constraint and values no longer used are deleted, so
+    concurrent refreshes of the same user never leave duplicate rows.
+    """
+    for kind in kinds or FACET_LOOKUPS:
+        lookup = FACET_LOOKUPS[kind]
+        rows = list(
+            AdsManager.objects.filter(created_by_id=user_id, **{f"{lookup}__isnull": False})
+            .values(lookup)
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        facets = [
+            CampaignFacet(user_id=user_id, kind=kind, count=row["count"], **{f"{kind}_id": row[lookup]})
+            for row in rows
+        ]
+        with transaction.atomic():
+            CampaignFacet.objects.bulk_create(
+                facets,
+                update_conflicts=True,
+                unique_fields=FACET_UNIQUE_FIELDS,
+                update_fields=["count", "updated_at"],
+            )
+            CampaignFacet.objects.filter(user_id=user_id, kind=kind).exclude(
+                **{f"{kind}_id__in": [row[lookup] for row in rows]}
+            ).delete()
+
+
+def schedule_facet_refresh(user_ids: Iterable[Optional[int]], kinds: Optional[Iterable[str]] = None) -> None:
+    """
+    Refresh facets of the given users once the current transaction commits.
+    """
+    kinds = list(kinds) if kinds is not None else None
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        transaction.on_commit(lambda user_id=user_id: refresh_campaign_facets(user_id, kinds))
+
+
+def get_campaign_facets(user_id: int, kinds: Optional[Iterable[str]] = None) -> dict[str, list[dict[str, Any]]]:
+    """
+    Facets of a user (all kinds by default) in one query, keyed by kind and sorted by name.
+    """
+    kinds = list(kinds or FACET_LOOKUPS)
+    facets = {kind: [] for kind in kinds}
+    queryset = CampaignFacet.objects.filter(user_id=user_id, kind__in=kinds).select_related(*kinds)
+    for facet in queryset:
+        target = getattr(facet, facet.kind)
+        item = {"id": target.id, "name": target.name}
+        if facet.kind in (CampaignFacet.REGION, CampaignFacet.DISTRICT):
+            item["code"] = target.code
+        else:
+            item["slug"] = target.slug
+        item["count"] = facet.count
+        facets[facet.kind].append(item)
+    for items in facets.values():
+        items.sort(key=lambda item: item["name"])
+    return facets
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from main.models import AdsManager
+
+
+def _cache_key(user_id: int) -> str:
+    return f"campaign_stats:{user_id}"
+
+
+def _compute_campaign_stats(user_id: int) -> dict[str, Any]:
+    """
+    Campaign counts and budgets per status, in a single conditional aggregation.
+    """
+    aggregates = {"total": Count("id"), "total_budget": Sum("budget")}
+    for status, _ in AdsManager.STATUS_CHOICES:
+        status_filter = Q(status=status)
+        aggregates[f"{status}_count"] = Count("id", filter=status_filter)
+        aggregates[f"{status}_budget"] = Sum("budget", filter=status_filter)
+
+    row = AdsManager.objects.filter(created_by_id=user_id).aggregate(**aggregates)
+    return {
+        "total": row["total"],
+        "total_budget": float(row["total_budget"] or 0),
+        "by_status": {
+            status: {"count": row[f"{status}_count"], "total_budget": float(row[f"{status}_budget"] or 0)}
+            for status, _ in AdsManager.STATUS_CHOICES
+        },
+    }
+
+
+def get_campaign_stats(user_id: int) -> dict[str, Any]:
+    """
+    Cached campaign statistics of a user, shared by the dashboard stats endpoints.
+    """
+    key = _cache_key(user_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute_campaign_stats(user_id)
+        cache.set(key, stats, settings.CAMPAIGN_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_campaign_stats(user_id: int | None) -> None:
+    """
+    Drop a user's cached statistics once the current transaction commits.
+    """
+    if user_id is not None:
+        transaction.on_commit(lambda: cache.delete(_cache_key(user_id)))
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import AdsManagerVideo, ChunkedUpload
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkedUploadError(Exception):
+    """Error while receiving a chunk or assembling an uploaded file."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _AssembledFile(File):
+    """
+    File wrapper exposing temporary_file_path(), so FileSystemStorage moves the
+    assembled file into place instead of copying it.
+    """
+
+    def temporary_file_path(self) -> str:
+        return self.file.name
+
+
+def upload_path(upload: ChunkedUpload) -> str:
+    """
+    Location of the partially assembled file on local disk.
+    """
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{upload.id}.part")
+
+
+def start_upload(upload: ChunkedUpload) -> None:
+    """
+    Create the empty part file for a new upload session.
+    """
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    with open(upload_path(upload), "wb"):
+        pass
+
+
+def write_chunk(upload_id: str, start: int, length: int, stream: BinaryIO) -> ChunkedUpload:
+    """
+    Append one chunk from the request stream to the part file.
+
+    Chunks must arrive in order: start has to match the number of bytes already
+    received, which the client can always ask for to resume. The body is copied
+    in small blocks, so memory use does not depend on the chunk size.
+    """
+    if length <= 0:
+        raise ChunkedUploadError("Empty chunk")
+    if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+        raise ChunkedUploadError(f"Chunk exceeds {settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE} bytes", status=413)
+
+    with transaction.atomic():
+        # Row lock serialises concurrent chunks of the same upload.
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.status == ChunkedUpload.COMPLETING:
+            raise ChunkedUploadError("Upload is being completed", status=409)
+        if upload.status != ChunkedUpload.UPLOADING:
+            raise ChunkedUploadError("Upload is already completed", status=409)
+        if start != upload.offset:
+            raise ChunkedUploadError(f"Expected chunk at offset {upload.offset}", status=409)
+        if start + length > upload.total_size:
+            raise ChunkedUploadError("Chunk goes past the declared file size")
+
+        written = 0
+        with open(upload_path(upload), "r+b") as fh:
+            fh.seek(start)
+            # Drop whatever a previously interrupted chunk left behind.
+            fh.truncate()
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                fh.write(block)
+                written += len(block)
+
+        if written != length:
+            raise ChunkedUploadError(f"Chunk truncated: received {written} of {length} bytes")
+
+        upload.offset = start + written
+        upload.save(update_fields=["offset", "updated_at"])
+    return upload
+
+
+def _file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _claim_for_completion(upload_id: str) -> ChunkedUpload:
+    """
+    Move a fully received upload to completing, so chunks and a second complete
+    call are refused while its file is hashed and moved.
+    """
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().select_related("ads_manager").get(pk=upload_id)
+        if upload.status == ChunkedUpload.COMPLETING:
+            raise ChunkedUploadError("Upload is already being completed", status=409)
+        if upload.status != ChunkedUpload.UPLOADING:
+            raise ChunkedUploadError("Upload is already completed", status=409)
+        if upload.offset != upload.total_size:
+            raise ChunkedUploadError(f"Upload is incomplete: {upload.offset} of {upload.total_size} bytes received")
+
+        upload.status = ChunkedUpload.COMPLETING
+        upload.save(update_fields=["status", "updated_at"])
+    return upload
+
+
+def complete_upload(upload_id: str, user) -> AdsManagerVideo:
+    """
+    Attach the fully received file to a new AdsManagerVideo.
+
+    The row lock is only held to claim the upload: hashing and moving a large
+    file happen outside any transaction, and a second short transaction records
+    the result. If the file cannot be attached, the upload goes back to
+    uploading with its part file intact, so the client can retry or abort.
+    The video row then goes through the regular background ingestion pipeline.
+    """
+    upload = _claim_for_completion(upload_id)
+    path = upload_path(upload)
+    try:
+        if upload.checksum and _file_checksum(path) != upload.checksum.lower():
+            raise ChunkedUploadError("Checksum mismatch", status=422)
+
+        video = AdsManagerVideo(ads_manager=upload.ads_manager, title=upload.title, created_by=user)
+        with open(path, "rb") as fh:
+            video.video.save(os.path.basename(upload.filename), _AssembledFile(fh), save=True)
+    except Exception:
+        ChunkedUpload.objects.filter(pk=upload.pk, status=ChunkedUpload.COMPLETING).update(
+            status=ChunkedUpload.UPLOADING, updated_at=timezone.now()
+        )
+        raise
+
+    with transaction.atomic():
+        upload.status = ChunkedUpload.COMPLETED
+        upload.video = video
+        upload.updated_by = user
+        upload.save(update_fields=["status", "video", "updated_by", "updated_at"])
+
+    if os.path.exists(path):
+        os.remove(path)
+    logger.info(f"Chunked upload {upload.id} assembled into video {video.id}")
+    return video
+
+
+def abort_upload(upload: ChunkedUpload) -> None:
+    """
+    Drop an upload session together with its part file.
+    """
+    path = upload_path(upload)
+    upload.delete()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def purge_expired_uploads() -> int:
+    """
+    Remove unfinished uploads that have not received a chunk within CHUNKED_UPLOAD_EXPIRY,
+    including completions abandoned by a killed worker.
+    """
+    expired = ChunkedUpload.objects.filter(
+        status__in=[ChunkedUpload.UPLOADING, ChunkedUpload.COMPLETING],
+        updated_at__lt=timezone.now() - settings.CHUNKED_UPLOAD_EXPIRY,
+    )
+    count = 0
+    for upload in expired:
+        abort_upload(upload)
+        count += 1
+    return count
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min, QuerySet, Sum
+from django.db.models.functions import Extract, ExtractHour, ExtractWeekDay
+from django.utils import timezone
+
+from main.models import AudienceHourly, ScreenManager
+from main.services.inventory import get_inventory_index, get_inventory_version
+from main.services.popularity import popularity_matrix
+from main.services.schedule import HOURS_PER_DAY, SLOTS_PER_WEEK, bitmap_matrix, compile_schedule, slot_index, to_bytes
+
+# Faces per hour seen by a screen when its venue is at 100% of its usual peak
+BASE_HOURLY_AUDIENCE = 120
+# Share of a screen's weekly audience made of distinct people (the rest are repeat passers-by)
+UNIQUE_AUDIENCE_RATIO = 0.35
+# How far back audience history is used
+AUDIENCE_LOOKBACK_DAYS = 28
+# Campaign length assumed when no dates are given
+DEFAULT_CAMPAIGN_DAYS = 7
+
+
+def _default_popularity() -> np.ndarray:
+    """
+    Popularity profile for screens without popular_times: busy daytime, quiet nights.
+    """
+    hours = np.tile(np.arange(HOURS_PER_DAY), SLOTS_PER_WEEK // HOURS_PER_DAY)
+    return np.where((hours >= 7) & (hours < 22), 0.5, 0.1)
+
+
+DEFAULT_POPULARITY = _default_popularity()
+
+
+def campaign_slot_hours(start_date: datetime, end_date: datetime, tz_name: str | None = None) -> np.ndarray:
+    """
+    How many times each local weekly slot occurs between start_date and end_date, as a (168,) array.
+    """
+    zone = ZoneInfo(tz_name or settings.SCHEDULE_TIME_ZONE)
+    start = start_date.astimezone(zone).replace(minute=0, second=0, microsecond=0)
+    hours = max(0, math.ceil((end_date - start).total_seconds() / 3600))
+    first_slot = slot_index((start.weekday() + 1) % 7, start.hour)
+    slots = (first_slot + np.arange(hours)) % SLOTS_PER_WEEK
+    return np.bincount(slots, minlength=SLOTS_PER_WEEK)
+
+
+def matching_screens(
+    region: Any, district: Any = None, venue_types: Iterable[Any] = (), interests: Iterable[Any] = ()
+) -> QuerySet[ScreenManager]:
+    """
+    Active screens a campaign with this targeting can play on, resolved through the inventory index.
+    """
+    screen_ids = get_inventory_index().screens_matching(
+        getattr(region, "pk", region),
+        getattr(district, "pk", district),
+        [getattr(value, "pk", value) for value in venue_types or ()],
+        [getattr(value, "pk", value) for value in interests or ()],
+    )
+    return ScreenManager.objects.filter(id__in=screen_ids)
+
+
+def slot_occurrences(first_seen: np.ndarray, now: datetime, tz_name: str | None = None) -> np.ndarray:
+    """
+    How many times each weekly slot occurred between each first_seen timestamp
+    (epoch seconds) and now, as an (N, 168) array.
+    """
+    zone = ZoneInfo(tz_name or settings.SCHEDULE_TIME_ZONE)
+    now_local = now.astimezone(zone)
+    now_slot = slot_index((now_local.weekday() + 1) % 7, now_local.hour)
+    hours = np.floor(now.timestamp() / 3600) - np.floor(first_seen / 3600) + 1
+    # Slots counted backwards from the current one: k steps back occurs ceil((hours - k) / 168) times.
+    steps_back = (now_slot - np.arange(SLOTS_PER_WEEK)) % SLOTS_PER_WEEK
+    return np.maximum(np.ceil((hours[:, None] - steps_back[None, :]) / SLOTS_PER_WEEK), 0)
+
+
+def audience_matrix(screen_ids: list[int], tz_name: str | None = None):
+    """
+    Observed faces per hour for each screen and local weekly slot.
+
+    Returns an (N, 168) rate matrix and a boolean matrix of the slots with data.
+    Faces are averaged over every occurrence of the slot since the screen first
+    reported within the lookback window, so quiet hours count as zero audience.
+    Reads the AudienceHourly rollup, at most one row per screen and hour.
+    """
+    zone = ZoneInfo(tz_name or settings.SCHEDULE_TIME_ZONE)
+    now = timezone.now()
+    since = (now - timedelta(days=AUDIENCE_LOOKBACK_DAYS)).replace(minute=0, second=0, microsecond=0)
+    rows = (
+        AudienceHourly.objects.filter(screen_id__in=screen_ids, hour__gte=since)
+        .annotate(
+            weekday=ExtractWeekDay("hour", tzinfo=zone),
+            local_hour=ExtractHour("hour", tzinfo=zone),
+        )
+        .values("screen_id", "weekday", "local_hour")
+        .annotate(total=Sum("faces"), first_seen=Extract(Min("hour"), "epoch"))
+        .order_by()
+        .values_list("screen_id", "weekday", "local_hour", "total", "first_seen")
+    )
+
+    rates = np.zeros((len(screen_ids), SLOTS_PER_WEEK))
+    observed = np.zeros((len(screen_ids), SLOTS_PER_WEEK), dtype=bool)
+    data = np.array(list(rows), dtype=float).reshape(-1, 5)
+    if not len(data):
+        return rates, observed
+
+    positions = {screen_id: position for position, screen_id in enumerate(screen_ids)}
+    screen_rows = np.array([positions[screen_id] for screen_id in data[:, 0].astype(np.int64)])
+    # ExtractWeekDay counts 1 (Sunday) .. 7 (Saturday), like the schedule's 0..6
+    slots = ((data[:, 1] - 1) * HOURS_PER_DAY + data[:, 2]).astype(np.int64)
+    first_seen = np.full(len(screen_ids), np.inf)
+    np.minimum.at(first_seen, screen_rows, data[:, 4])
+
+    reporting = np.isfinite(first_seen)
+    occurrences = np.zeros((len(screen_ids), SLOTS_PER_WEEK))
+    occurrences[reporting] = slot_occurrences(first_seen[reporting], now, tz_name)
+    observed = occurrences > 0
+    faces = np.zeros((len(screen_ids), SLOTS_PER_WEEK))
+    faces[screen_rows, slots] = data[:, 3]
+    np.divide(faces, occurrences, out=rates, where=observed)
+    return rates, observed
+
+
+def build_forecast(
+    region: Any,
+    district: Any = None,
+    venue_types: Iterable[Any] = (),
+    interests: Iterable[Any] = (),
+    schedule: Optional[dict[str, Any]] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """
+    Budget-independent delivery forecast for a targeting and schedule.
+
+    Hourly audience per screen comes from AudienceHourly history where
+    available and from the compiled popular_times profile elsewhere, scaled to
+    the screen's observed level. It is masked by the campaign schedule, weighted by how often each
+    weekly slot occurs in the flight and priced with each screen's CPM, all as
+    NumPy operations over a screens x 168 matrix.
+    """
+    start_date = start_date or timezone.now()
+    end_date = end_date or start_date + timedelta(days=DEFAULT_CAMPAIGN_DAYS)
+
+    screens = matching_screens(region, district, venue_types, interests)
+    screen_rows = list(screens.values_list("id", "cpm", "popularity_profile"))
+    if not screen_rows:
+        return {"screens_count": 0, "impressions": 0.0, "audience_pool": 0.0, "cost": 0.0}
+
+    screen_ids, cpms, profiles = zip(*screen_rows)
+    cpm = np.array(cpms, dtype=float)
+    modelled = popularity_matrix(profiles, DEFAULT_POPULARITY) * BASE_HOURLY_AUDIENCE
+
+    rates, observed = audience_matrix(list(screen_ids))
+    # Calibrate the popularity model to each screen's observed audience level.
+    observed_total = np.where(observed, rates, 0).sum(axis=1)
+    modelled_total = np.where(observed, modelled, 0).sum(axis=1)
+    scale = np.divide(observed_total, modelled_total, out=np.ones_like(observed_total), where=modelled_total > 0)
+    hourly_audience = np.where(observed, rates, modelled * scale[:, None])
+
+    schedule_mask = bitmap_matrix([to_bytes(compile_schedule(schedule))])[0]
+    slot_hours = campaign_slot_hours(start_date, end_date) * schedule_mask
+
+    impressions = hourly_audience @ slot_hours
+    weekly_audience = hourly_audience.sum(axis=1)
+    return {
+        "screens_count": len(screen_ids),
+        "impressions": float(impressions.sum()),
+        "audience_pool": float(weekly_audience.sum() * UNIQUE_AUDIENCE_RATIO),
+        "cost": float((impressions / 1000 * cpm).sum()),
+    }
+
+
+def _forecast_cache_key(
+    region: Any,
+    district: Any,
+    venue_types: Iterable[Any],
+    interests: Iterable[Any],
+    schedule: Optional[dict[str, Any]],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+) -> str:
+    """
+    Normalized targeting signature: ids instead of instances, sorted id lists,
+    the compiled schedule instead of its JSON and dates rounded to the hour.
+    """
+    hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    signature = {
+        "region": getattr(region, "pk", region),
+        "district": getattr(district, "pk", district),
+        "venue_types": sorted({getattr(value, "pk", value) for value in venue_types or ()}),
+        "interests": sorted({getattr(value, "pk", value) for value in interests or ()}),
+        "schedule": format(compile_schedule(schedule), "x"),
+        "start": (start_date or hour).replace(minute=0, second=0, microsecond=0).isoformat(),
+        "end": end_date.replace(minute=0, second=0, microsecond=0).isoformat() if end_date else None,
+        # Audience history is averaged hourly, so an entry never outlives the hour it was built in.
+        "audience_hour": hour.isoformat(),
+    }
+    digest = hashlib.sha1(json.dumps(signature, sort_keys=True).encode()).hexdigest()
+    return f"forecast:{get_inventory_version()}:{digest}"
+
+
+def get_forecast(
+    region: Any,
+    district: Any = None,
+    venue_types: Iterable[Any] = (),
+    interests: Iterable[Any] = (),
+    schedule: Optional[dict[str, Any]] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """
+    Cached build_forecast(). Entries are keyed by the targeting signature and the
+    inventory version, so any screen change makes them unreachable; the budget
+    is applied afterwards and never fragments the cache.
+    """
+    key = _forecast_cache_key(region, district, venue_types, interests, schedule, start_date, end_date)
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = build_forecast(region, district, venue_types, interests, schedule, start_date, end_date)
+        cache.set(key, forecast, settings.FORECAST_CACHE_TIMEOUT)
+    return forecast
+
+
+def apply_budget(forecast: dict[str, Any], budget: Optional[float] = None) -> dict[str, Any]:
+    """
+    Cap delivery at the budget and derive reach, frequency and effective CPM.
+
+    Reach saturates towards the distinct audience of the matched screens:
+    reach = pool * (1 - exp(-impressions / pool)).
+    """
+    impressions = forecast["impressions"]
+    cost = forecast["cost"]
+    if budget is not None and 0 < budget < cost:
+        impressions *= budget / cost
+        cost = budget
+
+    pool = forecast["audience_pool"]
+    reach = pool * (1 - math.exp(-impressions / pool)) if pool > 0 else 0
+    return {
+        "cpm": round(cost / impressions * 1000, 2) if impressions else 0,
+        "screens_count": forecast["screens_count"],
+        "impressions": int(impressions),
+        "reach": int(reach),
+        "frequency": round(impressions / reach, 2) if reach >= 1 else 0,
+        "estimated_cost": round(cost, 2),
+        "budget_utilization": round(min(cost / budget * 100, 100), 2) if budget else 0,
+    }
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import math
+from typing import Any, NamedTuple, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class BBox(NamedTuple):
+    south: float
+    west: float
+    north: float
+    east: float
+
+
+def parse_coordinates(coordinates: Any) -> Optional[tuple[float, float]]:
+    """
+    (latitude, longitude) of a {"lat": ..., "lng": ...} coordinates blob, or
+    None when it is missing, not numeric or out of range.
+    """
+    if not isinstance(coordinates, dict):
+        return None
+    try:
+        latitude, longitude = float(coordinates["lat"]), float(coordinates["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Parse a "west,south,east,north" query parameter, the order used by map
+    libraries. west may be greater than east for a box crossing the antimeridian.
+
+    Raises:
+        ValueError: if the value is not four numbers within range.
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be west,south,east,north") from None
+    if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("bbox is out of range")
+    return BBox(south, west, north, east)
+
+
+def radius_bbox(latitude: float, longitude: float, radius_km: float) -> BBox:
+    """
+    Smallest latitude/longitude box containing the circle, used to narrow a
+    radius search to an index range before the exact distance check.
+    """
+    delta_latitude = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - delta_latitude, -90.0), min(latitude + delta_latitude, 90.0)
+    if south == -90 or north == 90:
+        return BBox(south, -180.0, north, 180.0)
+    # Meridians converge towards the poles, so the box widens with latitude
+    delta_longitude = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))))
+    )
+    west, east = longitude - delta_longitude, longitude + delta_longitude
+    if west < -180 or east > 180:
+        # Wrap into range; west > east then marks a box crossing the antimeridian
+        west, east = (west + 180) % 360 - 180, (east + 180) % 360 - 180
+    return BBox(south, west, north, east)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional
+
+import numpy as np
+
+# 2**PRECISION registers of one byte each: 4 KiB per sketch, ~1.6% standard error
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+_VALUE_BITS = 64 - PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+
+
+def _hashes(values: Iterable[str]) -> np.ndarray:
+    digest = b"".join(hashlib.blake2b(str(value).encode(), digest_size=8).digest() for value in values)
+    return np.frombuffer(digest, dtype=">u8").astype(np.uint64)
+
+
+def empty() -> np.ndarray:
+    """
+    A sketch of the empty set.
+    """
+    return np.zeros(REGISTERS, dtype=np.uint8)
+
+
+def from_bytes(data: Optional[bytes]) -> np.ndarray:
+    """
+    Sketch stored in a BinaryField; None or b"" is the empty set.
+    """
+    if not data:
+        return empty()
+    return np.frombuffer(bytes(data), dtype=np.uint8).copy()
+
+
+def add(sketch: np.ndarray, values: Iterable[str]) -> np.ndarray:
+    """
+    Add values to sketch in place and return it.
+
+    The top PRECISION bits of each 64-bit hash pick the register; the register
+    keeps the highest position of the first set bit seen in the remaining bits.
+    """
+    hashes = _hashes(values)
+    if not len(hashes):
+        return sketch
+    index = (hashes >> np.uint64(_VALUE_BITS)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << _VALUE_BITS) - 1)
+    # The remainder has fewer than 53 bits, so it converts to float exactly and frexp's exponent is its bit length.
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    rank = (_VALUE_BITS - bit_length + 1).astype(np.uint8)
+    np.maximum.at(sketch, index, rank)
+    return sketch
+
+
+def merge(*sketches: np.ndarray) -> np.ndarray:
+    """
+    Sketch of the union of the given sets.
+    """
+    if not sketches:
+        return empty()
+    return np.maximum.reduce(sketches)
+
+
+def count(sketch: np.ndarray) -> int:
+    """
+    Estimated number of distinct values, with linear counting for small sets.
+    """
+    estimate = _ALPHA * REGISTERS * REGISTERS / np.sum(np.power(2.0, -sketch.astype(np.float64)))
+    zeros = int(np.count_nonzero(sketch == 0))
+    if estimate <= 2.5 * REGISTERS and zeros:
+        estimate = REGISTERS * np.log(REGISTERS / zeros)
+    return int(round(estimate))
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import secrets
+import threading
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main.models import AdsManager, CacheVersion, ScreenManager
+
+INVENTORY_VERSION_KEY = "inventory_version"
+CAMPAIGN_VERSION_KEY = "campaign_version"
+
+
+def _get_versions(*keys: str) -> tuple[int, ...]:
+    """
+    Current value of version counters, read together in one query.
+    """
+    versions = dict(CacheVersion.objects.filter(key__in=keys).values_list("key", "version"))
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Seed randomly, so a recreated counter never restarts at a value already used in keys.
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(key=key, version=secrets.randbits(48)) for key in missing], ignore_conflicts=True
+        )
+        versions.update(CacheVersion.objects.filter(key__in=missing).values_list("key", "version"))
+    return tuple(versions[key] for key in keys)
+
+
+def _get_version(key: str) -> int:
+    return _get_versions(key)[0]
+
+
+def _increment_version(key: str) -> None:
+    table = CacheVersion._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (key, version) VALUES (%s, %s) "
+            f"ON CONFLICT (key) DO UPDATE SET version = {table}.version + 1",
+            [key, secrets.randbits(48)],
+        )
+
+
+def get_inventory_version() -> int:
+    """
+    Current version of the screen inventory; part of every cache key derived from screens.
+    """
+    return _get_version(INVENTORY_VERSION_KEY)
+
+
+def bump_inventory_version() -> None:
+    """
+    Invalidate everything cached for the current screen inventory once the transaction commits.
+    """
+    transaction.on_commit(lambda: _increment_version(INVENTORY_VERSION_KEY))
+
+
+def get_campaign_version() -> int:
+    """
+    Current version of campaign targeting (region, district, venue types, interests).
+    """
+    return _get_version(CAMPAIGN_VERSION_KEY)
+
+
+def bump_campaign_version() -> None:
+    """
+    Invalidate everything built from campaign targeting once the transaction commits.
+    """
+    transaction.on_commit(lambda: _increment_version(CAMPAIGN_VERSION_KEY))
+
+
+def _screen_map_version_key(owner_id: int) -> str:
+    return f"screen_map_version:{owner_id}"
+
+
+def get_screen_map_version(owner_id: int) -> int:
+    """
+    Current version of an owner's screen map; part of every map tile key of that owner.
+    """
+    return _get_version(_screen_map_version_key(owner_id))
+
+
+def bump_screen_map_version(owner_id: Optional[int]) -> None:
+    """
+    Invalidate the owner's cached map tiles once the transaction commits.
+    """
+    if owner_id is not None:
+        transaction.on_commit(lambda: _increment_version(_screen_map_version_key(owner_id)))
+
+
+def _bitset(positions: Iterable[int]) -> int:
+    bits = 0
+    for position in positions:
+        bits |= 1 << position
+    return bits
+
+
+def _ids(bits: int, ids: list[int]) -> list[int]:
+    result = []
+    while bits:
+        lowest = bits & -bits
+        result.append(ids[lowest.bit_length() - 1])
+        bits ^= lowest
+    return result
+
+
+def _union(bitsets: dict[int, int], keys: Iterable[int]) -> int:
+    bits = 0
+    for key in keys:
+        bits |= bitsets.get(key, 0)
+    return bits
+
+
+class InventoryIndex:
+    """
+    In-memory inverted index between screens and campaign targeting.
+
+    Every screen and campaign gets a bit position, and each region, district,
+    venue type and interest maps to an int bitset of the screens (and of the
+    campaigns) carrying it, so matching is a few big-int AND/OR operations.
+
+    Matching rules, the same in both directions:
+    - region must be equal; campaigns without a region match no screen
+    - a campaign without a district covers the whole region
+    - venue types and interests must overlap, unless either side has none
+    """
+
+    def __init__(self, version: tuple[int, int]) -> None:
+        self.version = version
+        self.screen_ids: list[int] = []
+        self.screen_positions: dict[int, int] = {}
+        self.screen_targeting: list[tuple[Optional[int], Optional[int], set[int], set[int]]] = []
+        self.active_screens = 0
+        self.screens_by_region: dict[int, int] = {}
+        self.screens_by_district: dict[int, int] = {}
+        self.screens_by_venue_type: dict[int, int] = {}
+        self.screens_by_interest: dict[int, int] = {}
+        self.screens_any_venue_type = 0
+        self.screens_any_interest = 0
+
+        self.campaign_ids: list[int] = []
+        self.campaigns_by_region: dict[int, int] = {}
+        self.campaigns_by_district: dict[int, int] = {}
+        self.campaigns_by_venue_type: dict[int, int] = {}
+        self.campaigns_by_interest: dict[int, int] = {}
+        self.campaigns_any_district = 0
+        self.campaigns_any_venue_type = 0
+        self.campaigns_any_interest = 0
+
+    @classmethod
+    def build(cls, version: tuple[int, int]) -> "InventoryIndex":
+        """
+        Load screens, campaigns and their targeting links (six queries) into a new index.
+        """
+        index = cls(version)
+        index._build_screens()
+        index._build_campaigns()
+        return index
+
+    def _build_screens(self) -> None:
+        regions, districts = defaultdict(list), defaultdict(list)
+        active = []
+        for position, (screen_id, status, region_id, district_id) in enumerate(
+            ScreenManager.objects.order_by("id").values_list("id", "status", "region_id", "district_id")
+        ):
+            self.screen_ids.append(screen_id)
+            self.screen_positions[screen_id] = position
+            self.screen_targeting.append((region_id, district_id, set(), set()))
+            if status == ScreenManager.ACTIVE:
+                active.append(position)
+            if region_id:
+                regions[region_id].append(position)
+            if district_id:
+                districts[district_id].append(position)
+
+        venue_types, interests = defaultdict(list), defaultdict(list)
+        for screen_id, venue_type_id in ScreenManager.venue_types.through.objects.values_list(
+            "screenmanager_id", "venuetype_id"
+        ):
+            position = self.screen_positions[screen_id]
+            venue_types[venue_type_id].append(position)
+            self.screen_targeting[position][2].add(venue_type_id)
+        for screen_id, interest_id in ScreenManager.interests.through.objects.values_list(
+            "screenmanager_id", "interest_id"
+        ):
+            position = self.screen_positions[screen_id]
+            interests[interest_id].append(position)
+            self.screen_targeting[position][3].add(interest_id)
+
+        everything = (1 << len(self.screen_ids)) - 1
+        self.active_screens = _bitset(active)
+        self.screens_by_region = {key: _bitset(value) for key, value in regions.items()}
+        self.screens_by_district = {key: _bitset(value) for key, value in districts.items()}
+        self.screens_by_venue_type = {key: _bitset(value) for key, value in venue_types.items()}
+        self.screens_by_interest = {key: _bitset(value) for key, value in interests.items()}
+        self.screens_any_venue_type = everything & ~_union(self.screens_by_venue_type, venue_types)
+        self.screens_any_interest = everything & ~_union(self.screens_by_interest, interests)
+
+    def _build_campaigns(self) -> None:
+        positions: dict[int, int] = {}
+        regions, districts = defaultdict(list), defaultdict(list)
+        any_district = []
+        # Completed and ended campaigns can never play again, so the index stays
+        # the size of the current and upcoming inventory.
+        campaigns = (
+            AdsManager.objects.filter(region__isnull=False, end_date__gte=timezone.now())
+            .exclude(status=AdsManager.COMPLETED)
+            .order_by("id")
+        )
+        for position, (campaign_id, region_id, district_id) in enumerate(
+            campaigns.values_list("id", "region_id", "district_id")
+        ):
+            self.campaign_ids.append(campaign_id)
+            positions[campaign_id] = position
+            regions[region_id].append(position)
+            if district_id:
+                districts[district_id].append(position)
+            else:
+                any_district.append(position)
+
+        venue_types, interests = defaultdict(list), defaultdict(list)
+        indexed = campaigns.order_by().values("id")
+        for campaign_id, venue_type_id in AdsManager.venue_types.through.objects.filter(
+            adsmanager_id__in=indexed
+        ).values_list("adsmanager_id", "venuetype_id"):
+            venue_types[venue_type_id].append(positions[campaign_id])
+        for campaign_id, interest_id in AdsManager.interests.through.objects.filter(
+            adsmanager_id__in=indexed
+        ).values_list("adsmanager_id", "interest_id"):
+            interests[interest_id].append(positions[campaign_id])
+
+        everything = (1 << len(self.campaign_ids)) - 1
+        self.campaigns_by_region = {key: _bitset(value) for key, value in regions.items()}
+        self.campaigns_by_district = {key: _bitset(value) for key, value in districts.items()}
+        self.campaigns_by_venue_type = {key: _bitset(value) for key, value in venue_types.items()}
+        self.campaigns_by_interest = {key: _bitset(value) for key, value in interests.items()}
+        self.campaigns_any_district = _bitset(any_district)
+        self.campaigns_any_venue_type = everything & ~_union(self.campaigns_by_venue_type, venue_types)
+        self.campaigns_any_interest = everything & ~_union(self.campaigns_by_interest, interests)
+
+    def screens_matching(
+        self,
+        region_id: Optional[int],
+        district_id: Optional[int] = None,
+        venue_type_ids: Iterable[int] = (),
+        interest_ids: Iterable[int] = (),
+        active_only: bool = True,
+    ) -> list[int]:
+        """
+        Ids of the screens a campaign with this targeting can play on.
+        """
+        if not region_id:
+            return []
+        bits = self.screens_by_region.get(region_id, 0)
+        if active_only:
+            bits &= self.active_screens
+        if district_id:
+            bits &= self.screens_by_district.get(district_id, 0)
+        venue_type_ids = list(venue_type_ids)
+        if venue_type_ids:
+            bits &= _union(self.screens_by_venue_type, venue_type_ids) | self.screens_any_venue_type
+        interest_ids = list(interest_ids)
+        if interest_ids:
+            bits &= _union(self.screens_by_interest, interest_ids) | self.screens_any_interest
+        return _ids(bits, self.screen_ids)
+
+    def campaigns_for_screen(self, screen_id: int) -> list[int]:
+        """
+        Ids of the campaigns whose targeting covers a screen, among those not completed or ended.
+        """
+        position = self.screen_positions.get(screen_id)
+        if position is None:
+            return []
+        region_id, district_id, venue_type_ids, interest_ids = self.screen_targeting[position]
+        if not region_id:
+            return []
+        bits = self.campaigns_by_region.get(region_id, 0)
+        bits &= self.campaigns_any_district | self.campaigns_by_district.get(district_id, 0)
+        if venue_type_ids:
+            bits &= _union(self.campaigns_by_venue_type, venue_type_ids) | self.campaigns_any_venue_type
+        if interest_ids:
+            bits &= _union(self.campaigns_by_interest, interest_ids) | self.campaigns_any_interest
+        return _ids(bits, self.campaign_ids)
+
+
+_index: Optional[InventoryIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_inventory_index() -> InventoryIndex:
+    """
+    The process-wide index, rebuilt when the screen or campaign version has moved.
+    Both versions are read from the database, so every worker notices a bump.
+    """
+    global _index
+    version = _get_versions(INVENTORY_VERSION_KEY, CAMPAIGN_VERSION_KEY)
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = InventoryIndex.build(version)
+            index = _index
+    return index
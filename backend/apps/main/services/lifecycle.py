@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import AdsManager
+from main.services.campaign_stats import invalidate_campaign_stats
+from main.services.inventory import bump_campaign_version
+
+logger = logging.getLogger(__name__)
+
+
+def run_campaign_lifecycle(at: datetime | None = None) -> dict[str, int]:
+    """
+    Apply time-based campaign transitions with set-based updates:
+
+    - active campaigns past their end_date become completed
+    - is_active is switched on for active campaigns whose start_date has come
+      and off for every row that left its window or status
+
+    Drafts and paused campaigns are never started automatically.
+    """
+    at = at or timezone.now()
+    with transaction.atomic():
+        expired = AdsManager.objects.filter(status=AdsManager.ACTIVE, end_date__lt=at)
+        owners = set(expired.values_list("created_by_id", flat=True).distinct())
+        completed = expired.update(status=AdsManager.COMPLETED, is_active=False, updated_at=at)
+        refreshed = AdsManager.objects.refresh_is_active(at)
+        for user_id in owners:
+            invalidate_campaign_stats(user_id)
+        if completed:
+            # Completed campaigns leave the inventory index
+            bump_campaign_version()
+
+    if completed or refreshed:
+        logger.info(f"Campaign lifecycle: {completed} completed, {refreshed} is_active flags updated")
+    return {"completed": completed, "refreshed": refreshed}
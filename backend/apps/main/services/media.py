@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import subprocess
+from datetime import timedelta
+from typing import Any, Optional
+
+from django.db.models.fields.files import FieldFile
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+FFPROBE_TIMEOUT = 30
+
+
+def compute_content_hash(field_file: FieldFile) -> str:
+    """
+    SHA-256 of a stored or freshly uploaded file, read in chunks to keep memory bounded.
+    """
+    digest = hashlib.sha256()
+    for chunk in field_file.chunks(chunk_size=HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_video(field_file: FieldFile) -> dict[str, Any]:
+    """
+    Read duration and frame size of a stored video with ffprobe.
+
+    Returns an empty dict when ffprobe is not installed or the storage has no
+    local path, so callers can still record hash and size.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return {}
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        return {}
+
+    result = subprocess.run(
+        [
+            ffprobe,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height:format=duration",
+            "-of", "json",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=FFPROBE_TIMEOUT,
+        check=True,
+    )
+    data = json.loads(result.stdout or "{}")
+    stream = (data.get("streams") or [{}])[0]
+    duration: Optional[str] = (data.get("format") or {}).get("duration")
+
+    metadata: dict[str, Any] = {}
+    if duration:
+        metadata["duration"] = timedelta(seconds=float(duration))
+    if stream.get("width") and stream.get("height"):
+        metadata["width"] = int(stream["width"])
+        metadata["height"] = int(stream["height"])
+    return metadata
+
+
+def probe_image(field_file: FieldFile) -> dict[str, Any]:
+    """
+    Read the pixel size of a stored image without decoding it.
+    """
+    with field_file.open("rb") as fh, Image.open(fh) as image:
+        width, height = image.size
+    return {"width": width, "height": height}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from main.models import AdsManagerImage, AdsManagerVideo, MediaModel
+from main.services.media import compute_content_hash, probe_image, probe_video
+from main.services.tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+def stuck_processing() -> Q:
+    """
+    Rows left in processing by a worker that died: claimed longer than
+    MEDIA_INGEST_TIMEOUT ago, or before claims were timestamped.
+    """
+    return Q(processing_status=MediaModel.PROCESSING) & (
+        Q(processing_started_at__lt=timezone.now() - settings.MEDIA_INGEST_TIMEOUT)
+        | Q(processing_started_at__isnull=True)
+    )
+
+
+def _claim(model: type[MediaModel], pk: int) -> bool:
+    """
+    Move a pending, failed or stuck row to processing; False if another worker owns it.
+    """
+    return bool(
+        model.objects.filter(Q(processing_status__in=[MediaModel.PENDING, MediaModel.FAILED]) | stuck_processing())
+        .filter(pk=pk)
+        .update(processing_status=MediaModel.PROCESSING, processing_started_at=timezone.now())
+    )
+
+
+def _finish(model: type[MediaModel], pk: int, **fields) -> None:
+    """
+    Store the probed metadata unless the file was replaced while we were working on it.
+    """
+    model.objects.filter(pk=pk, processing_status=MediaModel.PROCESSING).update(**fields)
+
+
+def ingest_video(video_id: int) -> None:
+    """
+    Hash a video and probe its size, duration and frame size.
+    """
+    if not _claim(AdsManagerVideo, video_id):
+        return
+    try:
+        video = AdsManagerVideo.objects.only("id", "video").get(pk=video_id)
+        fields = {
+            "content_hash": compute_content_hash(video.video),
+            "file_size": video.video.size,
+        }
+        try:
+            fields.update(probe_video(video.video))
+        except Exception as e:
+            logger.warning(f"Could not probe video {video_id}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error ingesting video {video_id}: {str(e)}")
+        _finish(AdsManagerVideo, video_id, processing_status=MediaModel.FAILED)
+        return
+
+    _finish(AdsManagerVideo, video_id, processing_status=MediaModel.READY, **fields)
+    logger.info(f"Ingested video {video_id}")
+
+
+def ingest_image(image_id: int) -> None:
+    """
+    Probe an image's size and pixel dimensions.
+    """
+    if not _claim(AdsManagerImage, image_id):
+        return
+    try:
+        image = AdsManagerImage.objects.only("id", "image").get(pk=image_id)
+        fields = {"file_size": image.image.size, **probe_image(image.image)}
+    except Exception as e:
+        logger.error(f"Error ingesting image {image_id}: {str(e)}")
+        _finish(AdsManagerImage, image_id, processing_status=MediaModel.FAILED)
+        return
+
+    _finish(AdsManagerImage, image_id, processing_status=MediaModel.READY, **fields)
+    logger.info(f"Ingested image {image_id}")
+
+
+def enqueue_ingestion(instance: MediaModel) -> None:
+    """
+    Queue a media row for ingestion on the background worker pool.
+    """
+    if isinstance(instance, AdsManagerVideo):
+        run_in_background(ingest_video, instance.pk, key=("ingest_video", instance.pk))
+    elif isinstance(instance, AdsManagerImage):
+        run_in_background(ingest_image, instance.pk, key=("ingest_image", instance.pk))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.db.models import QuerySet
+
+from main.models import AdsManager, AdsManagerVideo, ScreenManager
+from main.services.inventory import get_inventory_index
+
+
+def get_playlist_videos(screen: ScreenManager, at: datetime | None = None) -> QuerySet[AdsManagerVideo]:
+    """
+    Resolve the videos a screen should play right now.
+
+    Only campaigns whose targeting covers the screen (see InventoryIndex) and
+    that are active, inside their start/end window and scheduled for the
+    current weekly slot are included.
+    """
+    campaign_ids = get_inventory_index().campaigns_for_screen(screen.id)
+    if not campaign_ids:
+        return AdsManagerVideo.objects.none()
+
+    # Targeting is resolved in memory, the indexed is_active flag narrows the
+    # candidates and the schedule check is a single get_bit() on the compiled
+    # bitmap.
+    eligible = AdsManager.objects.live(at).scheduled_at(at).filter(id__in=campaign_ids).values("id")
+
+    return AdsManagerVideo.objects.filter(ads_manager_id__in=eligible).select_related("ads_manager")
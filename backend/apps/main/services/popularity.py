@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from apps.main.services.schedule import HOURS_PER_DAY, SLOTS_PER_WEEK, slot_index
+
+DAY_NAMES = ("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+
+
+def popularity_vector(popular_times: Any) -> Optional[np.ndarray]:
+    """
+    Convert Outscraper popular_times into a 168-slot vector of busyness percentages.
+
+    Days are matched by day_text ("Monday", ...) with a fallback to the numeric
+    day (1 = Monday .. 7 = Sunday); "live" entries are ignored. Returns None when
+    the data holds no usable hour.
+    """
+    if not isinstance(popular_times, list):
+        return None
+
+    vector = np.zeros(SLOTS_PER_WEEK, dtype=np.uint8)
+    found = False
+    for day_entry in popular_times:
+        if not isinstance(day_entry, dict):
+            continue
+        day_text = str(day_entry.get("day_text") or "").lower()
+        if day_text in DAY_NAMES:
+            day = DAY_NAMES.index(day_text)
+        elif isinstance(day_entry.get("day"), int) and 1 <= day_entry["day"] <= 7:
+            day = day_entry["day"] % 7
+        else:
+            continue
+        for hour_entry in day_entry.get("popular_times") or []:
+            try:
+                hour = int(hour_entry["hour"])
+                percentage = int(hour_entry.get("percentage") or 0)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= hour < HOURS_PER_DAY:
+                vector[slot_index(day, hour)] = min(max(percentage, 0), 100)
+                found = True
+    return vector if found else None
+
+
+def compile_popularity_profile(popular_times: Any) -> Optional[bytes]:
+    """
+    Pack popular_times into the 168-byte profile stored on ScreenManager.popularity_profile.
+    """
+    vector = popularity_vector(popular_times)
+    return vector.tobytes() if vector is not None else None
+
+
+def popularity_matrix(profiles: Iterable[Optional[bytes | memoryview]], default: np.ndarray) -> np.ndarray:
+    """
+    Unpack stored profiles into an (N, 168) matrix of 0..1 busyness values;
+    screens without a profile get the default row.
+    """
+    default_row = np.round(default * 100).astype(np.uint8).tobytes()
+    packed = [bytes(value) if value is not None else default_row for value in profiles]
+    if not packed:
+        return np.zeros((0, SLOTS_PER_WEEK))
+    raw = np.frombuffer(b"".join(packed), dtype=np.uint8).reshape(len(packed), SLOTS_PER_WEEK)
+    return raw / 100
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from main.models import AdsManager, QRScanEvent, QRScanHourly
+from main.services.tasks import run_in_background
+from main.services.user_agent import UA_OTHER
+
+logger = logging.getLogger(__name__)
+
+
+class Scan(NamedTuple):
+    ads_manager_id: int
+    screen_id: Optional[int]
+    timestamp: datetime
+    ua_class: str
+
+
+_lock = threading.Lock()
+# Scans received by this process and not yet written to the database
+_pending: list[Scan] = []
+# Daemon thread flushing the buffer every QR_CLICK_FLUSH_INTERVAL seconds
+_flusher: Optional[threading.Thread] = None
+
+
+def _link_cache_key(ads_manager_id: int) -> str:
+    return f"qr_link:{ads_manager_id}"
+
+
+def get_qr_link(ads_manager_id: int) -> Optional[str]:
+    """
+    Destination link of an ad for the QR redirect, cached per ad id.
+
+    Returns "" for an ad without a link and None for an ad that does not exist;
+    only existing ads are cached. Link changes reach every worker through the
+    shared cache (REDIS_URL); with a per-process cache the entries only live for
+    a short QR_LINK_CACHE_TIMEOUT.
+    """
+    key = _link_cache_key(ads_manager_id)
+    link = cache.get(key)
+    if link is None:
+        rows = list(AdsManager.objects.filter(pk=ads_manager_id).values_list("link", flat=True))
+        if not rows:
+            return None
+        link = rows[0] or ""
+        cache.set(key, link, settings.QR_LINK_CACHE_TIMEOUT)
+    return link
+
+
+def invalidate_qr_link(ads_manager_id: int) -> None:
+    """
+    Drop the cached link of an ad once the current transaction commits.
+    """
+    transaction.on_commit(lambda: cache.delete(_link_cache_key(ads_manager_id)))
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(settings.QR_CLICK_FLUSH_INTERVAL)
+        if _pending:
+            try:
+                run_in_background(flush_qr_clicks, key="flush_qr_clicks")
+            except Exception:
+                logger.exception("Could not queue the periodic QR scan flush")
+
+
+def _start_flusher() -> None:
+    """
+    Start the periodic flush thread of this process, once per worker: threads do
+    not survive the fork of a gunicorn worker, so it is started on the first scan.
+    """
+    global _flusher
+    if settings.QR_CLICK_FLUSH_INTERVAL <= 0 or (_flusher is not None and _flusher.is_alive()):
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_periodically, name="qr-click-flusher", daemon=True)
+            _flusher.start()
+
+
+def record_qr_click(ads_manager_id: int, screen_id: Optional[int] = None, ua_class: str = UA_OTHER) -> None:
+    """
+    Buffer one scan in memory; the hot path never touches the database.
+
+    A background thread flushes the buffer every QR_CLICK_FLUSH_INTERVAL
+    seconds whether or not more scans arrive, so at most that many seconds of
+    scans are lost if the worker is killed. A buffer reaching QR_SCAN_BUFFER_SIZE
+    is flushed right away.
+    """
+    _start_flusher()
+    with _lock:
+        _pending.append(Scan(ads_manager_id, screen_id, timezone.now(), ua_class))
+        due = len(_pending) >= settings.QR_SCAN_BUFFER_SIZE
+    if due:
+        run_in_background(flush_qr_clicks, key="flush_qr_clicks")
+
+
+def _increment_hourly(scans: list[Scan]) -> None:
+    """
+    Add the scans to their (ad, screen, hour) rollup rows with one upsert.
+    """
+    hours = Counter(
+        (scan.ads_manager_id, scan.screen_id, scan.timestamp.replace(minute=0, second=0, microsecond=0))
+        for scan in scans
+    )
+    params = []
+    for (ads_manager_id, screen_id, hour), count in hours.items():
+        params += [ads_manager_id, screen_id, hour, count]
+    table = QRScanHourly._meta.db_table
+    rows = ", ".join(["(%s, %s, %s, %s)"] * len(hours))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (ads_manager_id, screen_id, hour, scans) VALUES {rows} "
+            f"ON CONFLICT (ads_manager_id, screen_id, hour) DO UPDATE SET scans = {table}.scans + EXCLUDED.scans",
+            params,
+        )
+
+
+def flush_qr_clicks() -> int:
+    """
+    Write the buffered scans in one transaction: the raw QRScanEvent rows, the
+    QRScanHourly rollup and involve_count, each with a single statement.
+
+    Scans are put back into the buffer if the write fails, so nothing is lost
+    short of the process dying. Returns the number of ads updated.
+    """
+    global _pending
+    with _lock:
+        scans, _pending = _pending, []
+    if not scans:
+        return 0
+
+    counts = Counter(scan.ads_manager_id for scan in scans)
+    increment = Case(
+        *[When(pk=ads_manager_id, then=Value(count)) for ads_manager_id, count in counts.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    try:
+        with transaction.atomic():
+            QRScanEvent.objects.bulk_create([QRScanEvent(**scan._asdict()) for scan in scans], batch_size=1000)
+            _increment_hourly(scans)
+            updated = AdsManager.objects.filter(pk__in=counts).update(involve_count=F("involve_count") + increment)
+    except Exception:
+        with _lock:
+            _pending[:0] = scans
+        raise
+    logger.info(f"Flushed {len(scans)} QR scans for {updated} ads")
+    return updated
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    try:
+        flush_qr_clicks()
+    except Exception:
+        logger.exception("Could not flush buffered QR scans on exit")
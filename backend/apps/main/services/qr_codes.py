@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from main.models import AdsManager, MediaModel
+from main.services.qr_renderer import QR_STYLE, encode_qr
+from main.services.tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+def qr_url(ads_manager_id: int, screen_id: int | None = None) -> str:
+    """
+    Redirect URL encoded in an ad's QR code; it counts the scan and forwards to the link.
+    With a screen_id, scans of the code are attributed to that screen.
+    """
+    if screen_id is not None:
+        return f"{settings.BACKEND_URL}/api/v1/main/qr/{ads_manager_id}/{screen_id}/"
+    return f"{settings.BACKEND_URL}/api/v1/main/qr/{ads_manager_id}/"
+
+
+def link_hash(link: str | None) -> str:
+    """
+    SHA-1 of a link, identifying the QR job queued for it.
+    """
+    return hashlib.sha1((link or "").encode()).hexdigest()
+
+
+def qr_image_digest(
+    ads_manager_id: int, size: str = "large", fmt: str = "png", screen_id: int | None = None
+) -> str:
+    """
+    Content address of a QR image: a hash of everything the rendered bytes depend on.
+    """
+    return hashlib.sha1(f"{qr_url(ads_manager_id, screen_id)}|{QR_STYLE}|{size}|{fmt}".encode()).hexdigest()
+
+
+def qr_image_path(digest: str, fmt: str) -> str:
+    """
+    Storage path of a cached QR image, fanned out by the first digest byte.
+    """
+    return f"qr_codes/cache/{digest[:2]}/{digest}.{fmt}"
+
+
+def get_qr_image(ads_manager_id: int, size: str = "large", fmt: str = "png", screen_id: int | None = None) -> str:
+    """
+    Storage path of the ad's QR image in the given size and format, rendered
+    only when no image with the same content address has been stored yet.
+    """
+    path = qr_image_path(qr_image_digest(ads_manager_id, size, fmt, screen_id), fmt)
+    if not default_storage.exists(path):
+        path = default_storage.save(path, ContentFile(encode_qr(qr_url(ads_manager_id, screen_id), size, fmt)))
+    return path
+
+
+def request_qr_code(ads_manager: AdsManager, force: bool = False) -> bool:
+    """
+    Mark the ad's QR code as pending and queue its rendering on the background worker pool.
+
+    Returns False when there is nothing to do: the ad has no link, or it
+    already points at the current cached image (unless force is set). The QR
+    content depends only on the ad id, so a changed link alone queues nothing.
+    The job is keyed on the ad and the link hash, so repeated saves coalesce.
+    """
+    if not ads_manager.link:
+        return False
+    if (
+        not force
+        and ads_manager.qr_status == MediaModel.READY
+        and ads_manager.qr_code.name == qr_image_path(qr_image_digest(ads_manager.pk), "png")
+    ):
+        return False
+
+    digest = link_hash(ads_manager.link)
+
+    AdsManager.objects.filter(pk=ads_manager.pk).update(qr_status=MediaModel.PENDING, qr_link_hash=digest)
+    ads_manager.qr_status = MediaModel.PENDING
+    ads_manager.qr_link_hash = digest
+    run_in_background(generate_qr_code, ads_manager.pk, digest, key=("generate_qr_code", ads_manager.pk, digest))
+    return True
+
+
+def generate_qr_code(ads_manager_id: int, digest: str) -> None:
+    """
+    Point the ad's qr_code at its cached large PNG, rendering it if needed.
+
+    The row is claimed with a conditional UPDATE on (status, link hash), so a
+    job for a link that has since changed, or one another worker already took,
+    does nothing. The result is written with an UPDATE as well: no model
+    signals run for what is a pure cache of the ad's id.
+    """
+    claimed = AdsManager.objects.filter(
+        pk=ads_manager_id, qr_link_hash=digest, qr_status__in=[MediaModel.PENDING, MediaModel.FAILED]
+    ).update(qr_status=MediaModel.PROCESSING)
+    if not claimed:
+        return
+
+    current = AdsManager.objects.filter(pk=ads_manager_id, qr_link_hash=digest, qr_status=MediaModel.PROCESSING)
+    try:
+        path = get_qr_image(ads_manager_id)
+    except Exception as e:
+        logger.error(f"Error generating QR code for AdsManager {ads_manager_id}: {str(e)}")
+        current.update(qr_status=MediaModel.FAILED)
+        return
+
+    current.update(qr_code=path, qr_status=MediaModel.READY)
+    logger.info(f"Stylized QR code generated for AdsManager {ads_manager_id}")
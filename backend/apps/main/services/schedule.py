@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.conf import settings
+
+# The frontend sends schedules as {"<day>": [hours]}; older data and fixtures
+# use {"<day>-<hour>": true}. Day is 0 (Sunday) .. 6 (Saturday), hour 0..23.
+DAYS_PER_WEEK = 7
+HOURS_PER_DAY = 24
+SLOTS_PER_WEEK = DAYS_PER_WEEK * HOURS_PER_DAY
+BITMAP_BYTES = SLOTS_PER_WEEK // 8
+ALWAYS_ON = (1 << SLOTS_PER_WEEK) - 1
+
+
+def slot_index(day: int, hour: int) -> int:
+    """
+    Position of a day-hour slot inside the weekly bitmap.
+    """
+    return day * HOURS_PER_DAY + hour
+
+
+def slot_for_datetime(value: datetime) -> int:
+    """
+    Weekly UTC slot for a datetime (Python weekday() starts on Monday, the schedule on Sunday).
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    return slot_index((value.weekday() + 1) % DAYS_PER_WEEK, value.hour)
+
+
+def _schedule_slots(key: Any, value: Any) -> Iterable[tuple[int, int]]:
+    """
+    Day-hour pairs enabled by one schedule entry, in either the {day: [hours]}
+    or the {"day-hour": true} shape.
+    """
+    if isinstance(value, (list, tuple)):
+        try:
+            day = int(key)
+        except ValueError:
+            return
+        for hour in value:
+            try:
+                yield day, int(hour)
+            except (TypeError, ValueError):
+                continue
+    elif value:
+        try:
+            day, hour = (int(part) for part in str(key).split("-"))
+        except ValueError:
+            return
+        yield day, hour
+
+
+def compile_schedule(schedule: Optional[dict[str, Any]]) -> int:
+    """
+    Compile the schedule JSON into a 168-bit weekly bitmap in local time.
+
+    A schedule without any enabled slot places no restriction on the campaign,
+    so it compiles to ALWAYS_ON.
+    """
+    bitmap = 0
+    for key, value in (schedule or {}).items():
+        for day, hour in _schedule_slots(key, value):
+            if 0 <= day < DAYS_PER_WEEK and 0 <= hour < HOURS_PER_DAY:
+                bitmap |= 1 << slot_index(day, hour)
+    return bitmap or ALWAYS_ON
+
+
+def to_utc_bitmap(bitmap: int, tz_name: str | None = None, reference: datetime | None = None) -> int:
+    """
+    Rotate a local-time bitmap into UTC slots.
+
+    The UTC offset is taken at the reference datetime (usually the campaign
+    start), so zones with DST use the offset in effect when the campaign starts.
+    Offsets that are not whole hours are truncated to the hour.
+    """
+    zone = ZoneInfo(tz_name or settings.SCHEDULE_TIME_ZONE)
+    reference = reference or datetime.now(dt_timezone.utc)
+    offset_hours = int(reference.astimezone(zone).utcoffset().total_seconds() // 3600)
+    shift = offset_hours % SLOTS_PER_WEEK
+    if not shift:
+        return bitmap
+    # A local slot L corresponds to the UTC slot L - offset.
+    return ((bitmap >> shift) | (bitmap << (SLOTS_PER_WEEK - shift))) & ALWAYS_ON
+
+
+def to_bytes(bitmap: int) -> bytes:
+    """
+    Pack a bitmap little-endian, so slot N is bit N % 8 of byte N // 8.
+    This matches PostgreSQL get_bit() on bytea columns.
+    """
+    return bitmap.to_bytes(BITMAP_BYTES, "little")
+
+
+def from_bytes(value: Optional[bytes | memoryview]) -> int:
+    """
+    Unpack a stored bitmap; a missing bitmap means no restriction.
+    """
+    if value is None:
+        return ALWAYS_ON
+    return int.from_bytes(bytes(value), "little")
+
+
+def compile_schedule_bitmap(
+    schedule: Optional[dict[str, Any]], tz_name: str | None = None, reference: datetime | None = None
+) -> bytes:
+    """
+    Compile the schedule JSON into the packed UTC bitmap stored on AdsManager.schedule_bitmap.
+    """
+    return to_bytes(to_utc_bitmap(compile_schedule(schedule), tz_name, reference))
+
+
+def is_scheduled(bitmap: int, slot: int) -> bool:
+    """
+    Check whether a slot is enabled in a compiled weekly bitmap.
+    """
+    return bool((bitmap >> slot) & 1)
+
+
+def bitmap_matrix(bitmaps: Iterable[Optional[bytes | memoryview]]) -> np.ndarray:
+    """
+    Unpack many stored bitmaps into an (N, 168) boolean matrix.
+    """
+    packed = [bytes(value) if value is not None else to_bytes(ALWAYS_ON) for value in bitmaps]
+    if not packed:
+        return np.zeros((0, SLOTS_PER_WEEK), dtype=bool)
+    raw = np.frombuffer(b"".join(packed), dtype=np.uint8).reshape(len(packed), BITMAP_BYTES)
+    return np.unpackbits(raw, axis=1, bitorder="little").astype(bool)
+
+
+def on_air_mask(matrix: np.ndarray, slot: int) -> np.ndarray:
+    """
+    Boolean mask of the rows scheduled for a given slot.
+    """
+    return matrix[:, slot]
+
+
+def overlap_slots(matrix: np.ndarray, availability: np.ndarray) -> np.ndarray:
+    """
+    Number of weekly slots each row shares with an availability vector
+    (e.g. a screen's operating hours), as an (N,) integer array.
+    """
+    return np.count_nonzero(matrix & availability.astype(bool), axis=1)
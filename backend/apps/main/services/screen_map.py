@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cos, Floor, Greatest, Least, Ln, Radians, Tan
+
+from main.models import ScreenManager
+from main.services.geo import BBox
+from main.services.inventory import get_screen_map_version
+
+# Web Mercator tiles as used by map libraries; each tile is split into
+# TILE_CELLS x TILE_CELLS cluster cells (32 px cells on 256 px tiles).
+TILE_CELLS = 8
+MAX_LATITUDE = 85.0511287798
+MAX_ZOOM = 20
+# Above this zoom screens are returned one by one instead of clustered
+CLUSTER_MAX_ZOOM = 14
+# Upper bound on the tiles one request may cover, about a full-screen viewport
+MAX_MAP_TILES = 64
+
+
+def _tile_x(longitude: float, zoom: int) -> int:
+    tiles = 1 << zoom
+    return min(tiles - 1, max(0, int((longitude + 180) / 360 * tiles)))
+
+
+def _tile_y(latitude: float, zoom: int) -> int:
+    tiles = 1 << zoom
+    latitude = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude)))
+    y = (1 - math.asinh(math.tan(latitude)) / math.pi) / 2
+    return min(tiles - 1, max(0, int(y * tiles)))
+
+
+def tile_bbox(zoom: int, x: int, y: int) -> BBox:
+    """
+    Latitude/longitude box of a tile.
+    """
+    tiles = 1 << zoom
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    return BBox(latitude(y + 1), x / tiles * 360 - 180, latitude(y), (x + 1) / tiles * 360 - 180)
+
+
+def tiles_for_bbox(bbox: BBox, zoom: int) -> list[tuple[int, int]]:
+    """
+    (x, y) of the tiles covering bbox at zoom, wrapping across the antimeridian.
+
+    Raises:
+        ValueError: if more than MAX_MAP_TILES tiles are needed.
+    """
+    west, east = _tile_x(bbox.west, zoom), _tile_x(bbox.east, zoom)
+    if bbox.west <= bbox.east:
+        columns = list(range(west, east + 1))
+    else:
+        columns = list(range(west, 1 << zoom)) + list(range(0, east + 1))
+    rows = range(_tile_y(bbox.north, zoom), _tile_y(bbox.south, zoom) + 1)
+    if len(columns) * len(rows) > MAX_MAP_TILES:
+        raise ValueError(f"bbox covers more than {MAX_MAP_TILES} tiles at zoom {zoom}, zoom in")
+    return [(x, y) for x in columns for y in rows]
+
+
+def _tile_key(version: int, owner_id: int, zoom: int, x: int, y: int) -> str:
+    return f"screen_map:{version}:{owner_id}:{zoom}:{x}:{y}"
+
+
+def _cells(zoom: int) -> tuple[Any, Any]:
+    """
+    SQL expressions for the global cell column and row of a screen at zoom.
+    """
+    cells = (1 << zoom) * TILE_CELLS
+    latitude = Radians(Greatest(Least(F("latitude"), Value(MAX_LATITUDE)), Value(-MAX_LATITUDE)))
+    mercator = Ln(Tan(latitude) + Value(1.0) / Cos(latitude))
+    column = Floor((F("longitude") + Value(180.0)) / Value(360.0) * Value(float(cells)), output_field=FloatField())
+    row = Floor((Value(1.0) - mercator / Value(math.pi)) / Value(2.0) * Value(float(cells)), output_field=FloatField())
+    return column, row
+
+
+def _build_tiles(screens, zoom: int, tiles: list[tuple[int, int]]) -> dict[tuple[int, int], list[dict[str, Any]]]:
+    """
+    Features of the given tiles with one query: grid clusters grouped in SQL up
+    to CLUSTER_MAX_ZOOM, single screens above it.
+    """
+    south = tile_bbox(zoom, 0, max(y for _, y in tiles)).south
+    north = tile_bbox(zoom, 0, min(y for _, y in tiles)).north
+    screens = screens.located().filter(latitude__gte=south, latitude__lte=north)
+    columns = {x for x, _ in tiles}
+    if max(columns) - min(columns) + 1 == len(columns):
+        screens = screens.filter(
+            longitude__gte=tile_bbox(zoom, min(columns), 0).west, longitude__lte=tile_bbox(zoom, max(columns), 0).east
+        )
+
+    features: dict[tuple[int, int], list[dict[str, Any]]] = {tile: [] for tile in tiles}
+    if zoom > CLUSTER_MAX_ZOOM:
+        for screen in screens.values("id", "title", "latitude", "longitude", "status").order_by("id"):
+            tile = (_tile_x(screen["longitude"], zoom), _tile_y(screen["latitude"], zoom))
+            if tile in features:
+                features[tile].append(
+                    {
+                        "type": "screen",
+                        "id": screen["id"],
+                        "title": screen["title"],
+                        "lat": screen["latitude"],
+                        "lng": screen["longitude"],
+                        "status": screen["status"],
+                    }
+                )
+        return features
+
+    column, row = _cells(zoom)
+    clusters: dict[tuple[int, int], dict[str, Any]] = defaultdict(
+        lambda: {"count": 0, "latitude": 0.0, "longitude": 0.0, "statuses": {}}
+    )
+    for cell in (
+        screens.annotate(cell_x=column, cell_y=row)
+        .values("cell_x", "cell_y", "status")
+        .annotate(count=Count("id"), latitude=Sum("latitude"), longitude=Sum("longitude"))
+        .order_by()
+    ):
+        cluster = clusters[int(cell["cell_x"]), int(cell["cell_y"])]
+        cluster["count"] += cell["count"]
+        cluster["latitude"] += cell["latitude"]
+        cluster["longitude"] += cell["longitude"]
+        cluster["statuses"][cell["status"]] = cell["count"]
+
+    last = (1 << zoom) - 1
+    for (cell_x, cell_y), cluster in sorted(clusters.items()):
+        tile = (min(cell_x // TILE_CELLS, last), min(cell_y // TILE_CELLS, last))
+        if tile in features:
+            features[tile].append(
+                {
+                    "type": "cluster",
+                    "count": cluster["count"],
+                    "lat": round(cluster["latitude"] / cluster["count"], 6),
+                    "lng": round(cluster["longitude"] / cluster["count"], 6),
+                    "statuses": cluster["statuses"],
+                }
+            )
+    return features
+
+
+def get_screen_map(owner_id: int, bbox: BBox, zoom: int) -> dict[str, Any]:
+    """
+    Map features of an owner's screens inside bbox, assembled from cached tiles.
+
+    Tiles are keyed by owner, zoom and the owner's map version, which is kept in
+    the database and bumped by writes to that owner's screens, so a change makes
+    the owner's tiles unreachable in every process; the tiles missing from the
+    cache are built together with one query. The payload covers whole tiles, so it may reach slightly
+    past bbox.
+
+    Raises:
+        ValueError: if the zoom is out of range or bbox covers too many tiles.
+    """
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {MAX_ZOOM}")
+    tiles = tiles_for_bbox(bbox, zoom)
+    version = get_screen_map_version(owner_id)
+    keys = {tile: _tile_key(version, owner_id, zoom, *tile) for tile in tiles}
+    cached = cache.get_many(keys.values())
+    missing = [tile for tile in tiles if keys[tile] not in cached]
+    if missing:
+        built = _build_tiles(ScreenManager.objects.filter(created_by_id=owner_id), zoom, missing)
+        cache.set_many({keys[tile]: built[tile] for tile in missing}, settings.SCREEN_MAP_CACHE_TIMEOUT)
+        cached.update({keys[tile]: built[tile] for tile in missing})
+
+    features = [feature for tile in tiles for feature in cached[keys[tile]]]
+    return {
+        "zoom": zoom,
+        "clustered": zoom <= CLUSTER_MAX_ZOOM,
+        "features": features,
+        "total_screens": sum(feature.get("count", 1) for feature in features),
+    }
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+# key -> whether the job has to run once more after the in-flight run finishes
+_inflight: dict[Hashable, bool] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix="main-tasks",
+            )
+    return _executor
+
+
+def _run(func: Callable[..., Any], args: tuple[Any, ...], key: Optional[Hashable]) -> None:
+    """
+    Run a job in a worker thread with its own database connection.
+    """
+    while True:
+        close_old_connections()
+        try:
+            func(*args)
+        except Exception:
+            logger.exception(f"Background task {getattr(func, '__name__', func)} failed for {args}")
+        finally:
+            connection.close()
+
+        if key is None:
+            return
+        with _lock:
+            if not _inflight.get(key):
+                _inflight.pop(key, None)
+                return
+            _inflight[key] = False
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, key: Optional[Hashable] = None) -> None:
+    """
+    Queue a job on the shared worker pool once the current transaction commits.
+
+    Jobs submitted with the same key while one is already running are coalesced
+    into a single re-run, so callers can submit idempotent jobs freely.
+    """
+    def submit() -> None:
+        if key is not None:
+            with _lock:
+                if key in _inflight:
+                    _inflight[key] = True
+                    return
+                _inflight[key] = False
+        _get_executor().submit(_run, func, args, key)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+
+UA_IOS = "ios"
+UA_ANDROID = "android"
+UA_DESKTOP = "desktop"
+UA_BOT = "bot"
+UA_OTHER = "other"
+UA_CLASS_CHOICES = [
+    (UA_IOS, "iOS"),
+    (UA_ANDROID, "Android"),
+    (UA_DESKTOP, "Desktop"),
+    (UA_BOT, "Bot"),
+    (UA_OTHER, "Other"),
+]
+
+_BOT = re.compile(r"bot|crawl|spider|slurp|preview|fetch|curl|wget|python-requests|headless", re.IGNORECASE)
+_IOS = re.compile(r"iphone|ipad|ipod|\bios\b", re.IGNORECASE)
+_ANDROID = re.compile(r"android", re.IGNORECASE)
+_DESKTOP = re.compile(r"windows nt|macintosh|x11|cros", re.IGNORECASE)
+
+
+def classify_user_agent(user_agent: str | None) -> str:
+    """
+    Coarse device class of a User-Agent header, stored instead of the header itself.
+    """
+    if not user_agent:
+        return UA_OTHER
+    if _BOT.search(user_agent):
+        return UA_BOT
+    if _IOS.search(user_agent):
+        return UA_IOS
+    if _ANDROID.search(user_agent):
+        return UA_ANDROID
+    if _DESKTOP.search(user_agent):
+        return UA_DESKTOP
+    return UA_OTHER
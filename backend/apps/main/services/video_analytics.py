@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, QuerySet, Sum
+from django.utils import timezone
+
+from main.models import (
+    AdsManagerVideo,
+    VideoAnalytics,
+    VideoAnalyticsDaily,
+    VideoAnalyticsRollupDay,
+    VideoAnalyticsTotal,
+)
+from main.services import hll
+
+logger = logging.getLogger(__name__)
+
+
+def day_start(day: date) -> datetime:
+    """
+    Midnight at the start of day in the current time zone.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def retention_cutoff(today: Optional[date] = None) -> date:
+    """
+    First day whose raw rows are kept; older days live only in the rollups.
+    """
+    return (today or timezone.localdate()) - timedelta(settings.VIDEO_ANALYTICS_RETENTION_DAYS)
+
+
+def _raw_totals(rows) -> dict[int, dict[str, Any]]:
+    """
+    Views, completes, countries and a distinct-IP sketch per video for a set of
+    raw VideoAnalytics rows, in three grouped queries.
+    """
+    totals: dict[int, dict[str, Any]] = defaultdict(
+        lambda: {"views": 0, "complete_views": 0, "countries": Counter(), "ips": hll.empty()}
+    )
+    for video_id, views, complete_views in (
+        rows.values("video_id")
+        .annotate(views=Count("id"), complete_views=Count("id", filter=Q(is_complete=True)))
+        .order_by()
+        .values_list("video_id", "views", "complete_views")
+    ):
+        totals[video_id]["views"] = views
+        totals[video_id]["complete_views"] = complete_views
+
+    for video_id, country, views in (
+        rows.values("video_id", "country")
+        .annotate(views=Count("id"))
+        .order_by()
+        .values_list("video_id", "country", "views")
+    ):
+        totals[video_id]["countries"][country or ""] += views
+
+    ips: dict[int, list[str]] = defaultdict(list)
+    for video_id, ip_address in rows.values_list("video_id", "ip_address").distinct().order_by().iterator():
+        ips[video_id].append(ip_address)
+    for video_id, addresses in ips.items():
+        hll.add(totals[video_id]["ips"], addresses)
+    return totals
+
+
+def _refresh_totals(day_sketches: dict[int, bytes]) -> None:
+    """
+    Bring the VideoAnalyticsTotal rows of the given videos in line with their daily rows.
+
+    Counts are re-summed from the daily rows; the sketch is the union of the
+    stored one and the newly rolled-up day.
+    """
+    counts = {
+        video_id: (views, complete_views)
+        for video_id, views, complete_views in VideoAnalyticsDaily.objects.filter(video_id__in=list(day_sketches))
+        .values("video_id")
+        .annotate(views=Sum("views"), complete_views=Sum("complete_views"))
+        .order_by()
+        .values_list("video_id", "views", "complete_views")
+    }
+    countries: dict[int, Counter[str]] = defaultdict(Counter)
+    for video_id, views_by_country in VideoAnalyticsDaily.objects.filter(
+        video_id__in=list(day_sketches)
+    ).values_list("video_id", "views_by_country"):
+        countries[video_id].update(views_by_country)
+    stored = dict(
+        VideoAnalyticsTotal.objects.filter(video_id__in=list(day_sketches)).values_list("video_id", "unique_ips_hll")
+    )
+
+    VideoAnalyticsTotal.objects.bulk_create(
+        [
+            VideoAnalyticsTotal(
+                video_id=video_id,
+                views=counts[video_id][0],
+                complete_views=counts[video_id][1],
+                unique_ips_hll=hll.merge(hll.from_bytes(stored.get(video_id)), hll.from_bytes(sketch)).tobytes(),
+                views_by_country=dict(countries[video_id]),
+            )
+            for video_id, sketch in day_sketches.items()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["video"],
+        update_fields=["views", "complete_views", "unique_ips_hll", "views_by_country", "updated_at"],
+    )
+
+
+def rolled_up_through() -> Optional[date]:
+    """
+    Watermark of the rollups: the latest day rolled up for every video, or None.
+    """
+    return VideoAnalyticsRollupDay.objects.aggregate(day=Max("day"))["day"]
+
+
+def next_rollup_day() -> Optional[date]:
+    """
+    First day not rolled up yet: the day after the watermark, or the day of the
+    first raw view before any rollup. None when there is nothing to roll up.
+    """
+    rolled_through = rolled_up_through()
+    if rolled_through is not None:
+        return rolled_through + timedelta(1)
+    first_view = VideoAnalytics.objects.aggregate(created_at=Min("created_at"))["created_at"]
+    return timezone.localdate(first_view) if first_view else None
+
+
+def rollup_video_analytics(day: date, video_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the VideoAnalyticsDaily rows of one day from the raw rows and
+    fold them into the lifetime VideoAnalyticsTotal rows.
+
+    Daily rows are overwritten, not incremented, so running a day twice is
+    harmless. A full rollup marks the day in VideoAnalyticsRollupDay and must
+    not leave a gap after the watermark, since the analytics endpoints read raw
+    rows only after it. Rolling up a subset of videos is limited to days already
+    marked, where it corrects rows without moving the watermark. Only closed
+    days should be rolled up, and compacted days are skipped, their raw rows
+    are gone. Returns the rows written.
+
+    Raises:
+        ValueError: if the day would leave a gap or is partial and not yet rolled up.
+    """
+    if VideoAnalyticsRollupDay.objects.filter(day=day, compacted_at__isnull=False).exists():
+        logger.warning(f"Not rolling up {day}: its raw video analytics are compacted")
+        return 0
+    rolled_through = rolled_up_through()
+    if video_ids is not None:
+        if rolled_through is None or day > rolled_through:
+            raise ValueError(f"Roll up {day} for every video before correcting single videos")
+    else:
+        next_day = next_rollup_day()
+        if next_day is None:
+            return 0
+        if day > next_day:
+            raise ValueError(f"Rolling up {day} would leave {next_day} out of the totals; roll it up first")
+
+    rows = VideoAnalytics.objects.filter(created_at__gte=day_start(day), created_at__lt=day_start(day + timedelta(1)))
+    if video_ids is not None:
+        rows = rows.filter(video_id__in=list(video_ids))
+
+    rollups = [
+        VideoAnalyticsDaily(
+            video_id=video_id,
+            day=day,
+            views=totals["views"],
+            complete_views=totals["complete_views"],
+            unique_ips_hll=totals["ips"].tobytes(),
+            views_by_country=dict(totals["countries"]),
+        )
+        for video_id, totals in _raw_totals(rows).items()
+    ]
+    with transaction.atomic():
+        VideoAnalyticsDaily.objects.bulk_create(
+            rollups,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["video", "day"],
+            update_fields=["views", "complete_views", "unique_ips_hll", "views_by_country", "updated_at"],
+        )
+        if rollups:
+            _refresh_totals({rollup.video_id: rollup.unique_ips_hll for rollup in rollups})
+        if video_ids is None:
+            VideoAnalyticsRollupDay.objects.update_or_create(day=day)
+    return len(rollups)
+
+
+def pending_rollup_days(today: Optional[date] = None) -> list[date]:
+    """
+    Closed days not rolled up yet, in order from the watermark. The latest
+    rolled-up day is included again, in case views were committed just after
+    it was computed.
+    """
+    today = today or timezone.localdate()
+    first = rolled_up_through() or next_rollup_day()
+    if first is None:
+        return []
+    return [first + timedelta(days) for days in range((today - first).days)]
+
+
+def compact_video_analytics(chunk_size: int = 5000, today: Optional[date] = None) -> int:
+    """
+    Delete raw VideoAnalytics rows older than the retention window, one rolled-up
+    day at a time.
+
+    Days that were never rolled up are rolled up first, and raw rows are only
+    deleted on days marked in VideoAnalyticsRollupDay. A day is flagged as
+    compacted before its rows go, so it is never rolled up again from partial
+    data. Rows go in chunks of chunk_size, each in its own short transaction, so
+    no lock is held for long. Returns the rows deleted.
+    """
+    cutoff = retention_cutoff(today)
+    for day in pending_rollup_days(today):
+        if day < cutoff:
+            rollup_video_analytics(day)
+
+    deleted = 0
+    for day in VideoAnalyticsRollupDay.objects.filter(day__lt=cutoff, compacted_at__isnull=True).order_by("day"):
+        day.compacted_at = timezone.now()
+        day.save(update_fields=["compacted_at"])
+        expired = VideoAnalytics.objects.filter(
+            created_at__gte=day_start(day.day), created_at__lt=day_start(day.day + timedelta(1))
+        )
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            deleted += VideoAnalytics.objects.filter(id__in=ids).delete()[0]
+    logger.info(f"Deleted {deleted} raw video analytics rows before {cutoff}")
+    return deleted
+
+
+def _raw_delta(videos: QuerySet[AdsManagerVideo] | list[int]) -> dict[int, dict[str, Any]]:
+    """
+    Totals of the raw rows not rolled up yet: everything after the watermark.
+    """
+    rows = VideoAnalytics.objects.filter(video__in=videos)
+    rolled_through = rolled_up_through()
+    if rolled_through is not None:
+        rows = rows.filter(created_at__gte=day_start(rolled_through + timedelta(1)))
+    return _raw_totals(rows)
+
+
+def get_video_analytics(video: AdsManagerVideo) -> dict[str, Any]:
+    """
+    Lifetime analytics of a video: its VideoAnalyticsTotal row plus the raw rows
+    newer than the latest rollup.
+
+    The cost depends on the views since the last rollup run, not on the
+    lifetime number of views or days.
+    """
+    total = VideoAnalyticsTotal.objects.filter(video=video).first()
+    delta = _raw_delta([video.id]).get(video.id)
+
+    views = total.views if total else 0
+    complete_views = total.complete_views if total else 0
+    countries: Counter[str] = Counter(total.views_by_country if total else {})
+    sketches = [hll.from_bytes(total.unique_ips_hll)] if total else []
+    if delta:
+        views += delta["views"]
+        complete_views += delta["complete_views"]
+        countries.update(delta["countries"])
+        sketches.append(delta["ips"])
+
+    return {
+        "total_views": views,
+        "complete_views": complete_views,
+        "unique_viewers": hll.count(hll.merge(*sketches)),
+        "views_by_country": [
+            {"country": country or None, "count": count} for country, count in countries.most_common()
+        ],
+    }
+
+
+def _completion_rate(complete_views: int, views: int) -> float:
+    return round((complete_views / views * 100) if views > 0 else 0, 2)
+
+
+def get_analytics_summary(videos: QuerySet[AdsManagerVideo], top: int = 5) -> dict[str, Any]:
+    """
+    Analytics across a set of videos from their lifetime rollups plus the raw
+    rows since the latest rollup, in a fixed number of queries.
+
+    Per-video totals are read once and grouped in Python into the top videos
+    and the per-campaign totals; unique viewers is the union of the sketches.
+    """
+    video_rows = list(videos.values_list("id", "title", "ads_manager__campaign_name").order_by("id"))
+    totals = {
+        video_id: {"views": views, "complete_views": complete_views, "ips": hll.from_bytes(sketch)}
+        for video_id, views, complete_views, sketch in VideoAnalyticsTotal.objects.filter(video__in=videos)
+        .values_list("video_id", "views", "complete_views", "unique_ips_hll")
+    }
+    delta = _raw_delta(videos)
+
+    per_video = []
+    sketches = []
+    for video_id, title, campaign_name in video_rows:
+        views = complete_views = 0
+        for part in (totals.get(video_id), delta.get(video_id)):
+            if part:
+                views += part["views"]
+                complete_views += part["complete_views"]
+                sketches.append(part["ips"])
+        per_video.append((video_id, title, campaign_name, views, complete_views))
+
+    by_campaign: dict[str, list[int]] = {}
+    for _, _, campaign_name, views, complete_views in per_video:
+        campaign = by_campaign.setdefault(campaign_name, [0, 0])
+        campaign[0] += views
+        campaign[1] += complete_views
+
+    total_views = sum(row[3] for row in per_video)
+    complete_views = sum(row[4] for row in per_video)
+    return {
+        "total_videos": len(video_rows),
+        "total_views": total_views,
+        "complete_views": complete_views,
+        "overall_completion_rate": _completion_rate(complete_views, total_views),
+        "unique_viewers": hll.count(hll.merge(*sketches)),
+        "top_videos": [
+            {
+                "id": video_id,
+                "title": title or "Untitled Video",
+                "ads_manager": campaign_name,
+                "view_count": views,
+                "complete_views": video_complete_views,
+                "completion_rate": _completion_rate(video_complete_views, views),
+            }
+            for video_id, title, campaign_name, views, video_complete_views in sorted(
+                per_video, key=lambda row: row[3], reverse=True
+            )[:top]
+        ],
+        "views_by_ads_manager": [
+            {"ads_manager__campaign_name": name, "total_views": views, "complete_views": campaign_complete_views}
+            for name, (views, campaign_complete_views) in sorted(
+                by_campaign.items(), key=lambda item: item[1][0], reverse=True
+            )
+        ],
+    }
@@ -4,11 +4,18 @@ import logging
 import threading
 from typing import Any, Optional
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from main.models import ScreenManager
+from main.models import AdsManager, AdsManagerImage, AdsManagerVideo, CampaignFacet, MediaModel, ScreenManager
+from main.services.campaign_facets import schedule_facet_refresh
+from main.services.campaign_stats import invalidate_campaign_stats
+from main.services.geo import parse_coordinates
+from main.services.inventory import bump_campaign_version, bump_inventory_version, bump_screen_map_version
+from main.services.media_ingest import enqueue_ingestion
 from main.services.popular_times import PopularTimesService, PopularTimesServiceError
+from main.services.popularity import compile_popularity_profile
+from main.services.qr_clicks import invalidate_qr_link
 
 logger = logging.getLogger(__name__)
 
@@ -16,31 +23,6 @@ logger = logging.getLogger(__name__)
 _thread_locals = threading.local()
 
 
-def _get_coordinates_from_json(coordinates: Optional[dict[str, Any]]) -> Optional[tuple[float, float]]:
-    """
-    Extract latitude and longitude from coordinates JSON field.
-    
-    Args:
-        coordinates: Dictionary with 'lat' and 'lng' keys
-    
-    Returns:
-        Tuple of (latitude, longitude) or None if invalid
-    """
-    if not coordinates or not isinstance(coordinates, dict):
-        return None
-    
-    lat = coordinates.get("lat")
-    lng = coordinates.get("lng")
-    
-    if lat is None or lng is None:
-        return None
-    
-    try:
-        return (float(lat), float(lng))
-    except (ValueError, TypeError):
-        return None
-
-
 def _coordinates_changed(old_coords: Optional[dict], new_coords: Optional[dict]) -> bool:
     """
     Check if coordinates have changed.
@@ -52,8 +34,8 @@ def _coordinates_changed(old_coords: Optional[dict], new_coords: Optional[dict])
     Returns:
         True if coordinates changed, False otherwise
     """
-    old_tuple = _get_coordinates_from_json(old_coords)
-    new_tuple = _get_coordinates_from_json(new_coords)
+    old_tuple = parse_coordinates(old_coords)
+    new_tuple = parse_coordinates(new_coords)
     
     # If both are None, no change
     if old_tuple is None and new_tuple is None:
@@ -93,8 +75,10 @@ def _fetch_and_update_popular_times(screen_manager_id: int, latitude: float, lon
             # Update the ScreenManager instance with popular_times
             # We need to use update() to avoid triggering the signal again
             ScreenManager.objects.filter(id=screen_manager_id).update(
-                popular_times=data["popular_times"]
+                popular_times=data["popular_times"],
+                popularity_profile=compile_popularity_profile(data["popular_times"]),
             )
+            bump_inventory_version()
             logger.info(
                 f"Successfully updated popular_times for ScreenManager {screen_manager_id}"
             )
@@ -170,7 +154,7 @@ def fetch_popular_times_on_coordinate_change(
         return
     
     # Extract latitude and longitude
-    coords_tuple = _get_coordinates_from_json(new_coordinates)
+    coords_tuple = parse_coordinates(new_coordinates)
     if coords_tuple is None:
         logger.warning(
             f"Invalid coordinates for ScreenManager {instance.id}: {new_coordinates}"
@@ -192,3 +176,209 @@ def fetch_popular_times_on_coordinate_change(
         f"Started background task to fetch popular_times for ScreenManager {instance.id}"
     )
 
+
+@receiver(post_save, sender=AdsManagerVideo)
+@receiver(post_save, sender=AdsManagerImage)
+def ingest_uploaded_media(sender: type[MediaModel], instance: MediaModel, **kwargs: Any) -> None:
+    """
+    Hand newly attached creatives to the background ingestion pipeline, so hashing
+    and probing happen off the request path once the upload transaction commits.
+
+    Args:
+        sender: AdsManagerVideo or AdsManagerImage model class
+        instance: Media instance that was saved
+        **kwargs: Additional signal arguments
+    """
+    if instance.processing_status == MediaModel.PENDING:
+        enqueue_ingestion(instance)
+
+
+@receiver(post_save, sender=AdsManager)
+@receiver(post_delete, sender=AdsManager)
+def reset_campaign_stats(sender: type[AdsManager], instance: AdsManager, **kwargs: Any) -> None:
+    """
+    Invalidate the owner's cached dashboard statistics after any campaign write.
+
+    Args:
+        sender: AdsManager model class
+        instance: AdsManager instance that was saved or deleted
+        **kwargs: Additional signal arguments
+    """
+    invalidate_campaign_stats(instance.created_by_id)
+
+
+@receiver(post_save, sender=AdsManager)
+@receiver(post_delete, sender=AdsManager)
+def reset_qr_link(
+    sender: type[AdsManager], instance: AdsManager, update_fields: Optional[frozenset] = None, **kwargs: Any
+) -> None:
+    """
+    Drop the cached QR redirect target when the campaign link may have changed.
+
+    Args:
+        sender: AdsManager model class
+        instance: AdsManager instance that was saved or deleted
+        update_fields: Fields passed to save(), None for a full save or a delete
+        **kwargs: Additional signal arguments
+    """
+    if update_fields is None or "link" in update_fields:
+        invalidate_qr_link(instance.pk)
+
+
+@receiver(post_save, sender=AdsManager)
+def refresh_location_facets(
+    sender: type[AdsManager],
+    instance: AdsManager,
+    created: bool,
+    update_fields: Optional[frozenset] = None,
+    **kwargs: Any
+) -> None:
+    """
+    Recount the owner's region and district facets when a campaign's location may have changed.
+
+    Args:
+        sender: AdsManager model class
+        instance: AdsManager instance that was saved
+        created: True if instance was created, False if updated
+        update_fields: Fields passed to save(), None for a full save
+        **kwargs: Additional signal arguments
+    """
+    if created or update_fields is None or update_fields & {"region", "district"}:
+        schedule_facet_refresh([instance.created_by_id], [CampaignFacet.REGION, CampaignFacet.DISTRICT])
+
+
+@receiver(post_delete, sender=AdsManager)
+def refresh_facets_on_delete(sender: type[AdsManager], instance: AdsManager, **kwargs: Any) -> None:
+    """
+    Recount all facets of the owner after a campaign is deleted.
+
+    Args:
+        sender: AdsManager model class
+        instance: AdsManager instance that was deleted
+        **kwargs: Additional signal arguments
+    """
+    schedule_facet_refresh([instance.created_by_id])
+
+
+def _refresh_targeting_facets(kind: str, instance: Any, action: str, reverse: bool, pk_set: Optional[set]) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        user_ids = [instance.created_by_id]
+    elif pk_set:
+        user_ids = AdsManager.objects.filter(pk__in=pk_set).values_list("created_by_id", flat=True)
+    else:
+        # Reverse clear: the affected campaigns are gone, but their owners still have facet rows.
+        user_ids = CampaignFacet.objects.filter(kind=kind, **{kind: instance}).values_list("user_id", flat=True)
+    schedule_facet_refresh(list(user_ids), [kind])
+
+
+@receiver(m2m_changed, sender=AdsManager.interests.through)
+def refresh_interest_facets(
+    sender: type,
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: Optional[set],
+    **kwargs: Any
+) -> None:
+    """
+    Recount interest facets when campaign interests are added, removed or cleared.
+
+    Args:
+        sender: AdsManager.interests through model
+        instance: AdsManager (or Interest for reverse changes)
+        action: m2m_changed action name
+        reverse: True when the change was made from the Interest side
+        pk_set: Primary keys added or removed
+        **kwargs: Additional signal arguments
+    """
+    _refresh_targeting_facets(CampaignFacet.INTEREST, instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=AdsManager.venue_types.through)
+def refresh_venue_type_facets(
+    sender: type,
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: Optional[set],
+    **kwargs: Any
+) -> None:
+    """
+    Recount venue type facets when campaign venue types are added, removed or cleared.
+
+    Args:
+        sender: AdsManager.venue_types through model
+        instance: AdsManager (or VenueType for reverse changes)
+        action: m2m_changed action name
+        reverse: True when the change was made from the VenueType side
+        pk_set: Primary keys added or removed
+        **kwargs: Additional signal arguments
+    """
+    _refresh_targeting_facets(CampaignFacet.VENUE_TYPE, instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=ScreenManager)
+@receiver(post_delete, sender=ScreenManager)
+def reset_inventory_caches(sender: type[ScreenManager], instance: ScreenManager, **kwargs: Any) -> None:
+    """
+    Invalidate caches derived from the screen inventory (forecasts) and the
+    owner's map tiles after any screen write.
+
+    Args:
+        sender: ScreenManager model class
+        instance: ScreenManager instance that was saved or deleted
+        **kwargs: Additional signal arguments
+    """
+    bump_inventory_version()
+    bump_screen_map_version(instance.created_by_id)
+
+
+@receiver(m2m_changed, sender=ScreenManager.venue_types.through)
+@receiver(m2m_changed, sender=ScreenManager.interests.through)
+def reset_inventory_caches_on_targeting(sender: type, action: str, **kwargs: Any) -> None:
+    """
+    Invalidate inventory caches when screen venue types or interests change.
+
+    Args:
+        sender: ScreenManager.venue_types or ScreenManager.interests through model
+        action: m2m_changed action name
+        **kwargs: Additional signal arguments
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_inventory_version()
+
+
+@receiver(post_save, sender=AdsManager)
+@receiver(post_delete, sender=AdsManager)
+def reset_campaign_index(
+    sender: type[AdsManager], instance: AdsManager, update_fields: Optional[frozenset] = None, **kwargs: Any
+) -> None:
+    """
+    Invalidate the inventory index when campaign targeting, or whether the
+    campaign can still run, may have changed.
+
+    Args:
+        sender: AdsManager model class
+        instance: AdsManager instance that was saved or deleted
+        update_fields: Fields passed to save(), None for a full save or a delete
+        **kwargs: Additional signal arguments
+    """
+    if update_fields is None or update_fields & {"region", "district", "status", "end_date"}:
+        bump_campaign_version()
+
+
+@receiver(m2m_changed, sender=AdsManager.venue_types.through)
+@receiver(m2m_changed, sender=AdsManager.interests.through)
+def reset_campaign_index_on_targeting(sender: type, action: str, **kwargs: Any) -> None:
+    """
+    Invalidate the inventory index when campaign venue types or interests change.
+
+    Args:
+        sender: AdsManager.venue_types or AdsManager.interests through model
+        action: m2m_changed action name
+        **kwargs: Additional signal arguments
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_campaign_version()
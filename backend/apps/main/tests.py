@@ -0,0 +1,1143 @@
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from main.models import (
+    AdsManager,
+    AdsManagerImage,
+    AdsManagerVideo,
+    AudienceHourly,
+    AudienceImpression,
+    CacheVersion,
+    CampaignFacet,
+    ChunkedUpload,
+    District,
+    Interest,
+    MediaModel,
+    QRScanEvent,
+    QRScanHourly,
+    Region,
+    ScreenManager,
+    VenueType,
+    VideoAnalytics,
+    VideoAnalyticsDaily,
+    VideoAnalyticsRollupDay,
+    VideoAnalyticsTotal,
+)
+from main.serializers.screen_manager import AdsManagerSerializer
+from main.services.campaign_facets import refresh_campaign_facets
+from main.services.audience import record_audience_impressions
+from main.services.forecast import BASE_HOURLY_AUDIENCE, audience_matrix
+from main.services.inventory import get_inventory_index
+from main.services.lifecycle import run_campaign_lifecycle
+from main.services.media_ingest import ingest_image, ingest_video
+from main.services.playlist import get_playlist_videos
+from main.services import qr_clicks
+from main.services.qr_clicks import flush_qr_clicks, record_qr_click
+from main.services.qr_codes import generate_qr_code, link_hash
+from main.services.qr_renderer import render_qr, render_qr_reference
+from main.services.schedule import (
+    ALWAYS_ON,
+    SLOTS_PER_WEEK,
+    bitmap_matrix,
+    compile_schedule,
+    from_bytes,
+    is_scheduled,
+    slot_for_datetime,
+    slot_index,
+    to_bytes,
+    to_utc_bitmap,
+)
+from main.services.video_analytics import (
+    compact_video_analytics,
+    get_analytics_summary,
+    get_video_analytics,
+    rollup_video_analytics,
+)
+from users.models import User
+
+
+def make_screen(**overrides) -> ScreenManager:
+    """
+    Create a screen with placeholder values for the required fields.
+    """
+    fields = {
+        "title": "Screen",
+        "position": "Entrance",
+        "type_category": "LED",
+        "screen_size": "55",
+        "screen_resolution": 1080,
+        **overrides,
+    }
+    return ScreenManager.objects.create(**fields)
+
+
+def make_campaign(**overrides) -> AdsManager:
+    """
+    Create a campaign with placeholder values for the required fields, running from yesterday to tomorrow.
+    """
+    now = timezone.now()
+    fields = {
+        "campaign_name": "Campaign",
+        "budget": 1000,
+        "start_date": now - timedelta(days=1),
+        "end_date": now + timedelta(days=1),
+        **overrides,
+    }
+    return AdsManager.objects.create(**fields)
+
+
+class MainTestCase(TestCase):
+    """
+    Starts each test with an empty cache and an API client, logged in as cls.user when the class sets one.
+    """
+
+    user = None
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        if self.user is not None:
+            self.client.force_authenticate(self.user)
+
+
+class AdsManagerQueryCountTests(MainTestCase):
+    """
+    AdsManagerViewSet list endpoints must not issue queries per campaign.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="owner@example.com", password="password")
+        cls.region = Region.objects.create(name="Toshkent shahri")
+        cls.district = District.objects.create(name="Yunusobod", region=cls.region)
+        cls.interests = [Interest.objects.create(name=f"Interest {i}") for i in range(3)]
+        cls.venue_types = [VenueType.objects.create(name=f"Venue {i}") for i in range(2)]
+
+    def _create_campaigns(self, count: int) -> None:
+        for i in range(count):
+            ads_manager = make_campaign(
+                campaign_name=f"Campaign {AdsManager.objects.count()}",
+                region=self.region,
+                district=self.district,
+                status=AdsManager.ACTIVE,
+                created_by=self.user,
+            )
+            ads_manager.interests.set(self.interests)
+            ads_manager.venue_types.set(self.venue_types)
+            AdsManagerVideo.objects.create(ads_manager=ads_manager, video="ads_videos/video.mp4")
+            AdsManagerImage.objects.create(ads_manager=ads_manager, image="ads_images/image.png")
+
+    def _count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_campaigns(self):
+        for url in (
+            "/api/v1/main/ads-managers/",
+            "/api/v1/main/ads-managers/active/",
+            f"/api/v1/main/ads-managers/filter_by_interest/?interest_id={self.interests[0].id}",
+        ):
+            with self.subTest(url=url):
+                AdsManager.objects.all().delete()
+                self._create_campaigns(1)
+                single = self._count_queries(url)
+                self._create_campaigns(10)
+                self.assertEqual(self._count_queries(url), single)
+
+    def test_compact_view_skips_nested_relations(self):
+        self._create_campaigns(3)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/main/ads-managers/?view=compact")
+        self.assertEqual(response.status_code, 200)
+        results = response.data.get("results", response.data)
+        self.assertEqual(set(results[0]), set(AdsManagerSerializer.Meta.compact_fields))
+        # Pagination count plus the page itself, without joins or prefetches.
+        self.assertLessEqual(len(context.captured_queries), 4)
+        self.assertNotIn("main_interest", " ".join(query["sql"] for query in context.captured_queries))
+
+    def test_fields_parameter(self):
+        self._create_campaigns(1)
+        response = self.client.get("/api/v1/main/ads-managers/?fields=id,campaign_name,videos")
+        self.assertEqual(response.status_code, 200)
+        results = response.data.get("results", response.data)
+        self.assertEqual(set(results[0]), {"id", "campaign_name", "videos"})
+        self.assertEqual(len(results[0]["videos"]), 1)
+
+        response = self.client.get("/api/v1/main/ads-managers/?fields=id,missing")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pagination_walks_all_campaigns(self):
+        self._create_campaigns(5)
+        url = "/api/v1/main/ads-managers/?pagination=cursor&limit=2&view=compact"
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        expected = AdsManager.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_stats_are_single_query_and_invalidated_on_write(self):
+        self._create_campaigns(2)
+        self.assertEqual(self._count_queries("/api/v1/main/ads-managers/stats/"), 1)
+        self.assertEqual(self._count_queries("/api/v1/main/ads-managers/aggregate_by_status/"), 0)
+
+        response = self.client.get("/api/v1/main/ads-managers/aggregate_by_status/")
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual([group["status"] for group in response.data["status_groups"]], [AdsManager.ACTIVE])
+
+        ads_manager = AdsManager.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            ads_manager.status = AdsManager.PAUSED
+            ads_manager.save()
+        response = self.client.get("/api/v1/main/ads-managers/stats/")
+        self.assertEqual((response.data["active"], response.data["paused"]), (1, 1))
+        self.assertEqual(response.data["total_budget"], 2000.0)
+
+    def test_facets_follow_campaign_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_campaigns(2)
+        response = self.client.get("/api/v1/main/ads-managers/facets/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(item["name"], item["count"]) for item in response.data["regions"]], [(self.region.name, 2)]
+        )
+        self.assertEqual([item["count"] for item in response.data["interests"]], [2, 2, 2])
+
+        ads_manager = AdsManager.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            ads_manager.interests.remove(self.interests[0])
+            ads_manager.delete()
+        response = self.client.get("/api/v1/main/ads-managers/interests/")
+        self.assertEqual([item["count"] for item in response.data["interests"]], [1, 1, 1])
+        response = self.client.get("/api/v1/main/ads-managers/regions/")
+        self.assertEqual(response.data["total_regions"], 1)
+        self.assertEqual(response.data["regions"][0]["count"], 1)
+
+    def test_facet_refresh_upserts(self):
+        self._create_campaigns(2)
+        refresh_campaign_facets(self.user.id)
+        refresh_campaign_facets(self.user.id)
+        self.assertEqual(CampaignFacet.objects.filter(user=self.user).count(), 7)
+
+        AdsManager.objects.first().delete()
+        for ads_manager in AdsManager.objects.all():
+            ads_manager.venue_types.clear()
+        refresh_campaign_facets(self.user.id)
+        self.assertFalse(CampaignFacet.objects.filter(kind=CampaignFacet.VENUE_TYPE).exists())
+        self.assertEqual(
+            set(CampaignFacet.objects.filter(kind=CampaignFacet.INTEREST).values_list("count", flat=True)), {1}
+        )
+
+
+class ForecastTests(MainTestCase):
+    """
+    AdsManagerViewSet.summary forecasts delivery from the matching screens.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="planner@example.com", password="password")
+        cls.region = Region.objects.create(name="Samarqand viloyati")
+        cls.district = District.objects.create(name="Samarqand", region=cls.region)
+        cls.venue_type = VenueType.objects.create(name="Transport Hubs")
+        popular_times = [
+            {"day": 1, "day_text": "Monday", "popular_times": [{"hour": 9, "percentage": 100}]},
+        ]
+        for i, cpm in enumerate((10, 30)):
+            screen = make_screen(
+                title=f"Screen {i}",
+                status=ScreenManager.ACTIVE,
+                region=cls.region,
+                district=cls.district,
+                cpm=cpm,
+                popular_times=popular_times,
+            )
+            screen.venue_types.set([cls.venue_type])
+        # Inactive screens are not forecast.
+        make_screen(title="Offline", region=cls.region, district=cls.district)
+
+    def _summary(self, **params):
+        params = {"region": self.region.id, "district": self.district.id, "interests[]": [], **params}
+        response = self.client.get("/api/v1/main/ads-managers/summary/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_forecast_uses_popular_times_and_schedule(self):
+        start = timezone.make_aware(datetime(2026, 3, 1), ZoneInfo("Asia/Tashkent"))
+        dates = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=14)).isoformat()}
+
+        data = self._summary(schedule='{"1-9": true}', budget="100000", **dates)
+        # Two Mondays at 09:00 with a full house on two screens.
+        self.assertEqual(data["screens_count"], 2)
+        self.assertEqual(data["impressions"], 2 * 2 * BASE_HOURLY_AUDIENCE)
+        self.assertEqual(data["cpm"], 20)
+
+        self.assertEqual(self._summary(schedule='{"1-10": true}', **dates)["impressions"], 0)
+
+    def test_budget_caps_delivery(self):
+        data = self._summary(budget="1")
+        self.assertEqual(data["estimated_cost"], 1)
+        self.assertEqual(data["budget_utilization"], 100)
+        self.assertGreater(data["impressions"], 0)
+        self.assertGreaterEqual(data["impressions"], data["reach"])
+
+    def test_forecast_is_cached_until_inventory_changes(self):
+        first = self._summary(budget="500")
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self._summary(budget="100000")["screens_count"], first["screens_count"])
+        # Only the inventory version and the serializer's lookups of region and district remain.
+        self.assertEqual(len(context.captured_queries), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offline = ScreenManager.objects.get(title="Offline")
+            offline.status = ScreenManager.ACTIVE
+            offline.save()
+        self.assertEqual(self._summary()["screens_count"], 3)
+
+    def test_audience_history_reads_hourly_rollup(self):
+        screen = ScreenManager.objects.get(title="Screen 0")
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        record_audience_impressions(
+            AudienceImpression(screen=screen, timestamp=hour + timedelta(minutes=minute), face_count=faces)
+            for minute, faces in ((5, 3), (40, 4))
+        )
+        self.assertEqual(AudienceHourly.objects.get(screen=screen).faces, 7)
+
+        rates, observed = audience_matrix([screen.id])
+        local = timezone.localtime(hour, ZoneInfo("Asia/Tashkent"))
+        slot = slot_index((local.weekday() + 1) % 7, local.hour)
+        self.assertEqual(rates[0, slot], 7)
+        self.assertEqual(observed.sum(), 1)
+
+
+class InventoryIndexTests(MainTestCase):
+    """
+    InventoryIndex applies the same targeting rules from both sides.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name="Buxoro viloyati")
+        cls.district = District.objects.create(name="Buxoro", region=cls.region)
+        cls.other_district = District.objects.create(name="Kogon", region=cls.region)
+        cls.mall = VenueType.objects.create(name="Shopping Center")
+        cls.street = VenueType.objects.create(name="Streets and Roads")
+        cls.music = Interest.objects.create(name="Music")
+
+    def _screen(self, district, venue_types=()):
+        screen = make_screen(status=ScreenManager.ACTIVE, region=self.region, district=district)
+        screen.venue_types.set(venue_types)
+        return screen
+
+    def _campaign(self, district=None, venue_types=(), interests=()):
+        ads_manager = make_campaign(region=self.region, district=district, status=AdsManager.ACTIVE)
+        ads_manager.venue_types.set(venue_types)
+        ads_manager.interests.set(interests)
+        return ads_manager
+
+    def test_matching_rules(self):
+        mall_screen = self._screen(self.district, [self.mall])
+        any_venue_screen = self._screen(self.district)
+        other_district_screen = self._screen(self.other_district, [self.street])
+
+        whole_region = self._campaign()
+        street_campaign = self._campaign(venue_types=[self.street])
+        district_campaign = self._campaign(self.district, interests=[self.music])
+
+        index = get_inventory_index()
+        self.assertCountEqual(
+            index.screens_matching(self.region.id, venue_type_ids=[self.mall.id]),
+            [mall_screen.id, any_venue_screen.id],
+        )
+        self.assertCountEqual(
+            index.screens_matching(self.region.id, self.other_district.id), [other_district_screen.id]
+        )
+        self.assertCountEqual(index.campaigns_for_screen(mall_screen.id), [whole_region.id, district_campaign.id])
+        self.assertCountEqual(
+            index.campaigns_for_screen(any_venue_screen.id), [whole_region.id, street_campaign.id, district_campaign.id]
+        )
+        self.assertCountEqual(
+            index.campaigns_for_screen(other_district_screen.id), [whole_region.id, street_campaign.id]
+        )
+
+    def test_index_follows_targeting_changes(self):
+        screen = self._screen(self.district, [self.mall])
+        campaign = self._campaign(venue_types=[self.street])
+        AdsManagerVideo.objects.create(ads_manager=campaign, video="ads_videos/video.mp4")
+        self.assertFalse(get_playlist_videos(screen).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            campaign.venue_types.add(self.mall)
+        self.assertEqual(list(get_playlist_videos(screen).values_list("ads_manager_id", flat=True)), [campaign.id])
+
+    def test_index_drops_completed_campaigns(self):
+        screen = self._screen(self.district)
+        campaign = self._campaign()
+        index = get_inventory_index()
+        self.assertEqual(index.campaigns_for_screen(screen.id), [campaign.id])
+
+        # A bump made by another worker is read from the database
+        CacheVersion.objects.filter(key="campaign_version").update(version=F("version") + 1)
+        self.assertIsNot(get_inventory_index(), index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_campaign_lifecycle(timezone.now() + timedelta(days=2))
+        self.assertEqual(get_inventory_index().campaigns_for_screen(screen.id), [])
+
+
+class ScheduleBitmapTests(TestCase):
+    """
+    Schedules compile to little-endian 168-bit UTC bitmaps that PostgreSQL get_bit() can read.
+    """
+
+    def test_compile_schedule(self):
+        schedule = {"0-0": True, "6-23": True, "1-2": False, "7-1": True, "1-24": True, "bad": True}
+        self.assertEqual(compile_schedule(schedule), 1 | 1 << slot_index(6, 23))
+        self.assertEqual(compile_schedule({}), ALWAYS_ON)
+        self.assertEqual(compile_schedule({"3-4": False}), ALWAYS_ON)
+        # The campaign form sends {day: [hours]}
+        schedule = {"0": [0, 1], "1": [], "6": [23, 24, "x"], "7": [1], "bad": [2]}
+        self.assertEqual(compile_schedule(schedule), 1 | 1 << 1 | 1 << slot_index(6, 23))
+        self.assertEqual(compile_schedule({str(day): [] for day in range(7)}), ALWAYS_ON)
+
+    def test_rotation_to_utc(self):
+        tashkent = to_utc_bitmap(1 << slot_index(1, 10), "Asia/Tashkent")
+        self.assertEqual(tashkent, 1 << slot_index(1, 5))
+        # Sunday 02:00 local wraps back to Saturday 21:00 UTC
+        self.assertEqual(to_utc_bitmap(1 << slot_index(0, 2), "Asia/Tashkent"), 1 << slot_index(6, 21))
+        # The offset in effect at the reference moment is used: CEST in July, CET in January
+        summer = to_utc_bitmap(1 << slot_index(2, 12), "Europe/Berlin", datetime(2026, 7, 1, tzinfo=ZoneInfo("UTC")))
+        winter = to_utc_bitmap(1 << slot_index(2, 12), "Europe/Berlin", datetime(2026, 1, 1, tzinfo=ZoneInfo("UTC")))
+        self.assertEqual((summer, winter), (1 << slot_index(2, 10), 1 << slot_index(2, 11)))
+        self.assertEqual(to_utc_bitmap(ALWAYS_ON, "Asia/Tashkent"), ALWAYS_ON)
+
+    def test_slot_for_datetime(self):
+        # 2026-10-18 is a Sunday; Tashkent midnight Monday is still Sunday 19:00 UTC
+        self.assertEqual(slot_for_datetime(datetime(2026, 10, 18, 0, 30, tzinfo=ZoneInfo("UTC"))), 0)
+        monday = datetime(2026, 10, 19, 0, 0, tzinfo=ZoneInfo("Asia/Tashkent"))
+        self.assertEqual(slot_for_datetime(monday), slot_index(0, 19))
+
+    def test_packing_matches_postgres_get_bit(self):
+        slots = [0, 7, 8, 100, slot_index(6, 21), SLOTS_PER_WEEK - 1]
+        bitmap = sum(1 << slot for slot in slots)
+        packed = to_bytes(bitmap)
+        self.assertEqual(len(packed), 21)
+        self.assertEqual(packed[0], 0b10000001)
+        self.assertEqual(from_bytes(packed), bitmap)
+        self.assertEqual(from_bytes(None), ALWAYS_ON)
+        self.assertEqual(list(np.flatnonzero(bitmap_matrix([packed])[0])), slots)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT array_agg(get_bit(%s::bytea, slot) ORDER BY slot) FROM generate_series(0, 167) AS slot",
+                [packed],
+            )
+            bits = cursor.fetchone()[0]
+        self.assertEqual([slot for slot, bit in enumerate(bits) if bit], slots)
+        self.assertTrue(all(is_scheduled(bitmap, slot) for slot in slots))
+
+    def test_campaign_save_compiles_bitmap(self):
+        ads_manager = make_campaign(schedule={"1-10": True})
+        self.assertEqual(from_bytes(ads_manager.schedule_bitmap), 1 << slot_index(1, 5))
+        ads_manager.schedule = {}
+        ads_manager.save(update_fields=["schedule"])
+        ads_manager.refresh_from_db()
+        self.assertEqual(from_bytes(ads_manager.schedule_bitmap), ALWAYS_ON)
+
+
+class PlaylistScheduleTests(MainTestCase):
+    """
+    The playlist only keeps campaigns that are live and scheduled for the current weekly slot.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name="Namangan viloyati")
+        cls.screen = make_screen(status=ScreenManager.ACTIVE, region=cls.region)
+
+    def _campaign(self, schedule, status=AdsManager.ACTIVE):
+        ads_manager = make_campaign(
+            start_date=datetime(2026, 10, 1, tzinfo=ZoneInfo("UTC")),
+            end_date=datetime(2026, 11, 30, tzinfo=ZoneInfo("UTC")),
+            region=self.region,
+            status=status,
+            schedule=schedule,
+        )
+        AdsManagerVideo.objects.create(ads_manager=ads_manager, video="ads_videos/video.mp4")
+        return ads_manager
+
+    def _playing(self, at):
+        return set(get_playlist_videos(self.screen, at).values_list("ads_manager_id", flat=True))
+
+    def test_schedule_slot_and_window(self):
+        # Monday 10:00 in Tashkent (UTC+5) is Monday 05:00 UTC
+        morning = self._campaign({"1-10": True})
+        always = self._campaign({})
+        unscheduled = self._campaign({"1-10": True})
+        AdsManager.objects.filter(pk=unscheduled.pk).update(schedule_bitmap=None)
+        paused = self._campaign({}, status=AdsManager.PAUSED)
+
+        monday_morning = datetime(2026, 10, 19, 5, 30, tzinfo=ZoneInfo("UTC"))
+        self.assertEqual(self._playing(monday_morning), {morning.id, always.id, unscheduled.id})
+        self.assertEqual(self._playing(monday_morning + timedelta(hours=1)), {always.id, unscheduled.id})
+        self.assertEqual(self._playing(monday_morning + timedelta(days=7)), {morning.id, always.id, unscheduled.id})
+        self.assertEqual(self._playing(datetime(2026, 12, 7, 5, 30, tzinfo=ZoneInfo("UTC"))), set())
+        self.assertNotIn(paused.id, self._playing(monday_morning))
+
+    def test_scheduled_at_uses_stored_bitmap(self):
+        morning = self._campaign({"1-10": True})
+        scheduled = AdsManager.objects.filter(pk=morning.pk).scheduled_at
+        self.assertTrue(scheduled(datetime(2026, 10, 19, 5, 0, tzinfo=ZoneInfo("UTC"))).exists())
+        self.assertFalse(scheduled(datetime(2026, 10, 19, 10, 0, tzinfo=ZoneInfo("UTC"))).exists())
+        self.assertFalse(scheduled(datetime(2026, 10, 20, 5, 0, tzinfo=ZoneInfo("UTC"))).exists())
+
+    def test_frontend_schedule_through_api(self):
+        self.client.force_authenticate(User.objects.create_user(email="schedule@example.com", password="password"))
+        response = self.client.post(
+            "/api/v1/main/ads-managers/",
+            {
+                "campaign_name": "Campaign",
+                "budget": 1000,
+                "start_date": "2026-10-01T00:00:00Z",
+                "end_date": "2026-11-30T00:00:00Z",
+                "region_id": self.region.id,
+                "status": AdsManager.ACTIVE,
+                "schedule": {"0": [], "1": [10, 11], "2": [], "3": [], "4": [], "5": [], "6": []},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        AdsManagerVideo.objects.create(ads_manager_id=response.data["id"], video="ads_videos/video.mp4")
+
+        # Monday 10:00-12:00 in Tashkent is Monday 05:00-07:00 UTC
+        self.assertEqual(self._playing(datetime(2026, 10, 19, 6, 30, tzinfo=ZoneInfo("UTC"))), {response.data["id"]})
+        self.assertEqual(self._playing(datetime(2026, 10, 19, 7, 30, tzinfo=ZoneInfo("UTC"))), set())
+        self.assertEqual(self._playing(datetime(2026, 10, 20, 5, 30, tzinfo=ZoneInfo("UTC"))), set())
+
+
+class ScreenManifestTests(MainTestCase):
+    """
+    The screen manifest carries an ETag of its contents and answers 304 while it is unchanged.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name="Xorazm viloyati")
+        cls.screen = make_screen(status=ScreenManager.ACTIVE, region=region)
+        cls.ads_manager = make_campaign(region=region, status=AdsManager.ACTIVE)
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/v1/main/screen-videos/{self.screen.id}/manifest/"
+
+    def _video(self, content_hash, status=MediaModel.READY):
+        video = AdsManagerVideo.objects.create(ads_manager=self.ads_manager, video="ads_videos/video.mp4")
+        AdsManagerVideo.objects.filter(pk=video.pk).update(
+            processing_status=status, content_hash=content_hash, file_size=1024
+        )
+        return video
+
+    def test_etag_and_not_modified(self):
+        ready = self._video("a" * 64)
+        self._video("", status=MediaModel.PENDING)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertEqual(etag, f'"{response.data["version"]}"')
+        self.assertEqual([item["id"] for item in response.data["items"]], [ready.id])
+        self.assertEqual(response.data["total_size"], 1024)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        AdsManagerVideo.objects.filter(pk=ready.pk).update(content_hash="b" * 64)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class MediaIngestTests(TestCase):
+    """
+    Uploaded creatives are claimed, hashed and probed by the ingestion pipeline before screens get them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ads_manager = make_campaign()
+
+    def _video(self, content=b"video bytes"):
+        return AdsManagerVideo.objects.create(ads_manager=self.ads_manager, video=ContentFile(content, "clip.mp4"))
+
+    @mock.patch("main.services.media_ingest.probe_video", return_value={"width": 1920, "height": 1080})
+    def test_video_is_hashed_and_ready(self, probe):
+        video = self._video()
+        self.assertEqual(video.processing_status, MediaModel.PENDING)
+        ingest_video(video.id)
+        video.refresh_from_db()
+        self.assertEqual(video.processing_status, MediaModel.READY)
+        self.assertEqual(video.content_hash, hashlib.sha256(b"video bytes").hexdigest())
+        self.assertEqual((video.file_size, video.width, video.height), (11, 1920, 1080))
+        self.assertIsNotNone(video.processing_started_at)
+
+        # A ready row cannot be claimed again
+        with self.assertNumQueries(1):
+            ingest_video(video.id)
+
+    def test_failed_image_is_retried(self):
+        image = AdsManagerImage.objects.create(ads_manager=self.ads_manager, image=ContentFile(b"not a png", "a.png"))
+        ingest_image(image.id)
+        image.refresh_from_db()
+        self.assertEqual(image.processing_status, MediaModel.FAILED)
+
+        with mock.patch("main.services.media_ingest.probe_image", return_value={"width": 4, "height": 3}):
+            call_command("ingest_media", stdout=StringIO())
+            image.refresh_from_db()
+            self.assertEqual(image.processing_status, MediaModel.FAILED)
+            call_command("ingest_media", "--retry-failed", stdout=StringIO())
+        image.refresh_from_db()
+        self.assertEqual((image.processing_status, image.width, image.height), (MediaModel.READY, 4, 3))
+
+    @mock.patch("main.services.media_ingest.probe_video", return_value={})
+    def test_stuck_claim_is_reclaimed(self, probe):
+        video = self._video()
+        AdsManagerVideo.objects.filter(pk=video.pk).update(
+            processing_status=MediaModel.PROCESSING, processing_started_at=timezone.now()
+        )
+        # A live worker still owns the row
+        ingest_video(video.id)
+        call_command("ingest_media", "--reclaim-stuck", stdout=StringIO())
+        video.refresh_from_db()
+        self.assertEqual(video.processing_status, MediaModel.PROCESSING)
+
+        AdsManagerVideo.objects.filter(pk=video.pk).update(processing_started_at=timezone.now() - timedelta(hours=1))
+        call_command("ingest_media", stdout=StringIO())
+        video.refresh_from_db()
+        self.assertEqual(video.processing_status, MediaModel.PROCESSING)
+        call_command("ingest_media", "--reclaim-stuck", stdout=StringIO())
+        video.refresh_from_db()
+        self.assertEqual(video.processing_status, MediaModel.READY)
+        self.assertIsNotNone(video.content_hash)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), CHUNKED_UPLOAD_DIR=tempfile.mkdtemp())
+class ChunkedUploadTests(MainTestCase):
+    """
+    Videos upload in ordered chunks that can be resumed, then are assembled into an AdsManagerVideo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="uploader@example.com", password="password")
+        cls.ads_manager = make_campaign(created_by=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * 40
+
+    def _start(self, checksum):
+        response = self.client.post(
+            "/api/v1/main/video-uploads/",
+            {
+                "ads_manager": self.ads_manager.id,
+                "filename": "clip.mp4",
+                "total_size": len(self.content),
+                "checksum": checksum,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return f"/api/v1/main/video-uploads/{response.data['id']}/"
+
+    def _chunk(self, url, start, end):
+        return self.client.put(
+            f"{url}chunk/",
+            self.content[start:end],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end - 1}/{len(self.content)}",
+        )
+
+    def test_resume_and_complete(self):
+        url = self._start(hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self._chunk(url, 0, 4096).data["offset"], 4096)
+
+        # A repeated chunk is refused with the offset to resume from
+        response = self._chunk(url, 0, 4096)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 4096)
+        self.assertEqual(self.client.get(url).data["offset"], 4096)
+
+        response = self.client.post(f"{url}complete/")
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self._chunk(url, 4096, len(self.content)).data["offset"], len(self.content))
+        response = self.client.post(f"{url}complete/")
+        self.assertEqual(response.status_code, 201)
+
+        upload = ChunkedUpload.objects.get()
+        self.assertEqual(upload.status, ChunkedUpload.COMPLETED)
+        self.assertEqual(upload.video_id, response.data["id"])
+        with upload.video.video.open("rb") as fh:
+            self.assertEqual(fh.read(), self.content)
+        self.assertEqual(self.client.post(f"{url}complete/").status_code, 409)
+
+    def test_checksum_mismatch_keeps_upload(self):
+        url = self._start("0" * 64)
+        self._chunk(url, 0, len(self.content))
+
+        response = self.client.post(f"{url}complete/")
+        self.assertEqual(response.status_code, 422)
+        upload = ChunkedUpload.objects.get()
+        self.assertEqual(upload.status, ChunkedUpload.UPLOADING)
+        self.assertFalse(AdsManagerVideo.objects.exists())
+        self.assertEqual(self.client.delete(url).status_code, 204)
+
+
+class BulkStatusTests(MainTestCase):
+    """
+    Bulk status endpoints update many rows in one statement, scoped to the user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="operator@example.com", password="password")
+        cls.other_user = User.objects.create_user(email="other@example.com", password="password")
+        cls.screens = [
+            make_screen(status=ScreenManager.ACTIVE, created_by=cls.user if i < 3 else cls.other_user)
+            for i in range(4)
+        ]
+
+    def test_bulk_status_updates_only_own_screens(self):
+        ids = [screen.id for screen in self.screens]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/v1/main/screen-managers/bulk_status/",
+                {"ids": ids, "status": ScreenManager.MAINTENANCE},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(response.data["not_found"], [self.screens[3].id])
+        updates = [query["sql"] for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"created_by_id"', updates[0])
+        self.assertEqual(ScreenManager.objects.filter(status=ScreenManager.MAINTENANCE).count(), 3)
+
+    def test_bulk_status_pauses_own_campaigns(self):
+        campaigns = [
+            make_campaign(status=AdsManager.ACTIVE, created_by=self.user if i < 2 else self.other_user)
+            for i in range(3)
+        ]
+        response = self.client.post(
+            "/api/v1/main/ads-managers/bulk_status/",
+            {"ids": [campaign.id for campaign in campaigns], "status": AdsManager.PAUSED},
+            format="json",
+        )
+        self.assertEqual((response.data["updated"], response.data["not_found"]), (2, [campaigns[2].id]))
+        self.assertEqual(
+            list(AdsManager.objects.order_by("id").values_list("status", "is_active")),
+            [(AdsManager.PAUSED, False), (AdsManager.PAUSED, False), (AdsManager.ACTIVE, True)],
+        )
+
+    def test_bulk_status_rejects_unknown_status(self):
+        response = self.client.post(
+            "/api/v1/main/screen-managers/bulk_status/",
+            {"ids": [self.screens[0].id], "status": AdsManager.PAUSED},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch("apps.main.signals._fetch_and_update_popular_times")
+class ScreenGeoTests(MainTestCase):
+    """
+    Screen coordinates are mirrored into indexed latitude/longitude columns for map queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="geo@example.com", password="password")
+
+    def _screen(self, title, coordinates, **fields):
+        return make_screen(title=title, coordinates=coordinates, created_by=self.user, **fields)
+
+    def test_lat_lng_follow_coordinates(self, fetch):
+        screen = self._screen("Tashkent", {"lat": "41.3111", "lng": 69.2797})
+        self.assertEqual((screen.latitude, screen.longitude), (41.3111, 69.2797))
+        screen.coordinates = {"lat": 95, "lng": 0}
+        screen.save(update_fields=["coordinates"])
+        screen.refresh_from_db()
+        self.assertIsNone(screen.latitude)
+
+    def test_bbox_and_radius_queries(self, fetch):
+        self._screen("Amir Temur square", {"lat": 41.3111, "lng": 69.2797})
+        self._screen("Chorsu", {"lat": 41.3262, "lng": 69.2359})
+        self._screen("Samarkand", {"lat": 39.6542, "lng": 66.9597})
+        self._screen("Unplaced", None)
+        data = self.client.get("/api/v1/main/screen-managers/coordinates/", {"bbox": "69,41,70,42"}).data
+        self.assertEqual({screen["title"] for screen in data["screens"]}, {"Amir Temur square", "Chorsu"})
+        self.assertEqual(self.client.get("/api/v1/main/screen-managers/coordinates/").data["total_screens"], 3)
+
+        params = {"lat": 41.3111, "lng": 69.2797, "radius": 10}
+        data = self.client.get("/api/v1/main/screen-managers/nearby/", params).data
+        self.assertEqual([screen["title"] for screen in data["screens"]], ["Amir Temur square", "Chorsu"])
+        self.assertAlmostEqual(data["screens"][1]["distance_km"], 4.03, delta=0.01)
+        response = self.client.get("/api/v1/main/screen-managers/nearby/", {"lat": 41.3, "lng": 69.2, "radius": 0})
+        self.assertEqual(response.status_code, 400)
+
+    def test_map_clusters_by_zoom(self, fetch):
+        self._screen("Amir Temur square", {"lat": 41.3111, "lng": 69.2797})
+        self._screen("Chorsu", {"lat": 41.3262, "lng": 69.2359}, status=ScreenManager.ACTIVE)
+        self._screen("Samarkand", {"lat": 39.6542, "lng": 66.9597})
+        data = self.client.get("/api/v1/main/screen-managers/map_clusters/", {"bbox": "60,35,75,45", "zoom": 6}).data
+        self.assertTrue(data["clustered"])
+        self.assertEqual(data["total_screens"], 3)
+        tashkent = max(data["features"], key=lambda feature: feature["count"])
+        self.assertEqual((tashkent["count"], tashkent["statuses"]), (2, {"inactive": 1, "active": 1}))
+        self.assertAlmostEqual(tashkent["lat"], 41.31865)
+
+        # Cached tiles only cost the version lookup
+        with self.assertNumQueries(1):
+            self.client.get("/api/v1/main/screen-managers/map_clusters/", {"bbox": "60,35,75,45", "zoom": 6})
+
+        street = {"bbox": "69.23,41.31,69.29,41.33", "zoom": 15}
+        data = self.client.get("/api/v1/main/screen-managers/map_clusters/", street).data
+        self.assertFalse(data["clustered"])
+        self.assertEqual({feature["title"] for feature in data["features"]}, {"Amir Temur square", "Chorsu"})
+        response = self.client.get("/api/v1/main/screen-managers/map_clusters/", {"bbox": "0,0,90,60", "zoom": 10})
+        self.assertEqual(response.status_code, 400)
+
+    def test_map_tiles_follow_owner_screens_only(self, fetch):
+        screen = self._screen("Amir Temur square", {"lat": 41.3111, "lng": 69.2797})
+        other = User.objects.create_user(email="other-geo@example.com", password="password")
+        params = {"bbox": "60,35,75,45", "zoom": 6}
+        self.assertEqual(self.client.get("/api/v1/main/screen-managers/map_clusters/", params).data["total_screens"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_screen(coordinates={"lat": 41.3262, "lng": 69.2359}, created_by=other)
+        with self.assertNumQueries(1):
+            self.client.get("/api/v1/main/screen-managers/map_clusters/", params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            screen.coordinates = {"lat": 39.6542, "lng": 66.9597}
+            screen.save()
+        feature = self.client.get("/api/v1/main/screen-managers/map_clusters/", params).data["features"][0]
+        self.assertAlmostEqual(feature["lat"], 39.6542)
+
+
+class CampaignLifecycleTests(TestCase):
+    """
+    run_campaign_lifecycle keeps status and the is_active flag in step with the campaign dates.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name="Navoiy viloyati")
+
+    def create_campaign(self, status, start_date, end_date):
+        return make_campaign(start_date=start_date, end_date=end_date, region=self.region, status=status)
+
+    def test_lifecycle_completes_and_starts_campaigns(self):
+        now = timezone.now()
+        expiring = self.create_campaign(AdsManager.ACTIVE, now - timedelta(days=2), now + timedelta(hours=1))
+        upcoming = self.create_campaign(AdsManager.ACTIVE, now + timedelta(hours=1), now + timedelta(days=2))
+        draft = self.create_campaign(AdsManager.DRAFT, now - timedelta(days=1), now + timedelta(days=2))
+        self.assertEqual(list(AdsManager.objects.live().values_list("id", flat=True)), [expiring.id])
+
+        result = run_campaign_lifecycle(at=now + timedelta(hours=2))
+
+        self.assertEqual(result, {"completed": 1, "refreshed": 1})
+        expiring.refresh_from_db()
+        upcoming.refresh_from_db()
+        draft.refresh_from_db()
+        self.assertEqual((expiring.status, expiring.is_active), (AdsManager.COMPLETED, False))
+        self.assertEqual((upcoming.status, upcoming.is_active), (AdsManager.ACTIVE, True))
+        self.assertEqual((draft.status, draft.is_active), (AdsManager.DRAFT, False))
+
+    def test_live_checks_window_without_lifecycle_run(self):
+        now = timezone.now()
+        ended = self.create_campaign(AdsManager.ACTIVE, now - timedelta(days=2), now + timedelta(hours=1))
+        # The campaign ended, but run_campaign_lifecycle has not cleared its flag yet
+        AdsManager.objects.filter(pk=ended.pk).update(end_date=now - timedelta(minutes=1))
+        self.assertTrue(AdsManager.objects.filter(pk=ended.pk, is_active=True).exists())
+        self.assertFalse(AdsManager.objects.live().exists())
+
+
+class QRRendererTests(TestCase):
+    """
+    The NumPy renderer must produce exactly the image of the per-module PIL drawing.
+    """
+
+    def test_render_matches_reference(self):
+        for data in ("x", "street-screens.vercel.app/api/v1/main/qr/123/", "https://example.com/" + "a" * 200):
+            with self.subTest(length=len(data)):
+                image = render_qr(data)
+                reference = render_qr_reference(data)
+                self.assertEqual(image.size, reference.size)
+                self.assertEqual(image.tobytes(), reference.tobytes())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class QRCodeJobTests(MainTestCase):
+    """
+    QR codes are rendered by a background job; the API only queues it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="qr@example.com", password="password")
+        cls.ads_manager = make_campaign(link="https://example.com/", created_by=cls.user)
+
+    def test_generate_qr_code_is_queued(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(f"/api/v1/main/ads-managers/{self.ads_manager.id}/generate_qr_code/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["data"]["qr_status"], MediaModel.PENDING)
+        self.assertEqual(len(callbacks), 1)
+
+        generate_qr_code(self.ads_manager.id, link_hash(self.ads_manager.link))
+        self.ads_manager.refresh_from_db()
+        self.assertEqual(self.ads_manager.qr_status, MediaModel.READY)
+        self.assertTrue(self.ads_manager.qr_code.name.startswith("qr_codes/cache/"))
+
+    def test_stale_job_does_nothing(self):
+        AdsManager.objects.filter(pk=self.ads_manager.pk).update(
+            qr_status=MediaModel.PENDING, qr_link_hash=link_hash("https://example.com/new/")
+        )
+        generate_qr_code(self.ads_manager.id, link_hash(self.ads_manager.link))
+        self.ads_manager.refresh_from_db()
+        self.assertEqual(self.ads_manager.qr_status, MediaModel.PENDING)
+        self.assertFalse(self.ads_manager.qr_code)
+
+    def test_qr_image_is_content_addressed(self):
+        url = f"/api/v1/main/ads-managers/{self.ads_manager.id}/qr_image/?size=small&type=svg"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertTrue(response.content.startswith(b"<svg"))
+
+        with mock.patch("main.services.qr_codes.encode_qr") as encode_qr:
+            cached = self.client.get(url)
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        encode_qr.assert_not_called()
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn("max-age=31536000", not_modified["Cache-Control"])
+
+    def test_qr_image_screen_must_be_own(self):
+        screens = [
+            make_screen(created_by=owner)
+            for owner in (self.user, User.objects.create_user(email="other-qr@example.com", password="password"))
+        ]
+        url = f"/api/v1/main/ads-managers/{self.ads_manager.id}/qr_image/?type=svg&screen="
+        self.assertEqual(self.client.get(f"{url}{screens[0].id}").status_code, 200)
+        self.assertEqual(self.client.get(f"{url}{screens[1].id}").status_code, 400)
+
+
+@override_settings(QR_CLICK_FLUSH_INTERVAL=0)
+class QRRedirectTests(MainTestCase):
+    """
+    QR scans are served from the link cache and counted in batches.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ads_manager = make_campaign(link="https://example.com/")
+
+    def setUp(self):
+        super().setUp()
+        self.ads_manager.refresh_from_db()
+
+    def tearDown(self):
+        # Write leftover scans inside this test's transaction, so they are rolled back with it.
+        flush_qr_clicks()
+
+    def test_scans_are_buffered_and_flushed_in_one_update(self):
+        initial = self.ads_manager.involve_count
+        url = f"/api/v1/main/qr/{self.ads_manager.id}/"
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            for _ in range(4):
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "https://example.com/")
+
+        # Events, hourly rollup and involve_count: one statement each, inside a savepoint.
+        with self.assertNumQueries(5):
+            self.assertEqual(flush_qr_clicks(), 1)
+        self.ads_manager.refresh_from_db()
+        self.assertEqual(self.ads_manager.involve_count, initial + 5)
+
+    def test_buffer_is_flushed_without_further_scans(self):
+        record_qr_click(self.ads_manager.id)
+        with (
+            mock.patch("main.services.qr_clicks.time.sleep", side_effect=[None, StopIteration]),
+            mock.patch("main.services.qr_clicks.run_in_background") as run_in_background,
+            self.assertRaises(StopIteration),
+        ):
+            qr_clicks._flush_periodically()
+        run_in_background.assert_called_once_with(flush_qr_clicks, key="flush_qr_clicks")
+
+    def test_link_change_invalidates_cached_target(self):
+        url = f"/api/v1/main/qr/{self.ads_manager.id}/"
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ads_manager.link = "https://example.com/new/"
+            self.ads_manager.save()
+        self.assertEqual(self.client.get(url)["Location"], "https://example.com/new/")
+
+    def test_scans_are_attributed_to_screens(self):
+        screen = make_screen(title="Lobby")
+        iphone = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15"
+        for _ in range(3):
+            self.client.get(f"/api/v1/main/qr/{self.ads_manager.id}/{screen.id}/", HTTP_USER_AGENT=iphone)
+        self.client.get(f"/api/v1/main/qr/{self.ads_manager.id}/")
+        AudienceImpression.objects.create(
+            screen=screen, ads_manager=self.ads_manager, timestamp=timezone.now(), face_count=1500
+        )
+        flush_qr_clicks()
+
+        self.assertEqual(
+            QRScanEvent.objects.filter(ads_manager=self.ads_manager, screen=screen, ua_class="ios").count(), 3
+        )
+        self.assertEqual(QRScanHourly.objects.get(ads_manager=self.ads_manager, screen=screen).scans, 3)
+
+        user = User.objects.create_user(email="scans@example.com", password="password")
+        AdsManager.objects.filter(pk=self.ads_manager.pk).update(created_by=user)
+        self.client.force_authenticate(user)
+        report = self.client.get(f"/api/v1/main/ads-managers/{self.ads_manager.id}/scans_by_screen/").data
+        self.assertIn(None, [row["screen_id"] for row in report["screens"]])
+        self.assertEqual(
+            report["screens"][0],
+            {"screen_id": screen.id, "screen_title": "Lobby", "scans": 3, "impressions": 1500,
+             "conversion_per_mille": 2.0},
+        )
+
+
+class VideoAnalyticsRollupTests(MainTestCase):
+    """
+    Video analytics combine daily rollups with the raw rows since the latest rollup.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="analytics@example.com", password="password")
+        ads_manager = make_campaign(created_by=cls.user)
+        cls.video = AdsManagerVideo.objects.create(ads_manager=ads_manager, video="ads_videos/video.mp4")
+
+    def create_views(self, created_at, ips, country="Uzbekistan", is_complete=False):
+        views = [
+            VideoAnalytics.objects.create(video=self.video, ip_address=ip, country=country, is_complete=is_complete)
+            for ip in ips
+        ]
+        VideoAnalytics.objects.filter(id__in=[view.id for view in views]).update(created_at=created_at)
+
+    def test_analytics_merge_rollups_and_todays_rows(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        self.create_views(yesterday, ["10.0.0.1", "10.0.0.2", "10.0.0.2"], is_complete=True)
+        self.create_views(yesterday, ["10.0.0.3"], country=None)
+        self.create_views(timezone.now(), ["10.0.0.1", "10.0.0.4"], country="Kazakhstan")
+
+        self.assertEqual(rollup_video_analytics(timezone.localdate(yesterday)), 1)
+        daily = VideoAnalyticsDaily.objects.get(video=self.video)
+        self.assertEqual((daily.views, daily.complete_views), (4, 3))
+        self.assertEqual(daily.views_by_country, {"Uzbekistan": 3, "": 1})
+
+        data = self.client.get(f"/api/v1/main/ads-videos/{self.video.id}/analytics/").data
+        self.assertEqual((data["total_views"], data["complete_views"], data["unique_viewers"]), (6, 3, 4))
+        self.assertEqual(
+            data["views_by_country"],
+            [
+                {"country": "Uzbekistan", "count": 3},
+                {"country": "Kazakhstan", "count": 2},
+                {"country": None, "count": 1},
+            ],
+        )
+        self.assertEqual(len(data["recent_views"]), 6)
+
+    def test_summary_reads_totals_in_fixed_queries(self):
+        two_days_ago = timezone.now() - timedelta(days=2)
+        yesterday = timezone.now() - timedelta(days=1)
+        self.create_views(two_days_ago, ["10.0.0.1", "10.0.0.2"], is_complete=True)
+        self.create_views(yesterday, ["10.0.0.2", "10.0.0.3"])
+        self.create_views(timezone.now(), ["10.0.0.4"], is_complete=True)
+        rollup_video_analytics(timezone.localdate(two_days_ago))
+        rollup_video_analytics(timezone.localdate(yesterday))
+        rollup_video_analytics(timezone.localdate(yesterday))
+
+        total = VideoAnalyticsTotal.objects.get(video=self.video)
+        self.assertEqual((total.views, total.complete_views), (4, 2))
+        AdsManagerVideo.objects.create(ads_manager=self.video.ads_manager, video="ads_videos/other.mp4")
+
+        with self.assertNumQueries(6):
+            summary = get_analytics_summary(AdsManagerVideo.objects.filter(ads_manager__created_by=self.user))
+        self.assertEqual(summary["total_videos"], 2)
+        self.assertEqual((summary["total_views"], summary["complete_views"], summary["unique_viewers"]), (5, 3, 4))
+        self.assertEqual(summary["overall_completion_rate"], 60.0)
+        self.assertEqual(summary["top_videos"][0]["id"], self.video.id)
+        self.assertEqual(summary["top_videos"][1]["view_count"], 0)
+        self.assertEqual(
+            summary["views_by_ads_manager"],
+            [{"ads_manager__campaign_name": "Campaign", "total_views": 5, "complete_views": 3}],
+        )
+
+    def test_rollups_never_leave_gaps(self):
+        days = [timezone.now() - timedelta(days=ago) for ago in (3, 2, 1)]
+        for created_at in days:
+            self.create_views(created_at, ["10.0.0.1"])
+
+        with self.assertRaises(ValueError):
+            rollup_video_analytics(timezone.localdate(days[1]))
+        with self.assertRaises(CommandError):
+            call_command("rollup_video_analytics", days=2, stdout=StringIO())
+        with self.assertRaises(ValueError):
+            rollup_video_analytics(timezone.localdate(days[0]), video_ids=[self.video.id])
+        self.assertEqual(get_video_analytics(self.video)["total_views"], 3)
+
+        call_command("rollup_video_analytics", stdout=StringIO())
+        self.assertEqual(
+            list(VideoAnalyticsRollupDay.objects.order_by("day").values_list("day", flat=True)),
+            [timezone.localdate(created_at) for created_at in days],
+        )
+        self.assertEqual(VideoAnalyticsTotal.objects.get(video=self.video).views, 3)
+        self.assertEqual(get_video_analytics(self.video)["total_views"], 3)
+
+    @override_settings(VIDEO_ANALYTICS_RETENTION_DAYS=30)
+    def test_compaction_keeps_totals(self):
+        expired = timezone.now() - timedelta(days=40)
+        self.create_views(expired, ["10.0.0.1", "10.0.0.2"], is_complete=True)
+        self.create_views(expired - timedelta(days=1), ["10.0.0.3"])
+        self.create_views(timezone.now() - timedelta(days=1), ["10.0.0.1"])
+
+        self.assertEqual(compact_video_analytics(chunk_size=1), 3)
+        self.assertEqual(VideoAnalytics.objects.count(), 1)
+        self.assertEqual(VideoAnalyticsDaily.objects.filter(video=self.video).count(), 2)
+        self.assertTrue(VideoAnalyticsRollupDay.objects.get(day=timezone.localdate(expired)).compacted_at)
+        self.assertEqual(rollup_video_analytics(timezone.localdate(expired)), 0)
+        # Compacted days are not visited again
+        with self.assertNumQueries(3):
+            self.assertEqual(compact_video_analytics(), 0)
+
+        totals = get_video_analytics(self.video)
+        self.assertEqual((totals["total_views"], totals["complete_views"], totals["unique_viewers"]), (4, 2, 3))
@@ -6,14 +6,16 @@ from .views.venue_type import VenueTypeListCreateView, VenueTypeDetailView
 from .views.screen_manager import ScreenManagerViewSet
 from .views.videos import AdsManagerVideoViewSet
 from .views.ads_manager import AdsManagerViewSet
+from .views.chunked_upload import ChunkedUploadViewSet
 from .views.regions import RegionViewSet
-from .views.video_serve import ScreenVideoView, VideoServeView, VideoAnalyticsView
+from .views.video_serve import ScreenManifestView, ScreenVideoView, VideoServeView, VideoAnalyticsView
 from .views.qr_redirect import QRCodeRedirectView
 
 router = DefaultRouter()
 router.register(r'screen-managers', ScreenManagerViewSet, basename='screen-manager')
 router.register(r'ads-managers', AdsManagerViewSet, basename='ads-manager')
 router.register(r'ads-videos', AdsManagerVideoViewSet, basename='ads-video')
+router.register(r'video-uploads', ChunkedUploadViewSet, basename='video-upload')
 router.register(r'regions', RegionViewSet, basename='region')
 
 urlpatterns = [
@@ -23,7 +25,9 @@ urlpatterns = [
     path('ads-videos/<int:pk>/serve/', VideoServeView.as_view(), name='ads-video-serve'),
     path('ads-videos/<int:pk>/track/', VideoAnalyticsView.as_view(), name='ads-video-analytics'),
     path('screen-videos/<int:pk>/', ScreenVideoView.as_view(), name='screen-videos-list'),
+    path('screen-videos/<int:pk>/manifest/', ScreenManifestView.as_view(), name='screen-videos-manifest'),
     path('qr/<int:ad_id>/', QRCodeRedirectView.as_view(), name='qr-redirect'),
+    path('qr/<int:ad_id>/<int:screen_id>/', QRCodeRedirectView.as_view(), name='qr-redirect-screen'),
     path("interests/", InterestListCreateView.as_view(), name="interest-list-create"),
     path("interests/<uuid:pk>/", InterestDetailView.as_view(), name="interest-detail"),
     path("venue-types/", VenueTypeListCreateView.as_view(), name="venue-type-list-create"),
@@ -1,13 +1,10 @@
-import random
 import logging
-from io import BytesIO
-from typing import Optional
-
-import qrcode
-from django.conf import settings
-from django.core.files.base import ContentFile
-from django.db import models
-from django.db.models import Avg, QuerySet, Count
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet, Sum
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets
@@ -18,13 +15,20 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
-from ..models import AdsManager
+from ..models import AdsManager, CampaignFacet, ScreenManager
 from ..serializers.screen_manager import AdsManagerSerializer, SummarySerializer
+from ..services.campaign_facets import get_campaign_facets
+from ..services.campaign_stats import get_campaign_stats, invalidate_campaign_stats
+from ..services.forecast import apply_budget, get_forecast
+from ..services.inventory import bump_campaign_version
+from ..services.qr_codes import get_qr_image, qr_image_digest, request_qr_code
+from ..services.qr_renderer import QR_FORMATS, QR_SIZES
+from .mixins import BulkStatusMixin, CursorPaginationMixin, SparseFieldsetViewMixin
 
 logger = logging.getLogger(__name__)
 
 
-class AdsManagerViewSet(viewsets.ModelViewSet):
+class AdsManagerViewSet(BulkStatusMixin, CursorPaginationMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing AdsManager instances.
     
@@ -38,6 +42,10 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
     - PUT /api/v1/main/ads-managers/{id}/ - Update an ads manager
     - PATCH /api/v1/main/ads-managers/{id}/ - Partially update an ads manager
     - DELETE /api/v1/main/ads-managers/{id}/ - Delete an ads manager
+    - POST /api/v1/main/ads-managers/bulk_status/ - Change the status of many campaigns at once
+
+    List endpoints accept ?fields=a,b or ?view=compact for lightweight responses,
+    and ?pagination=cursor for keyset pagination.
     """
 
     serializer_class = AdsManagerSerializer
@@ -47,43 +55,39 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
     search_fields = ["campaign_name", "region__name", "district__name"]
     ordering_fields = ["created_at", "updated_at", "campaign_name", "budget", "start_date", "end_date"]
     ordering = ["-created_at"]
+    select_related_fields = ("region", "district")
+    prefetch_related_fields = ("interests", "venue_types", "videos", "images")
+    status_choices = AdsManager.STATUS_CHOICES
 
     def get_queryset(self) -> QuerySet[AdsManager]:
         """
         Returns ads managers filtered by the current user.
         All operations are scoped to the authenticated user's ads managers.
         """
-        # Always filter by the current user - users can only see their own ads managers
-        return AdsManager.objects.filter(created_by=self.request.user)
+        # Always filter by the current user - users can only see their own ads managers.
+        # Relations rendered by AdsManagerSerializer are fetched up front, so list
+        # responses cost a constant number of queries regardless of page size.
+        return self.optimize_queryset(AdsManager.objects.filter(created_by=self.request.user))
 
     def perform_create(self, serializer: BaseSerializer[AdsManager]) -> None:
         """
         Set the created_by field to the current user when creating a new ads manager.
-        If a link is provided, generate a QR code for it.
+        If a link is provided, queue rendering of its QR code.
         """
         ads_manager = serializer.save(created_by=self.request.user)
         
-        # Generate QR code if link is provided
-        if ads_manager.link:
-            try:
-                self._generate_qr_code(ads_manager)
-            except Exception as e:
-                logger.error(f"Error generating QR code during create for AdsManager {ads_manager.id}: {str(e)}")
+        # QR rendering runs on the background worker pool once the row is committed
+        request_qr_code(ads_manager)
 
     def perform_update(self, serializer: BaseSerializer[AdsManager]) -> None:
         """
         Set the updated_by field to the current user when updating an ads manager.
-        If a link is provided or changed, regenerate the QR code.
+        If a link is provided and the QR code is missing or outdated, queue a new one.
         """
-        old_link = serializer.instance.link
         ads_manager = serializer.save(updated_by=self.request.user)
         
-        # Regenerate QR code if link was added or changed
-        if ads_manager.link and (old_link != ads_manager.link or not ads_manager.qr_code):
-            try:
-                self._generate_qr_code(ads_manager)
-            except Exception as e:
-                logger.error(f"Error generating QR code during update for AdsManager {ads_manager.id}: {str(e)}")
+        # Queue a QR code if the ad has a link but no up-to-date cached image yet
+        request_qr_code(ads_manager)
 
     @action(detail=False, methods=["get"])
     def active(self, request: Request) -> Response:
@@ -164,20 +168,34 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(ads_manager)
         return Response(serializer.data)
 
+    def get_bulk_status_values(self, status: str) -> dict:
+        """
+        Keep is_active in step with the new status in the same UPDATE.
+        """
+        return {**super().get_bulk_status_values(status), "is_active": AdsManager.objects.is_active_expression(status)}
+
+    def perform_bulk_status(self, ids: list[int], status: str) -> None:
+        """
+        Refresh the dashboard statistics after a bulk transition; completing or
+        reopening campaigns also changes the inventory index.
+        """
+        invalidate_campaign_stats(self.request.user.id)
+        bump_campaign_version()
+
     @action(detail=False, methods=["get"])
     def stats(self, request: Request) -> Response:
         """
         Get statistics about the current user's ads managers.
         GET /api/v1/main/ads-managers/stats/
         """
-        queryset = self.get_queryset()
+        campaign_stats = get_campaign_stats(request.user.id)
         stats = {
-            "total": queryset.count(),
-            "active": queryset.filter(status=AdsManager.ACTIVE).count(),
-            "draft": queryset.filter(status=AdsManager.DRAFT).count(),
-            "paused": queryset.filter(status=AdsManager.PAUSED).count(),
-            "completed": queryset.filter(status=AdsManager.COMPLETED).count(),
-            "total_budget": float(queryset.aggregate(total=models.Sum('budget'))['total'] or 0),
+            "total": campaign_stats["total"],
+            "active": campaign_stats["by_status"][AdsManager.ACTIVE]["count"],
+            "draft": campaign_stats["by_status"][AdsManager.DRAFT]["count"],
+            "paused": campaign_stats["by_status"][AdsManager.PAUSED]["count"],
+            "completed": campaign_stats["by_status"][AdsManager.COMPLETED]["count"],
+            "total_budget": campaign_stats["total_budget"],
         }
         return Response(stats)
 
@@ -187,36 +205,23 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         Get aggregated count of ads managers grouped by status for the current user.
         GET /api/v1/main/ads-managers/aggregate_by_status/
         """
-        from django.db.models import Sum
-        
-        queryset = self.get_queryset()
-        
-        # Aggregate by status with count and budget
-        status_aggregation = queryset.values('status').annotate(
-            count=Count('id'),
-            total_budget=Sum('budget')
-        ).order_by('status')
-        
-        # Create status groups with display names
-        status_groups = []
-        for item in status_aggregation:
-            status_value = item['status']
-            count = item['count']
-            total_budget = float(item['total_budget'] or 0)
-            
-            # Get status display name
-            status_display = dict(AdsManager.STATUS_CHOICES).get(status_value, f"Unknown ({status_value})")
-            
-            status_groups.append({
+        campaign_stats = get_campaign_stats(request.user.id)
+        status_display = dict(AdsManager.STATUS_CHOICES)
+
+        # Only statuses the user actually has, ordered by status value
+        status_groups = [
+            {
                 "status": status_value,
-                "status_display": status_display,
-                "count": count,
-                "total_budget": total_budget
-            })
-        
-        # Calculate total count and budget
-        total_count = queryset.count()
-        total_budget = float(queryset.aggregate(total=Sum('budget'))['total'] or 0)
+                "status_display": status_display[status_value],
+                "count": group["count"],
+                "total_budget": group["total_budget"],
+            }
+            for status_value, group in sorted(campaign_stats["by_status"].items())
+            if group["count"]
+        ]
+
+        total_count = campaign_stats["total"]
+        total_budget = campaign_stats["total_budget"]
         
         return Response({
             "status_groups": status_groups,
@@ -224,28 +229,27 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
             "total_budget": total_budget
         })
 
+    @action(detail=False, methods=["get"])
+    def facets(self, request: Request) -> Response:
+        """
+        Get campaign counts per region, district, interest and venue type for the current user.
+        GET /api/v1/main/ads-managers/facets/
+        """
+        facets = get_campaign_facets(request.user.id)
+        return Response({
+            "regions": facets[CampaignFacet.REGION],
+            "districts": facets[CampaignFacet.DISTRICT],
+            "interests": facets[CampaignFacet.INTEREST],
+            "venue_types": facets[CampaignFacet.VENUE_TYPE],
+        })
+
     @action(detail=False, methods=["get"])
     def regions(self, request: Request) -> Response:
         """
         Get all unique regions for the current user's ads managers.
         GET /api/v1/main/ads-managers/regions/
         """
-        queryset = self.get_queryset()
-        
-        # Get unique regions with count
-        regions_data = queryset.values('geo_region').annotate(
-            count=Count('id')
-        ).order_by('geo_region')
-        
-        # Format the response
-        regions = [
-            {
-                "region": item['geo_region'],
-                "count": item['count']
-            }
-            for item in regions_data if item['geo_region']
-        ]
-        
+        regions = get_campaign_facets(request.user.id, [CampaignFacet.REGION])[CampaignFacet.REGION]
         return Response({
             "regions": regions,
             "total_regions": len(regions)
@@ -257,24 +261,7 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         Get all unique districts for the current user's ads managers.
         GET /api/v1/main/ads-managers/districts/
         """
-        queryset = self.get_queryset()
-        
-        # Get unique districts with count
-        districts_data = queryset.values('district__id', 'district__name', 'district__code').annotate(
-            count=Count('id')
-        ).order_by('district__name')
-        
-        # Format the response
-        districts = [
-            {
-                "id": item['district__id'],
-                "name": item['district__name'],
-                "code": item['district__code'],
-                "count": item['count']
-            }
-            for item in districts_data if item['district__id']
-        ]
-        
+        districts = get_campaign_facets(request.user.id, [CampaignFacet.DISTRICT])[CampaignFacet.DISTRICT]
         return Response({
             "districts": districts,
             "total_districts": len(districts)
@@ -286,24 +273,7 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         Get all unique interests for the current user's ads managers.
         GET /api/v1/main/ads-managers/interests/
         """
-        queryset = self.get_queryset()
-        
-        # Get unique interests with count
-        interests_data = queryset.values('interests__id', 'interests__name', 'interests__slug').annotate(
-            count=Count('id')
-        ).order_by('interests__name')
-        
-        # Format the response
-        interests = [
-            {
-                "id": item['interests__id'],
-                "name": item['interests__name'],
-                "slug": item['interests__slug'],
-                "count": item['count']
-            }
-            for item in interests_data if item['interests__id']
-        ]
-        
+        interests = get_campaign_facets(request.user.id, [CampaignFacet.INTEREST])[CampaignFacet.INTEREST]
         return Response({
             "interests": interests,
             "total_interests": len(interests)
@@ -315,24 +285,7 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         Get all unique venue types for the current user's ads managers.
         GET /api/v1/main/ads-managers/venue_types/
         """
-        queryset = self.get_queryset()
-        
-        # Get unique venue types with count
-        venue_types_data = queryset.values('venue_types__id', 'venue_types__name', 'venue_types__slug').annotate(
-            count=Count('id')
-        ).order_by('venue_types__name')
-        
-        # Format the response
-        venue_types = [
-            {
-                "id": item['venue_types__id'],
-                "name": item['venue_types__name'],
-                "slug": item['venue_types__slug'],
-                "count": item['count']
-            }
-            for item in venue_types_data if item['venue_types__id']
-        ]
-        
+        venue_types = get_campaign_facets(request.user.id, [CampaignFacet.VENUE_TYPE])[CampaignFacet.VENUE_TYPE]
         return Response({
             "venue_types": venue_types,
             "total_venue_types": len(venue_types)
@@ -382,9 +335,10 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         Get summary of ads managers with efficiency forecast.
         GET /api/v1/main/ads-managers/summary/
         
-        Returns efficiency forecast data:
-        - If region and district are provided: random CPM and screens count
-        - If region or district is missing: returns 0 for both values
+        Forecasts delivery on the active screens matching the targeting:
+        - region (required), district, interests[], venue_types[]
+        - budget, schedule (JSON day-hour slots), start_date, end_date (optional)
+        Without a region all values are 0.
         """
         params = dict(request.GET.dict())
         params['interests'] = [int(interest) for interest in request.GET.getlist('interests[]')]
@@ -397,9 +351,7 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         venue_types = serializer.validated_data.get('venue_types')
         interests = serializer.validated_data.get('interests')
 
-        # Check if we have both region and district for forecast
-        if not region or not district:
-            # Return 0 values if region or district is missing
+        if not region:
             return Response({
                 "cpm": 0,
                 "screens_count": 0,
@@ -408,154 +360,25 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
                 "frequency": 0,
                 "estimated_cost": 0,
                 "budget_utilization": 0,
-                "message": "Region and district are required for efficiency forecast"
+                "message": "Region is required for efficiency forecast"
             })
 
-        # Generate random forecast data when region and district are available
-        # Base multipliers based on region (larger regions = more screens and higher CPM)
-        region_multipliers = {
-            1: 0.8,   # Toshkent viloyati
-            2: 0.6,   # Andijon viloyati
-            3: 0.5,   # Buxoro viloyati
-            4: 0.7,   # Farg'ona viloyati
-            7: 0.4,   # Namangan viloyati
-            10: 0.3,  # Qoraqalpog'iston
-            11: 0.6,  # Samarqand viloyati
-            14: 1.0,  # Toshkent shahri (capital)
-        }
-
-        region_multiplier = region_multipliers.get(region, 0.5)
-        
-        # Generate random but realistic data
-        base_screens = max(1, int(random.uniform(10, 50) * region_multiplier))
-        base_cpm = round(random.uniform(10, 30), 2)  # $10-30 CPM
-        base_impressions = int(random.uniform(50000, 150000) * region_multiplier)
-        
-        screens_count = base_screens
-        cpm = base_cpm
-        impressions = base_impressions
-        reach = int(impressions * (0.3 + random.uniform(0, 0.4)))  # 30-70% reach
-        frequency = round(impressions / reach, 2) if reach > 0 else 0
-        estimated_cost = round((impressions / 1000) * cpm, 2)
-        
-        # Get budget from request if provided
-        budget = float(request.GET.get('budget', 10000))
-        budget_utilization = min((estimated_cost / budget) * 100, 100) if budget > 0 else 0
+        forecast = get_forecast(
+            region,
+            district,
+            venue_types=venue_types,
+            interests=interests,
+            schedule=serializer.validated_data.get('schedule'),
+            start_date=serializer.validated_data.get('start_date'),
+            end_date=serializer.validated_data.get('end_date'),
+        )
+        budget = float(serializer.validated_data.get('budget', 10000))
 
         return Response({
-            "cpm": cpm,
-            "screens_count": screens_count,
-            "impressions": impressions,
-            "reach": reach,
-            "frequency": frequency,
-            "estimated_cost": estimated_cost,
-            "budget_utilization": round(budget_utilization, 2),
-            "region_multiplier": region_multiplier,
-            "message": "Efficiency forecast generated based on selected region and district"
+            **apply_budget(forecast, budget),
+            "message": "Efficiency forecast generated from matching screens and their audience data"
         })
     
-    def _generate_qr_code(self, ads_manager: AdsManager) -> None:
-        """
-        Generate a stylized QR code for an ads manager.
-        
-        Creates a QR code with rounded borders and semi-transparent matte background,
-        optimized for overlay on video content.
-        
-        Args:
-            ads_manager: The AdsManager instance to generate QR code for.
-        """
-        if not ads_manager.link:
-            logger.warning(f"Cannot generate QR code for AdsManager {ads_manager.id}: no link provided")
-            return
-        
-        from PIL import Image, ImageDraw
-        
-        # Generate QR code URL
-        qr_url = f"{settings.BACKEND_URL}/api/v1/main/qr/{ads_manager.id}/"
-        
-        # Create QR code with higher error correction for better readability
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,  # Higher error correction
-            box_size=20,  # Larger boxes for better rounded corner effect
-            border=2,
-        )
-        qr.add_data(qr_url)
-        qr.make(fit=True)
-        
-        # Generate base QR code image
-        base_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to RGBA for transparency support
-        base_img = base_img.convert("RGBA")
-        
-        # Create new image with semi-transparent matte background
-        width, height = base_img.size
-        
-        # Add padding for better visual appearance
-        padding = 40
-        new_width = width + (padding * 2)
-        new_height = height + (padding * 2)
-        
-        # Create new image with semi-transparent white background
-        # RGBA: (R, G, B, Alpha) - Alpha 0=transparent, 255=opaque
-        styled_img = Image.new('RGBA', (new_width, new_height), (255, 255, 255, 0))
-        
-        # Draw rounded rectangle background (matte semi-transparent)
-        draw = ImageDraw.Draw(styled_img)
-        corner_radius = 30
-        
-        # Semi-transparent matte white background (85% opacity)
-        background_color = (250, 250, 250, 217)  # Soft white with 85% opacity
-        
-        # Draw rounded rectangle
-        draw.rounded_rectangle(
-            [(0, 0), (new_width, new_height)],
-            radius=corner_radius,
-            fill=background_color
-        )
-        
-        # Process QR code to add rounded corners to modules
-        qr_data = base_img.load()
-        module_size = 20  # Same as box_size
-        corner_radius_module = 6  # Rounded corners for individual modules
-        
-        # Create a new image for the QR code with rounded modules
-        qr_with_rounded = Image.new('RGBA', base_img.size, (255, 255, 255, 0))
-        draw_qr = ImageDraw.Draw(qr_with_rounded)
-        
-        # Matte dark color for QR modules (softer than pure black, 95% opacity)
-        module_color = (40, 40, 45, 242)  # Dark charcoal with high opacity
-        
-        # Draw each QR module with rounded corners
-        for y in range(0, height, module_size):
-            for x in range(0, width, module_size):
-                # Check if this module should be filled (black in original)
-                try:
-                    if qr_data[x, y] == (0, 0, 0, 255):  # Black module
-                        # Draw rounded rectangle for this module
-                        draw_qr.rounded_rectangle(
-                            [(x, y), (x + module_size - 2, y + module_size - 2)],
-                            radius=corner_radius_module,
-                            fill=module_color
-                        )
-                except IndexError:
-                    pass
-        
-        # Paste the rounded QR code onto the background
-        styled_img.paste(qr_with_rounded, (padding, padding), qr_with_rounded)
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        styled_img.save(buffer, format='PNG', optimize=True)
-        buffer.seek(0)
-        
-        # Save to model
-        filename = f"qr_code_{ads_manager.id}.png"
-        ads_manager.qr_code.save(filename, ContentFile(buffer.read()), save=True)
-        
-        logger.info(f"Stylized QR code with rounded borders generated for AdsManager {ads_manager.id}")
-    
     @action(detail=True, methods=["post"])
     def generate_qr_code(self, request: Request, pk: str | None = None) -> Response:
         """
@@ -563,7 +386,9 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
         POST /api/v1/main/ads-managers/{id}/generate_qr_code/
         
         The QR code will contain a URL to /qr/<ad_id>/ which will redirect
-        to the original link and increment the visit counter.
+        to the original link and increment the visit counter. Rendering runs in
+        the background: the response is 202 with qr_status "pending", and the
+        ad's qr_status turns "ready" once qr_code is available.
         """
         ads_manager = self.get_object()
         
@@ -573,16 +398,97 @@ class AdsManagerViewSet(viewsets.ModelViewSet):
                 status=400
             )
         
-        try:
-            self._generate_qr_code(ads_manager)
-            serializer = self.get_serializer(ads_manager)
-            return Response({
-                "message": "QR code generated successfully",
-                "data": serializer.data
-            })
-        except Exception as e:
-            logger.error(f"Error generating QR code for AdsManager {ads_manager.id}: {str(e)}")
+        request_qr_code(ads_manager, force=True)
+        serializer = self.get_serializer(ads_manager)
+        return Response({
+            "message": "QR code generation queued",
+            "data": serializer.data
+        }, status=202)
+
+    @action(detail=True, methods=["get"])
+    def qr_image(self, request: Request, pk: str | None = None) -> HttpResponse:
+        """
+        Serve the ad's QR code in a given size and format.
+        GET /api/v1/main/ads-managers/{id}/qr_image/?size=small|medium|large&type=png|webp|svg&screen=<id>
+
+        With screen, one of the user's own screens, the code points at
+        /qr/<ad_id>/<screen_id>/ so its scans are attributed to that screen.
+        Images are content-addressed by (QR URL, style, size, format) and
+        rendered at most once. The ETag is that address: a matching
+        If-None-Match is answered with 304 without touching storage. The
+        format goes in "type" because DRF reserves "format" for renderers.
+        """
+        ads_manager = self.get_object()
+        size = request.query_params.get("size", "large")
+        fmt = request.query_params.get("type", "png")
+        if size not in QR_SIZES or fmt not in QR_FORMATS:
             return Response(
-                {"error": f"Failed to generate QR code: {str(e)}"},
-                status=500
+                {"error": f"size must be one of {list(QR_SIZES)} and type one of {list(QR_FORMATS)}"},
+                status=400
             )
+        if not ads_manager.link:
+            return Response({"error": "This ad has no link to encode"}, status=400)
+        screen_id = request.query_params.get("screen")
+        if screen_id is not None:
+            screens = ScreenManager.objects.filter(created_by=request.user)
+            if not screen_id.isdigit() or not screens.filter(pk=screen_id).exists():
+                return Response({"error": "Unknown screen"}, status=400)
+            screen_id = int(screen_id)
+
+        etag = f'"{qr_image_digest(ads_manager.id, size, fmt, screen_id)}"'
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponseNotModified()
+        else:
+            with default_storage.open(get_qr_image(ads_manager.id, size, fmt, screen_id)) as fh:
+                response = HttpResponse(fh.read(), content_type=QR_FORMATS[fmt])
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=31536000"
+        return response
+
+    @action(detail=True, methods=["get"])
+    def scans_by_screen(self, request: Request, pk: str | None = None) -> Response:
+        """
+        QR scans of an ad per screen, with the audience each screen delivered.
+        GET /api/v1/main/ads-managers/{id}/scans_by_screen/?days=30
+
+        Scans come from the hourly QRScanHourly rollup and impressions from
+        AudienceImpression face counts; conversion is scans per 1000
+        impressions. Scans of the plain /qr/<ad_id>/ URL are reported under
+        screen null.
+        """
+        ads_manager = self.get_object()
+        try:
+            days = min(max(int(request.query_params.get("days", 30)), 1), 366)
+        except ValueError:
+            return Response({"error": "days must be an integer"}, status=400)
+        since = timezone.now() - timedelta(days=days)
+
+        scans = dict(
+            ads_manager.qr_scans_hourly.filter(hour__gte=since)
+            .values("screen_id")
+            .annotate(total=Sum("scans"))
+            .values_list("screen_id", "total")
+        )
+        impressions = dict(
+            ads_manager.audience_impressions.filter(timestamp__gte=since)
+            .values("screen_id")
+            .annotate(total=Sum("face_count"))
+            .values_list("screen_id", "total")
+        )
+        titles = dict(ScreenManager.objects.filter(id__in=[*scans, *impressions]).values_list("id", "title"))
+
+        rows = []
+        for screen_id in set(scans) | set(impressions):
+            screen_scans = scans.get(screen_id, 0)
+            screen_impressions = impressions.get(screen_id, 0)
+            rows.append({
+                "screen_id": screen_id,
+                "screen_title": titles.get(screen_id),
+                "scans": screen_scans,
+                "impressions": screen_impressions,
+                "conversion_per_mille": (
+                    round(screen_scans / screen_impressions * 1000, 2) if screen_impressions else None
+                ),
+            })
+        rows.sort(key=lambda row: row["scans"], reverse=True)
+        return Response({"days": days, "total_scans": sum(scans.values()), "screens": rows})
@@ -0,0 +1,110 @@
+import logging
+import re
+
+from django.db.models import QuerySet
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from ..models import ChunkedUpload
+from ..serializers.chunked_upload import ChunkedUploadSerializer
+from ..serializers.screen_manager import AdsManagerVideoSerializer
+from ..services.chunked_upload import (
+    ChunkedUploadError,
+    abort_upload,
+    complete_upload,
+    start_upload,
+    write_chunk,
+)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+class ChunkedUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    ViewSet for resumable chunked video uploads.
+
+    Uploads are scoped to the authenticated user.
+
+    - POST /api/v1/main/video-uploads/ - Start an upload (ads_manager, filename, total_size, checksum)
+    - GET /api/v1/main/video-uploads/{id}/ - Get upload state; offset is where to resume
+    - PUT /api/v1/main/video-uploads/{id}/chunk/ - Send raw bytes with a Content-Range header
+    - POST /api/v1/main/video-uploads/{id}/complete/ - Attach the assembled file to a new AdsManagerVideo
+    - DELETE /api/v1/main/video-uploads/{id}/ - Abort the upload
+    """
+
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[ChunkedUpload]:
+        """
+        Returns upload sessions created by the current user.
+        """
+        return ChunkedUpload.objects.filter(created_by=self.request.user)
+
+    def perform_create(self, serializer: BaseSerializer[ChunkedUpload]) -> None:
+        """
+        Create the upload session and its empty part file.
+        """
+        upload = serializer.save(created_by=self.request.user)
+        start_upload(upload)
+
+    def perform_destroy(self, instance: ChunkedUpload) -> None:
+        """
+        Abort the upload and remove the part file.
+        """
+        abort_upload(instance)
+
+    @action(detail=True, methods=["put"])
+    def chunk(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Append a chunk to the upload.
+        PUT /api/v1/main/video-uploads/{id}/chunk/
+
+        The request body is the raw chunk and the Content-Range header gives its
+        position, e.g. "bytes 0-5242879/104857600". On a 409 the client resumes
+        from the returned offset.
+        """
+        upload = self.get_object()
+
+        match = CONTENT_RANGE_RE.match(request.META.get("HTTP_CONTENT_RANGE", ""))
+        if not match:
+            return Response({"error": "Content-Range header is required, e.g. 'bytes 0-1023/4096'"}, status=400)
+        start, end = int(match.group(1)), int(match.group(2))
+        length = end - start + 1
+        if end < start or int(request.META.get("CONTENT_LENGTH") or 0) != length:
+            return Response({"error": "Content-Range does not match Content-Length"}, status=400)
+
+        try:
+            # Reading the raw stream keeps the chunk out of DRF's parsers and memory.
+            upload = write_chunk(upload.pk, start, length, request.stream)
+        except ChunkedUploadError as e:
+            upload.refresh_from_db()
+            return Response({"error": str(e), "offset": upload.offset}, status=e.status)
+
+        return Response({"id": upload.id, "offset": upload.offset, "total_size": upload.total_size})
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Finish the upload and create the AdsManagerVideo.
+        POST /api/v1/main/video-uploads/{id}/complete/
+        """
+        upload = self.get_object()
+        try:
+            video = complete_upload(upload.pk, request.user)
+        except ChunkedUploadError as e:
+            return Response({"error": str(e)}, status=e.status)
+
+        serializer = AdsManagerVideoSerializer(video, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
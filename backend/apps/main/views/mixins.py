@@ -0,0 +1,159 @@
+from typing import Any, Optional
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from main.pagination import CreatedAtCursorPagination
+from main.serializers.bulk_status import BulkStatusSerializer
+
+
+class CursorPaginationMixin:
+    """
+    ViewSet mixin that switches list responses to keyset pagination on request.
+
+    - ?pagination=cursor - first page, ordered newest first
+    - ?cursor=<token> - following pages, as linked from next/previous
+
+    Without either parameter the default LimitOffsetPagination is used.
+    """
+    cursor_pagination_class = CreatedAtCursorPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin for lightweight list responses.
+
+    - ?fields=id,title,status - render only the listed fields
+    - ?view=compact - render the serializer's Meta.compact_fields
+
+    When a subset is requested, only the needed columns are loaded and nested
+    relations that are not rendered are neither joined nor prefetched.
+    """
+    select_related_fields: tuple[str, ...] = ()
+    prefetch_related_fields: tuple[str, ...] = ()
+
+    def get_sparse_fields(self) -> Optional[list[str]]:
+        """
+        Fields requested for the response, or None for the full representation.
+        """
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+
+        fields = None
+        params = self.request.query_params
+        if self.request.method in SAFE_METHODS:
+            serializer_class = self.get_serializer_class()
+            if params.get("fields"):
+                fields = [name.strip() for name in params["fields"].split(",") if name.strip()]
+                readable = {name for name, field in serializer_class().fields.items() if not field.write_only}
+                unknown = sorted(set(fields) - readable)
+                if unknown:
+                    raise ValidationError({"fields": f"Unknown fields: {unknown}"})
+            elif params.get("view") == "compact":
+                fields = list(serializer_class.Meta.compact_fields)
+
+        self._sparse_fields = fields
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def optimize_queryset(self, queryset: QuerySet) -> QuerySet:
+        """
+        Join/prefetch the relations that will be rendered and, for sparse
+        responses, restrict the loaded columns with .only().
+        """
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset.select_related(*self.select_related_fields).prefetch_related(
+                *self.prefetch_related_fields
+            )
+
+        dependencies = getattr(self.get_serializer_class(), "field_dependencies", {})
+        columns = {"id"}
+        for name in fields:
+            if name in dependencies:
+                columns.update(dependencies[name])
+                continue
+            try:
+                model_field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                columns.add(name)
+
+        # Keyset pagination reads its ordering fields from every row.
+        columns.update(name.lstrip("-") for name in getattr(self.paginator, "ordering", None) or ())
+
+        return (
+            queryset.select_related(*[name for name in self.select_related_fields if name in fields])
+            .prefetch_related(*[name for name in self.prefetch_related_fields if name in fields])
+            .only(*columns)
+        )
+
+
+class BulkStatusMixin:
+    """
+    ViewSet mixin adding a bulk status transition:
+
+    - POST .../bulk_status/ {"ids": [1, 2], "status": "paused"}
+
+    The rows are changed with a single UPDATE ... WHERE id IN, scoped to
+    get_queryset(), without loading, saving or re-serializing them, so model
+    signals do not fire; perform_bulk_status() handles the side effects instead.
+    """
+    status_choices: tuple[tuple[str, str], ...] = ()
+
+    def get_bulk_status_values(self, status: str) -> dict[str, Any]:
+        """
+        Column values written by the bulk UPDATE.
+        """
+        return {"status": status, "updated_by": self.request.user, "updated_at": timezone.now()}
+
+    def perform_bulk_status(self, ids: list[int], status: str) -> None:
+        """
+        Hook for cache invalidation after a bulk transition.
+        """
+
+    @action(detail=False, methods=["post"])
+    def bulk_status(self, request: Request) -> Response:
+        """
+        Apply one status to many of the current user's objects.
+        POST /api/v1/main/<resource>/bulk_status/
+        """
+        serializer = BulkStatusSerializer(data=request.data, status_choices=self.status_choices)
+        serializer.is_valid(raise_exception=True)
+        requested = set(serializer.validated_data["ids"])
+        status = serializer.validated_data["status"]
+
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=requested)
+            ids = sorted(queryset.values_list("pk", flat=True))
+            # The UPDATE carries the same scope, so it never reaches rows outside get_queryset().
+            updated = queryset.update(**self.get_bulk_status_values(status))
+            self.perform_bulk_status(ids, status)
+
+        return Response({
+            "status": status,
+            "updated": updated,
+            "ids": ids,
+            "not_found": sorted(requested.difference(ids)),
+        })
@@ -5,16 +5,14 @@ This module provides the view to handle QR code redirects that increment
 the visit counter and redirect users to the original ad link.
 """
 import logging
-from typing import Any
 
-from django.db import transaction, models
-from django.http import HttpResponseRedirect, HttpResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
-from ..models import AdsManager
+from ..services.qr_clicks import get_qr_link, record_qr_click
+from ..services.user_agent import classify_user_agent
 
 logger = logging.getLogger(__name__)
 
@@ -24,31 +22,37 @@ class QRCodeRedirectView(APIView):
     View to handle QR code redirects.
     
     When accessed with an ad ID, this view will:
-    1. Increment the involve_count (visit counter) by 1
-    2. Redirect the user to the original saved link
+    1. Record the scan (time, screen, device class) in the in-process scan
+       buffer, which is written to QRScanEvent, QRScanHourly and
+       involve_count in batches every QR_CLICK_FLUSH_INTERVAL seconds
+    2. Redirect the user to the original saved link, read from the cache
     
     Endpoints:
         GET /api/v1/main/qr/<ad_id>/ - Redirect to the ad's link and increment counter
+        GET /api/v1/main/qr/<ad_id>/<screen_id>/ - Same, attributing the scan to the screen
     """
     
     permission_classes = [AllowAny]  # Public endpoint - no authentication required
+    authentication_classes = []  # Nothing to authenticate; keeps JWT parsing off the hot path
     
-    def get(self, request: Request, ad_id: int) -> HttpResponse:
+    def get(self, request: Request, ad_id: int, screen_id: int | None = None) -> HttpResponse:
         """
         Handle QR code redirect.
         
         Args:
             request: The HTTP request object
             ad_id: The ID of the AdsManager instance
+            screen_id: The ID of the ScreenManager showing the code, if encoded in the URL
             
         Returns:
             HttpResponseRedirect to the ad's link, or error response if link is missing
         """
-        # Get the ads manager or return 404
-        ads_manager = get_object_or_404(AdsManager, id=ad_id)
+        link = get_qr_link(ad_id)
+        if link is None:
+            raise Http404("Advertisement not found")
         
         # Check if link exists
-        if not ads_manager.link:
+        if not link:
             logger.warning(
                 f"QR code accessed for AdsManager {ad_id} but no link is set"
             )
@@ -57,27 +61,5 @@ class QRCodeRedirectView(APIView):
                 status=404
             )
         
-        try:
-            # Increment the visit counter atomically using F expression
-            with transaction.atomic():
-                AdsManager.objects.filter(id=ad_id).update(
-                    involve_count=models.F('involve_count') + 1
-                )
-                # Refresh from DB to get updated count
-                ads_manager.refresh_from_db()
-            
-            logger.info(
-                f"QR code redirect for AdsManager {ad_id} "
-                f"(total visits: {ads_manager.involve_count}) to {ads_manager.link}"
-            )
-            
-            # Redirect to the original link
-            return HttpResponseRedirect(redirect_to=ads_manager.link)
-            
-        except Exception as e:
-            logger.error(
-                f"Error processing QR code redirect for AdsManager {ad_id}: {str(e)}"
-            )
-            # Still redirect even if counter increment fails
-            return HttpResponseRedirect(redirect_to=ads_manager.link)
-
+        record_qr_click(ad_id, screen_id, classify_user_agent(request.META.get("HTTP_USER_AGENT")))
+        return HttpResponseRedirect(redirect_to=link)
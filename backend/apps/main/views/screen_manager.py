@@ -10,9 +10,15 @@ from rest_framework.serializers import BaseSerializer
 
 from main.models import ScreenManager
 from main.serializers.screen_manager import ScreenManagerSerializer
+from main.services.geo import parse_bbox
+from main.services.inventory import bump_inventory_version, bump_screen_map_version
+from main.services.screen_map import get_screen_map
+from main.views.mixins import BulkStatusMixin, CursorPaginationMixin, SparseFieldsetViewMixin
 
+MAX_NEARBY_RADIUS_KM = 200
 
-class ScreenManagerViewSet(viewsets.ModelViewSet):
+
+class ScreenManagerViewSet(BulkStatusMixin, CursorPaginationMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing ScreenManager instances.
 
@@ -26,6 +32,10 @@ class ScreenManagerViewSet(viewsets.ModelViewSet):
     - PUT /api/v1/main/screen-managers/{id}/ - Update a screen manager
     - PATCH /api/v1/main/screen-managers/{id}/ - Partially update a screen manager
     - DELETE /api/v1/main/screen-managers/{id}/ - Delete a screen manager
+    - POST /api/v1/main/screen-managers/bulk_status/ - Change the status of many screens at once
+
+    List endpoints accept ?fields=a,b or ?view=compact for lightweight responses,
+    and ?pagination=cursor for keyset pagination.
     """
 
     serializer_class = ScreenManagerSerializer
@@ -34,6 +44,9 @@ class ScreenManagerViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "position", "location", "type_category", "screen_size"]
     ordering_fields = ["created_at", "updated_at", "title", "status"]
     ordering = ["-created_at"]
+    select_related_fields = ("region", "district")
+    prefetch_related_fields = ("venue_types",)
+    status_choices = ScreenManager.STATUS
 
     def get_queryset(self) -> QuerySet[ScreenManager]:
         """
@@ -41,7 +54,7 @@ class ScreenManagerViewSet(viewsets.ModelViewSet):
         All operations are scoped to the authenticated user's screen managers.
         """
         # Always filter by the current user - users can only see their own screen managers
-        return ScreenManager.objects.filter(created_by=self.request.user)
+        return self.optimize_queryset(ScreenManager.objects.filter(created_by=self.request.user))
 
     def perform_create(self, serializer: BaseSerializer[ScreenManager]) -> None:
         """
@@ -124,6 +137,14 @@ class ScreenManagerViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(screen_manager)
         return Response(serializer.data)
 
+    def perform_bulk_status(self, ids: list[int], status: str) -> None:
+        """
+        Screen status decides which screens are forecast and matched to campaigns,
+        and is shown on the owner's map.
+        """
+        bump_inventory_version()
+        bump_screen_map_version(self.request.user.id)
+
     @action(detail=False, methods=["get"])
     def stats(self, request: Request) -> Response:
         """
@@ -249,30 +270,84 @@ class ScreenManagerViewSet(viewsets.ModelViewSet):
         """
         Get all screen managers with their coordinates for mapping.
         GET /api/v1/main/screen-managers/coordinates/
+        GET /api/v1/main/screen-managers/coordinates/?bbox=west,south,east,north
+
+        With bbox only the screens inside the visible map area are returned.
         """
-        queryset = self.get_queryset()
-        
-        # Get screen managers with coordinates
-        screens_with_coords = queryset.filter(
-            coordinates__isnull=False
-        ).values(
-            'id', 'title', 'position', 'location', 'coordinates', 'status'
-        )
-        
-        # Format coordinates for mapping
-        coordinates_data = []
-        for screen in screens_with_coords:
-            if screen['coordinates'] and 'lat' in screen['coordinates'] and 'lng' in screen['coordinates']:
-                coordinates_data.append({
-                    "id": screen['id'],
-                    "title": screen['title'],
-                    "position": screen['position'],
-                    "location": screen['location'],
-                    "coordinates": screen['coordinates'],
-                    "status": screen['status']
-                })
-        
+        queryset = self.get_queryset().located()
+        if request.query_params.get("bbox"):
+            try:
+                queryset = queryset.in_bbox(parse_bbox(request.query_params["bbox"]))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=400)
+
+        coordinates_data = [
+            {
+                "id": screen["id"],
+                "title": screen["title"],
+                "position": screen["position"],
+                "location": screen["location"],
+                "coordinates": {"lat": screen["latitude"], "lng": screen["longitude"]},
+                "status": screen["status"],
+            }
+            for screen in queryset.values("id", "title", "position", "location", "latitude", "longitude", "status")
+        ]
+
         return Response({
             "screens": coordinates_data,
             "total_screens": len(coordinates_data)
         })
+
+    @action(detail=False, methods=["get"])
+    def nearby(self, request: Request) -> Response:
+        """
+        Get the current user's screen managers around a point, nearest first.
+        GET /api/v1/main/screen-managers/nearby/?lat=41.31&lng=69.28&radius=5
+
+        radius is in kilometres (default 5, at most MAX_NEARBY_RADIUS_KM).
+        """
+        try:
+            latitude = float(request.query_params["lat"])
+            longitude = float(request.query_params["lng"])
+            radius = float(request.query_params.get("radius", 5))
+        except KeyError:
+            return Response({"error": "lat and lng parameters are required"}, status=400)
+        except ValueError:
+            return Response({"error": "lat, lng and radius must be numbers"}, status=400)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 0 < radius <= MAX_NEARBY_RADIUS_KM):
+            return Response(
+                {"error": f"lat, lng or radius out of range (radius up to {MAX_NEARBY_RADIUS_KM} km)"}, status=400
+            )
+
+        screens = [
+            {
+                "id": screen["id"],
+                "title": screen["title"],
+                "location": screen["location"],
+                "coordinates": {"lat": screen["latitude"], "lng": screen["longitude"]},
+                "status": screen["status"],
+                "distance_km": round(screen["distance_km"], 3),
+            }
+            for screen in self.get_queryset()
+            .within_radius(latitude, longitude, radius)
+            .values("id", "title", "location", "latitude", "longitude", "status", "distance_km")
+        ]
+        return Response({"screens": screens, "total_screens": len(screens)})
+
+    @action(detail=False, methods=["get"])
+    def map_clusters(self, request: Request) -> Response:
+        """
+        Get the current user's screens inside the visible map area, clustered for the zoom level.
+        GET /api/v1/main/screen-managers/map_clusters/?bbox=west,south,east,north&zoom=6
+
+        Up to zoom 14 screens are grouped into grid cells with their count,
+        centroid and status mix; above it every screen is returned.
+        """
+        try:
+            bbox = parse_bbox(request.query_params["bbox"])
+            zoom = int(request.query_params["zoom"])
+            return Response(get_screen_map(request.user.id, bbox, zoom))
+        except KeyError:
+            return Response({"error": "bbox and zoom parameters are required"}, status=400)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
@@ -1,17 +1,24 @@
+import hashlib
 import json
 import logging
 
 from django.db import transaction
-from django.http import Http404, JsonResponse
+from django.http import Http404, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from main.models import VideoAnalytics, AdsManagerVideo, ScreenManager, AdsManager
+from main.models import VideoAnalytics, AdsManagerVideo, ScreenManager
+from main.serializers.playlist import PlaylistManifestItemSerializer
 from main.serializers.screen_manager import AdsManagerVideoSerializer
+from main.services.playlist import get_playlist_videos
+from main.services.user_agent import classify_user_agent
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +48,16 @@ class VideoServeView(View):
                 from django.http import FileResponse
 
                 if os.path.exists(video.video.path):
+                    etag = f'"{video.content_hash}"' if video.content_hash else None
+                    if etag and request.META.get("HTTP_IF_NONE_MATCH") == etag:
+                        response = HttpResponseNotModified()
+                        response["ETag"] = etag
+                        return response
+
                     response = FileResponse(open(video.video.path, "rb"), content_type="video/mp4")
                     response["Content-Disposition"] = f'inline; filename="{video.video.name}"'
+                    if etag:
+                        response["ETag"] = etag
                     return response
                 else:
                     raise Http404("Video file not found")
@@ -82,9 +97,7 @@ class VideoServeView(View):
                 VideoAnalytics.objects.create(
                     video=video,
                     ip_address=self._get_client_ip(request),
-                    user_agent=request.META.get("HTTP_USER_AGENT", ""),
-                    referer=request.META.get("HTTP_REFERER", ""),
-                    created_by=None,  # Anonymous view
+                    ua_class=classify_user_agent(request.META.get("HTTP_USER_AGENT")),
                 )
         except Exception as e:
             logger.error(f"Error tracking basic view: {str(e)}")
@@ -98,13 +111,11 @@ class VideoServeView(View):
                 analytics = VideoAnalytics.objects.create(
                     video=video,
                     ip_address=self._get_client_ip(request),
-                    user_agent=request.META.get("HTTP_USER_AGENT", ""),
-                    referer=request.META.get("HTTP_REFERER", ""),
+                    ua_class=classify_user_agent(request.META.get("HTTP_USER_AGENT")),
                     watch_duration=data.get("watch_duration"),
                     is_complete=data.get("is_complete", False),
                     country=data.get("country"),
                     city=data.get("city"),
-                    created_by=None,  # Anonymous view
                 )
 
                 logger.info(f"Tracked analytics for video {video.id}: {analytics.id}")
@@ -143,8 +154,7 @@ class VideoAnalyticsView(View):
             analytics = VideoAnalytics.objects.create(
                 video=video,
                 ip_address=self._get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", ""),
-                referer=request.META.get("HTTP_REFERER", ""),
+                ua_class=classify_user_agent(request.META.get("HTTP_USER_AGENT")),
                 watch_duration=data.get("watch_duration"),
                 is_complete=data.get("is_complete", False),
                 country=data.get("country"),
@@ -171,7 +181,7 @@ class VideoAnalyticsView(View):
 
 class ScreenVideoView(ListAPIView):
     """
-    Get videos for a specific screen manager based on region and district.
+    Get videos for a specific screen manager based on region, district and campaign schedule.
     GET /api/v1/main/screen-videos/{id}/ - Get videos for screen manager
     """
     permission_classes = [AllowAny]
@@ -179,38 +189,65 @@ class ScreenVideoView(ListAPIView):
     
     def get_queryset(self):
         """
-        Get videos based on screen manager's region and district.
+        Get videos of the campaigns currently on air for the screen manager's region and district.
         """
         screen_manager_id = self.kwargs.get('pk')
         
         try:
-            # Get screen manager
             screen_manager = get_object_or_404(ScreenManager, id=screen_manager_id)
-            
-            # Get region and district from screen manager
-            region = screen_manager.region
-            district = screen_manager.district
-            
-            if not region and not district:
-                # If no region/district specified, return empty queryset
-                return AdsManagerVideo.objects.none()
-            
-            # Build filter for AdsManager
-            ads_manager_filter = {}
-            if region:
-                ads_manager_filter['region'] = region
-            if district:
-                ads_manager_filter['district'] = district
-            
-            # Get AdsManagers that match the region/district
-            matching_ads_managers = AdsManager.objects.filter(**ads_manager_filter)
-            
-            # Get videos from matching ads managers
-            return AdsManagerVideo.objects.filter(
-                ads_manager__in=matching_ads_managers
-            ).select_related('ads_manager')
+            return get_playlist_videos(screen_manager)
             
         except Exception as e:
             logger.error(f"Error getting videos for screen manager {screen_manager_id}: {str(e)}")
             return AdsManagerVideo.objects.none()
-    
\ No newline at end of file
+
+    def get_serializer_context(self):
+        """
+        QR redirect URLs in the playlist attribute scans to this screen.
+        """
+        return {**super().get_serializer_context(), "screen_id": self.kwargs.get("pk")}
+
+
+class ScreenManifestView(APIView):
+    """
+    Compact playlist manifest for screen-side caching.
+    GET /api/v1/main/screen-videos/{id}/manifest/ - Content hash, size and URL of each creative
+
+    The response carries an ETag derived from the playlist contents, so screens
+    can poll with If-None-Match and only download creatives whose hash they do not have.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk):
+        """
+        Return the manifest of the creatives currently on air for the screen.
+        """
+        screen_manager = get_object_or_404(ScreenManager, id=pk)
+        # Creatives still being ingested have no hash yet and join the manifest once ready.
+        videos = (
+            get_playlist_videos(screen_manager)
+            .filter(processing_status=AdsManagerVideo.READY)
+            .select_related(None)
+            .only("id", "ads_manager_id", "title", "content_hash", "file_size", "duration")
+            .order_by("id")
+        )
+
+        data = PlaylistManifestItemSerializer(videos, many=True).data
+        version = hashlib.sha256(
+            ",".join(f"{item['id']}:{item['content_hash']}" for item in data).encode()
+        ).hexdigest()[:32]
+        etag = f'"{version}"'
+
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = Response(status=304)
+        else:
+            response = Response({
+                "screen_id": screen_manager.id,
+                "version": version,
+                "generated_at": timezone.now(),
+                "total_size": sum(item["file_size"] or 0 for item in data),
+                "items": data,
+            })
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
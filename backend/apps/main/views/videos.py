@@ -1,4 +1,4 @@
-from django.db.models import QuerySet, Q, Count
+from django.db.models import QuerySet, Count
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import viewsets
@@ -11,9 +11,11 @@ from rest_framework.serializers import BaseSerializer
 
 from main.models import VideoAnalytics, AdsManager, AdsManagerVideo
 from main.serializers.screen_manager import AdsManagerVideoSerializer
+from main.services.video_analytics import get_analytics_summary, get_video_analytics
+from main.views.mixins import CursorPaginationMixin
 
 
-class AdsManagerVideoViewSet(viewsets.ModelViewSet):
+class AdsManagerVideoViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing AdsManagerVideo instances.
     
@@ -27,6 +29,8 @@ class AdsManagerVideoViewSet(viewsets.ModelViewSet):
     - PUT /api/v1/main/ads-videos/{id}/ - Update a video
     - PATCH /api/v1/main/ads-videos/{id}/ - Partially update a video
     - DELETE /api/v1/main/ads-videos/{id}/ - Delete a video
+
+    The list endpoint accepts ?pagination=cursor for keyset pagination.
     """
 
     serializer_class = AdsManagerVideoSerializer
@@ -141,27 +145,21 @@ class AdsManagerVideoViewSet(viewsets.ModelViewSet):
         """
         Get analytics for a specific ads video.
         GET /api/v1/main/ads-videos/{id}/analytics/
+
+        unique_viewers is a HyperLogLog estimate (about 1.6% standard error).
         """
         video = self.get_object()
         
-        # Get analytics for this video
-        analytics = VideoAnalytics.objects.filter(video=video)
-        
-        # Calculate statistics
-        total_views = analytics.count()
-        complete_views = analytics.filter(is_complete=True).count()
-        unique_ips = analytics.values('ip_address').distinct().count()
+        # Lifetime totals come from the daily rollups plus the raw rows since the last one
+        totals = get_video_analytics(video)
+        total_views = totals["total_views"]
+        complete_views = totals["complete_views"]
         
         # Get recent views (last 10)
-        recent_views = analytics.order_by('-created_at')[:10].values(
+        recent_views = VideoAnalytics.objects.filter(video=video).order_by('-created_at')[:10].values(
             'ip_address', 'created_at', 'is_complete', 'country', 'city'
         )
         
-        # Get views by country
-        views_by_country = analytics.values('country').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
         stats = {
             "video_id": video.id,
             "video_title": video.title or "Untitled Video",
@@ -169,9 +167,9 @@ class AdsManagerVideoViewSet(viewsets.ModelViewSet):
             "total_views": total_views,
             "complete_views": complete_views,
             "completion_rate": round((complete_views / total_views * 100) if total_views > 0 else 0, 2),
-            "unique_viewers": unique_ips,
+            "unique_viewers": totals["unique_viewers"],
             "recent_views": list(recent_views),
-            "views_by_country": list(views_by_country)
+            "views_by_country": totals["views_by_country"]
         }
         
         return Response(stats)
@@ -182,51 +180,8 @@ class AdsManagerVideoViewSet(viewsets.ModelViewSet):
         Get analytics summary for all user's ads videos.
         GET /api/v1/main/ads-videos/analytics_summary/
         """
-        from django.db.models import Sum
-        
-        # Get user's videos
-        user_videos = self.get_queryset()
-        
-        # Get analytics for user's videos
-        analytics = VideoAnalytics.objects.filter(video__in=user_videos)
-        
-        # Calculate overall statistics
-        total_views = analytics.count()
-        complete_views = analytics.filter(is_complete=True).count()
-        unique_viewers = analytics.values('ip_address').distinct().count()
-        
-        # Get top performing videos
-        top_videos = user_videos.annotate(
-            view_count=Count('analytics'),
-            complete_views=Count('analytics', filter=Q(analytics__is_complete=True))
-        ).order_by('-view_count')[:5]
-        
-        # Get views by ads manager
-        views_by_ads_manager = user_videos.values(
-            'ads_manager__campaign_name'
-        ).annotate(
-            total_views=Count('analytics'),
-            complete_views=Count('analytics', filter=Q(analytics__is_complete=True))
-        ).order_by('-total_views')
-        
-        summary = {
-            "total_videos": user_videos.count(),
-            "total_views": total_views,
-            "complete_views": complete_views,
-            "overall_completion_rate": round((complete_views / total_views * 100) if total_views > 0 else 0, 2),
-            "unique_viewers": unique_viewers,
-            "top_videos": [
-                {
-                    "id": video.id,
-                    "title": video.title or "Untitled Video",
-                    "ads_manager": video.ads_manager.campaign_name,
-                    "view_count": video.view_count,
-                    "complete_views": video.complete_views,
-                    "completion_rate": round((video.complete_views / video.view_count * 100) if video.view_count > 0 else 0, 2)
-                }
-                for video in top_videos
-            ],
-            "views_by_ads_manager": list(views_by_ads_manager)
-        }
+        # Lifetime rollups plus the raw rows since the last rollup; the query count
+        # does not grow with the number of views
+        summary = get_analytics_summary(self.get_queryset())
         
         return Response(summary)
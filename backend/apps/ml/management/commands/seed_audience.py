@@ -16,7 +16,8 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from main.models import AdsManager, AudienceImpression, ScreenManager
+from main.models import AdsManager, AudienceHourly, AudienceImpression, ScreenManager
+from main.services.audience import record_audience_impressions
 
 AGE_BUCKETS = ["0-17", "18-24", "25-34", "35-44", "45-54", "55+"]
 GENDERS = ["male", "female"]
@@ -65,6 +66,7 @@ class Command(BaseCommand):
     def handle(self, *args, **opts):
         if opts["reset"]:
             deleted, _ = AudienceImpression.objects.all().delete()
+            AudienceHourly.objects.all().delete()
             self.stdout.write(self.style.WARNING(f"Deleted {deleted} existing audience rows"))
 
         screens = list(ScreenManager.objects.all())
@@ -114,12 +116,12 @@ class Command(BaseCommand):
                     )
 
                     if len(batch) >= 1000:
-                        AudienceImpression.objects.bulk_create(batch)
+                        record_audience_impressions(batch, batch_size=1000)
                         created_total += len(batch)
                         batch = []
 
         if batch:
-            AudienceImpression.objects.bulk_create(batch)
+            record_audience_impressions(batch, batch_size=1000)
             created_total += len(batch)
 
         self.stdout.write(
@@ -11,6 +11,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from main.models import AdsManager, AudienceImpression, ScreenManager
+from main.services.audience import record_audience_impressions
 
 from .serializers import AudienceBreakdownSerializer, AudienceIngestBatchSerializer
 
@@ -107,7 +108,7 @@ class AudienceIngestView(APIView):
             )
             for item in payload["impressions"]
         ]
-        AudienceImpression.objects.bulk_create(objs, batch_size=500)
+        record_audience_impressions(objs)
         logger.info("Ingested %d audience impressions for screen %s", len(objs), screen.id)
         return Response({"status": "ok", "accepted": len(objs)}, status=status.HTTP_201_CREATED)
 
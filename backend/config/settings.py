@@ -147,6 +147,8 @@ CORS_ALLOW_HEADERS = [
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
+# Time zone the campaign day-hour schedules are entered in
+SCHEDULE_TIME_ZONE = os.getenv("SCHEDULE_TIME_ZONE", "Asia/Tashkent")
 USE_I18N = True
 USE_TZ = True
 STATIC_URL = "static/"
@@ -157,6 +159,48 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Resumable chunked video uploads
+CHUNKED_UPLOAD_DIR = os.getenv("CHUNKED_UPLOAD_DIR", os.path.join(MEDIA_ROOT, "chunked_uploads"))
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_CHUNK_SIZE", 20 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE", 2 * 1024 * 1024 * 1024))
+CHUNKED_UPLOAD_EXPIRY = timedelta(hours=int(os.getenv("CHUNKED_UPLOAD_EXPIRY_HOURS", 24)))
+
+# Worker threads for background jobs (media ingestion, etc.)
+BACKGROUND_TASK_WORKERS = int(os.getenv("BACKGROUND_TASK_WORKERS", 4))
+# Media rows claimed for ingestion longer ago than this belong to a worker that died
+MEDIA_INGEST_TIMEOUT = timedelta(minutes=int(os.getenv("MEDIA_INGEST_TIMEOUT_MINUTES", 30)))
+
+# Cache. Campaign stats, QR links, forecasts and map tiles are invalidated on
+# write, which only reaches every gunicorn worker through a shared backend, so
+# deployments set REDIS_URL (docker-compose does). Without it each process gets
+# its own memory cache, which is only meant for development and tests.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+            "LOCATION": os.getenv("CACHE_LOCATION", ""),
+        }
+    }
+CAMPAIGN_STATS_CACHE_TIMEOUT = int(os.getenv("CAMPAIGN_STATS_CACHE_TIMEOUT", 300))
+FORECAST_CACHE_TIMEOUT = int(os.getenv("FORECAST_CACHE_TIMEOUT", 3600))
+# Link changes are invalidated in the shared cache; a per-process cache only keeps links briefly
+QR_LINK_CACHE_TIMEOUT = int(os.getenv("QR_LINK_CACHE_TIMEOUT", 3600 if REDIS_URL else 30))
+SCREEN_MAP_CACHE_TIMEOUT = int(os.getenv("SCREEN_MAP_CACHE_TIMEOUT", 3600))
+# Seconds QR scans are buffered in memory before being added to involve_count; 0 disables the flush thread
+QR_CLICK_FLUSH_INTERVAL = int(os.getenv("QR_CLICK_FLUSH_INTERVAL", 10))
+QR_SCAN_BUFFER_SIZE = int(os.getenv("QR_SCAN_BUFFER_SIZE", 5000))
+# Days raw VideoAnalytics rows are kept before compact_video_analytics deletes them; rollups are kept forever
+VIDEO_ANALYTICS_RETENTION_DAYS = int(os.getenv("VIDEO_ANALYTICS_RETENTION_DAYS", 90))
+
 # Backend URL for QR code generation
 BACKEND_URL = os.getenv("BACKEND_URL", "street-screens.vercel.app")
 